@@ -0,0 +1,49 @@
+"""
+Micro-benchmark of nearest neighbour query message construction.
+
+Compares building the query message tree per call, as nns does, with binding the query vector into a compiled
+QueryTemplate.
+
+Usage: PYTHONPATH=. python benchmarks/query_templates.py [--dimensions 1024] [--repeat 2000]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from cottontaildb_client import CottontailDBClient, QueryBuilder, Param, Type
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dimensions', type=int, default=1024)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    # The client is not entered, only its message construction is used
+    client = CottontailDBClient('localhost', 1865)
+    vector = np.random.default_rng(0).random(args.dimensions, dtype=np.float32)
+    template = QueryBuilder('schema', 'entity') \
+        .distance('feature', Param('vector', Type.FLOAT_VECTOR), 'manhattan') \
+        .select('id') \
+        .order('distance') \
+        .limit(10) \
+        .compile()
+
+    def rebuild():
+        projection, order = client._nns_projection('schema', 'entity', vector, 'manhattan', 'feature', 'id')
+        return client._query_message('schema', 'entity', projection, None, order, 10, None, None)
+
+    def bind():
+        return client._template_message(template, {'vector': vector})
+
+    baseline = None
+    print(f'{args.dimensions} dimensions, best of 5 runs of {args.repeat} messages')
+    for name, construct in (('message tree per call', rebuild), ('compiled template', bind)):
+        seconds = min(timeit.repeat(construct, number=args.repeat, repeat=5)) / args.repeat
+        baseline = baseline or seconds
+        print(f'{name:24} {seconds * 1e6:10.2f} us {baseline / seconds:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Micro-benchmark of vector literal construction.
+
+Compares the former varargs path of float_vector, which unpacks the elements and lets protobuf copy them one by one,
+with the bulk path of the vector constructors for NumPy arrays.
+
+Usage: PYTHONPATH=. python benchmarks/vector_literals.py [--dimensions 1024] [--repeat 2000]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from cottontaildb_client import float_vector, double_vector, long_vector, bool_vector
+from cottontaildb_client.cottontail_pb2 import Literal, Vector, FloatVector
+
+
+def varargs_float_vector(*elements):
+    return Literal(vectorData=Vector(float=FloatVector(vector=elements)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dimensions', type=int, default=1024)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vector = rng.random(args.dimensions, dtype=np.float32)
+    elements = vector.tolist()
+    cases = [
+        ('varargs float_vector(*ndarray)', lambda: varargs_float_vector(*vector)),
+        ('varargs float_vector(*list)', lambda: varargs_float_vector(*elements)),
+        ('float_vector(ndarray)', lambda: float_vector(vector)),
+        ('double_vector(ndarray)', lambda: double_vector(vector.astype(np.float64))),
+        ('long_vector(ndarray)', lambda: long_vector((vector * 1000).astype(np.int64))),
+        ('bool_vector(ndarray)', lambda: bool_vector(vector > 0.5)),
+    ]
+    assert float_vector(vector) == varargs_float_vector(*elements)
+    baseline = None
+    print(f'{args.dimensions} dimensions, best of 5 runs of {args.repeat} literals')
+    for name, construct in cases:
+        seconds = min(timeit.repeat(construct, number=args.repeat, repeat=5)) / args.repeat
+        baseline = baseline or seconds
+        print(f'{name:32} {seconds * 1e6:10.2f} us {baseline / seconds:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,15 @@
 from cottontaildb_client.cottontail_pb2 import IndexType, Type, Literal
-from cottontaildb_client.cottontaildb_client import CottontailDBClient, column_def, float_vector
+from cottontaildb_client.cottontaildb_client import CottontailDBClient, column_def, float_vector, half_vector, \
+    double_vector, int_vector, long_vector, bool_vector
+from cottontaildb_client.bulk_loader import BulkLoader
+from cottontaildb_client.channel_pool import ChannelPool
+from cottontaildb_client.async_client import AsyncCottontailDBClient
+from cottontaildb_client.sharded_client import ShardedCottontailClient
+from cottontaildb_client.errors import CottontailDBError, DeadlineExceededError, CancelledError, UnavailableError, \
+    CircuitOpenError
+from cottontaildb_client.retry import RetryPolicy, CircuitBreaker
+from cottontaildb_client.query_hints import query_hints
+from cottontaildb_client.query_builder import QueryBuilder, Param
+from cottontaildb_client.cache import QueryCache
+from cottontaildb_client.sampling import sample_from, Estimate
+from cottontaildb_client.pagination import Page
@@ -0,0 +1,111 @@
+from typing import Callable
+
+import numpy as np
+
+from .columnar import decode_columns, SCALAR_COLUMN_TYPES, VECTOR_COLUMN_TYPES
+from .cottontail_pb2 import Type, QueryResponseMessage
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+def require_pyarrow():
+    """Raises an ImportError if pyarrow is not installed."""
+    if pa is None:
+        raise ImportError('pyarrow is required for Arrow output, install with: pip install cottontaildb-client[arrow]')
+
+
+def arrow_type(column):
+    """
+    Returns the Arrow data type of a column definition.
+
+    Vector columns are mapped to fixed size lists of the vector's element type, or to variable size lists if the
+    column has no declared length, complex numbers to structs of their real and imaginary parts.
+
+    @param column: column definition of a query response
+    @return: Arrow data type
+    """
+    if column.type in VECTOR_COLUMN_TYPES:
+        element_type = _element_type(VECTOR_COLUMN_TYPES[column.type][1])
+        return pa.list_(element_type, column.length) if column.length > 0 else pa.list_(element_type)
+    if column.type == Type.DATE:
+        return pa.timestamp('ms', tz='UTC')
+    if column.type == Type.UUID:
+        return pa.string()
+    if column.type in SCALAR_COLUMN_TYPES:
+        return _element_type(SCALAR_COLUMN_TYPES[column.type][1], column.type)
+    if column.type == Type.COMPLEX32:
+        return _element_type(np.complex64)
+    if column.type == Type.COMPLEX64:
+        return _element_type(np.complex128)
+    raise ValueError(f'unsupported column type {Type.Name(column.type)} of column {column.name.name}')
+
+
+def arrow_schema(columns):
+    """
+    Derives the Arrow schema of a query result from its column definitions.
+
+    @param columns: column definitions of a query response
+    @return: Arrow schema
+    """
+    return pa.schema([pa.field(c.name.name, arrow_type(c), nullable=c.nullable) for c in columns])
+
+
+def record_batch(response: QueryResponseMessage, parse_literal: Callable):
+    """
+    Decodes a query response into an Arrow record batch.
+
+    @param response: query response message to decode
+    @param parse_literal: function decoding a single literal into a Python object
+    @return: record batch with one column per result column
+    """
+    require_pyarrow()
+    schema = arrow_schema(response.columns)
+    columns = decode_columns(response, parse_literal)
+    arrays = [_arrow_array(columns[c.name.name], field.type) for c, field in zip(response.columns, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _element_type(dtype, type_=None):
+    if type_ == Type.STRING:
+        return pa.string()
+    if type_ == Type.BYTESTRING:
+        return pa.binary()
+    if np.issubdtype(dtype, np.complexfloating):
+        float_type = pa.float32() if dtype == np.complex64 else pa.float64()
+        return pa.struct([('real', float_type), ('imaginary', float_type)])
+    return pa.from_numpy_dtype(dtype)
+
+
+def _arrow_array(array, type_):
+    if pa.types.is_fixed_size_list(type_) or pa.types.is_list(type_):
+        if array.ndim == 2:
+            values = _arrow_array(array.reshape(-1), type_.value_type)
+            if pa.types.is_list(type_):
+                offsets = pa.array(np.arange(len(array) + 1, dtype=np.int32) * array.shape[1])
+                return pa.ListArray.from_arrays(offsets, values, type=type_)
+            return pa.FixedSizeListArray.from_arrays(values, type_.list_size)
+        # Vector columns containing null values are decoded into (masked) object arrays of vectors
+        vectors = [None if v is None or v is np.ma.masked else np.asarray(v) for v in array.tolist()]
+        return pa.array([None if v is None else _python_values(v) for v in vectors], type=type_)
+    if pa.types.is_struct(type_):
+        values = array.filled(0) if isinstance(array, np.ma.MaskedArray) else array
+        values = np.asarray(values, dtype=np.complex128)
+        mask = pa.array(np.ma.getmaskarray(array)) if isinstance(array, np.ma.MaskedArray) else None
+        return pa.StructArray.from_arrays([pa.array(values.real, type=type_[0].type),
+                                           pa.array(values.imag, type=type_[1].type)],
+                                          fields=list(type_), mask=mask)
+    if pa.types.is_string(type_) and array.dtype == np.object_:
+        array = np.ma.masked_array([None if v is None else str(v) for v in array.tolist()],
+                                   mask=np.ma.getmaskarray(array), dtype=np.object_)
+    if isinstance(array, np.ma.MaskedArray):
+        return pa.array(array.data, mask=np.ma.getmaskarray(array), type=type_)
+    return pa.array(array, type=type_)
+
+
+def _python_values(vector):
+    if np.issubdtype(vector.dtype, np.complexfloating):
+        return [{'real': float(v.real), 'imaginary': float(v.imag)} for v in vector]
+    return vector.tolist()
@@ -0,0 +1,484 @@
+import asyncio
+import time
+from typing import List
+
+import grpc
+from google.protobuf.empty_pb2 import Empty
+
+from .cottontail_pb2 import SchemaName, CreateSchemaMessage, DropSchemaMessage, EntityName, CreateEntityMessage, \
+    ColumnName, Scan, From, ListSchemaMessage, ListEntityMessage, EntityDetailsMessage, DropEntityMessage, \
+    TruncateEntityMessage, IndexName, IndexType, CreateIndexMessage, DropIndexMessage, RebuildIndexMessage, \
+    UpdateMessage, DeleteMessage, RequestMetadata, AnalyzeEntityMessage
+from .cottontail_pb2_grpc import DDLStub, DMLStub, TXNStub, DQLStub
+from .cottontaildb_client import _CottontailDBClientBase
+from .query_hints import merge_hints
+
+
+class AsyncCottontailDBClient(_CottontailDBClientBase):
+    """
+    Cottontail DB client for asyncio built on grpc.aio.
+
+    Provides the same operations as CottontailDBClient as coroutines. Queries are async iterators yielding rows as
+    response messages arrive, e.g.:
+
+    async with AsyncCottontailDBClient('localhost', 1865) as client:
+        async for row in client.query('schema', 'entity', projection, None):
+            ...
+    """
+
+    def __init__(self, host, port, with_transaction=False, timeout=None, compression=None, wait_for_ready=None,
+                 max_send_message_size=None, max_receive_message_size=None, keepalive_time_ms=None,
+                 keepalive_timeout_ms=None, keepalive_permit_without_calls=None, http2_window_size=None,
+                 http2_bdp_probe=None, hints: RequestMetadata = None):
+        """
+        @param host: Cottontail DB host
+        @param port: Cottontail DB port
+        @param with_transaction: if a transaction should be started when entering the client
+        The remaining arguments configure the default timeout, compression, wait_for_ready, the channel and the default
+        query planner hints like in CottontailDBClient.
+        """
+        self._host = host
+        self._port = port
+        self._with_transaction = with_transaction
+        self._transaction = False
+        self._tid = None
+        self._channel = None
+        self._hints = merge_hints(RequestMetadata(), hints)
+        self._init_call_options(timeout, compression, wait_for_ready, {
+            'max_send_message_size': max_send_message_size,
+            'max_receive_message_size': max_receive_message_size,
+            'keepalive_time_ms': keepalive_time_ms,
+            'keepalive_timeout_ms': keepalive_timeout_ms,
+            'keepalive_permit_without_calls': keepalive_permit_without_calls,
+            'http2_window_size': http2_window_size,
+            'http2_bdp_probe': http2_bdp_probe,
+        })
+
+    async def __aenter__(self):
+        self._channel = grpc.aio.insecure_channel(f'{self._host}:{self._port}', self._channel_options,
+                                                  self._compression)
+        self._ddl = DDLStub(self._channel)
+        self._dml = DMLStub(self._channel)
+        self._txn = TXNStub(self._channel)
+        self._dql = DQLStub(self._channel)
+        if self._with_transaction:
+            await self.start_transaction()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        if self._transaction:
+            await self.commit_transaction()
+        if self._channel is not None:
+            await self._channel.close()
+
+    # Transactions
+
+    async def start_transaction(self):
+        """Starts a transaction that all further changes will be associated with."""
+        if self._transaction:
+            raise Exception('Transaction already running!')
+        self._transaction = True
+        metadata = await self._txn.Begin(Empty(), **self._call_kwargs())
+        self._tid = metadata.transactionId
+
+    async def commit_transaction(self):
+        """Commits the current transaction."""
+        if not self._transaction:
+            raise Exception('No transaction running!')
+        await self._txn.Commit(RequestMetadata(transactionId=self._tid), **self._call_kwargs())
+        self._tid = None
+        self._transaction = False
+
+    async def abort_transaction(self):
+        """Aborts the current transaction and rolls back work. Blocks if a query is ongoing."""
+        if not self._transaction:
+            raise Exception('No transaction running!')
+        await self._txn.Rollback(RequestMetadata(transactionId=self._tid), **self._call_kwargs())
+        self._tid = None
+        self._transaction = False
+
+    async def kill_transaction(self):
+        """Kills the current transaction and rolls back work."""
+        if not self._transaction:
+            raise Exception('No transaction running!')
+        await self._txn.Kill(RequestMetadata(transactionId=self._tid), **self._call_kwargs())
+        self._tid = None
+        self._transaction = False
+
+    async def list_transactions(self):
+        """Lists all active transactions."""
+        return [r async for r in self._iter_responses(self._txn.ListTransactions(Empty(), **self._call_kwargs()))]
+
+    async def list_locks(self):
+        """Lists all active locks on database objects."""
+        return [r async for r in self._iter_responses(self._txn.ListLocks(Empty(), **self._call_kwargs()))]
+
+    # Data definition
+
+    async def create_schema(self, schema, exist_ok=False):
+        """
+        Creates a new schema with the given name.
+
+        @param schema: name of the entity's schema
+        @param exist_ok: if the client should first check if the schema already exists
+        @return: query response if there was a schema create attempt or None if exist_ok and schema already exists
+        """
+        if exist_ok and schema in [s.split('.')[-1] for s in await self.list_schemas()]:
+            return
+        schema_name = SchemaName(name=schema)
+        message = CreateSchemaMessage(metadata=RequestMetadata(transactionId=self._tid), schema=schema_name)
+        response = await self._ddl.CreateSchema(message, **self._call_kwargs())
+        return self._parse_query_response(response)
+
+    async def drop_schema(self, schema):
+        """Drops the schema with the given name."""
+        schema_name = SchemaName(name=schema)
+        message = DropSchemaMessage(metadata=RequestMetadata(transactionId=self._tid), schema=schema_name)
+        response = await self._ddl.DropSchema(message, **self._call_kwargs())
+        return self._parse_query_response(response)
+
+    async def create_entity(self, schema, entity, columns, exist_ok=False):
+        """
+        Creates an entity in the given schema with the defined columns.
+
+        @param schema: name of the entity's schema
+        @param entity: entity name
+        @param columns: list of ColumnDefinition objects defining the entity's columns
+        @param exist_ok: if the client should first check if the entity already exists
+        @return: query response
+        """
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        message = CreateEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name,
+                                      columns=columns, mayExist=exist_ok)
+        response = await self._ddl.CreateEntity(message, **self._call_kwargs())
+        return self._parse_query_response(response)
+
+    async def drop_entity(self, schema, entity, not_exist_ok=True):
+        """Drops the given entity from the given schema."""
+        if not_exist_ok and entity not in [s.split('.')[-1] for s in await self.list_entities(schema)]:
+            return
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        message = DropEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name)
+        response = await self._ddl.DropEntity(message, **self._call_kwargs())
+        return self._parse_query_response(response)
+
+    async def truncate_entity(self, schema, entity, not_exist_ok=True):
+        """Truncates the specified entity."""
+        if not_exist_ok and entity not in [s.split('.')[-1] for s in await self.list_entities(schema)]:
+            return
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        message = TruncateEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name)
+        response = await self._ddl.TruncateEntity(message, **self._call_kwargs())
+        return self._parse_query_response(response)
+
+    async def analyze_entity(self, schema, entity, async_=False):
+        """Optimizes the specified entity."""
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        kwargs = {
+            'async': async_
+        }
+        message = AnalyzeEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name, **kwargs)
+        response = await self._ddl.AnalyzeEntity(message, **self._call_kwargs())
+        return self._parse_query_response(response)
+
+    async def create_index(self, schema, entity, index, index_type: IndexType, columns: List[str], params=None):
+        """
+        Creates an index on a column.
+
+        @param schema: name of the index's schema
+        @param entity: name of the index's entity
+        @param index: index name
+        @param index_type: type of index
+        @param columns: columns to build index for
+        @param params: additional parameters for the index
+        """
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        message = CreateIndexMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name,
+                                     type=index_type, indexName=index, columns=columns, params=params)
+        response = await self._ddl.CreateIndex(message, **self._call_kwargs())
+        return self._parse_query_response(response)
+
+    async def drop_index(self, schema, entity, index):
+        """Drops the specified index."""
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        index_name = IndexName(entity=entity_name, name=index)
+        message = DropIndexMessage(metadata=RequestMetadata(transactionId=self._tid), index=index_name)
+        response = await self._ddl.DropIndex(message, **self._call_kwargs())
+        return self._parse_query_response(response)
+
+    async def rebuild_index(self, schema, entity, index):
+        """Rebuilds the specified index."""
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        index_name = IndexName(entity=entity_name, name=index)
+        message = RebuildIndexMessage(metadata=RequestMetadata(transactionId=self._tid), index=index_name)
+        response = await self._ddl.RebuildIndex(message, **self._call_kwargs())
+        return self._parse_query_response(response)
+
+    async def list_schemas(self):
+        """Lists all schemas in the database."""
+        message = ListSchemaMessage(metadata=RequestMetadata(transactionId=self._tid))
+        responses = self._ddl.ListSchemas(message, **self._call_kwargs())
+        return [t.data[0].stringData async for response in responses for t in response.tuples]
+
+    async def list_entities(self, schema):
+        """
+        Lists all entities of the specified schema
+
+        @param schema: schema of which to list entities
+        @return: list of entity names
+        """
+        schema_name = SchemaName(name=schema)
+        message = ListEntityMessage(metadata=RequestMetadata(transactionId=self._tid), schema=schema_name)
+        responses = self._ddl.ListEntities(message, **self._call_kwargs())
+        return [t.data[0].stringData async for response in responses for t in response.tuples]
+
+    async def get_entity_details(self, schema, entity):
+        """
+        Retrieves details about an entity.
+
+        @param schema: the entity's schema
+        @param entity: entity name
+        @return: dictionary containing entity details
+        """
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        message = EntityDetailsMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name)
+        response = await self._ddl.EntityDetails(message, **self._call_kwargs())
+        return self._parse_entity_details(response)
+
+    def sample_entity(self, schema, entity, limit=10, skip=0, hints=None):
+        """
+        Retrieves a preview of the specified entity as async iterator of rows.
+
+        @param schema: the entity's schema
+        @param entity: entity name
+        @param limit: number of rows to return
+        @param skip: number of rows to skip from the beginning
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        """
+        projection = self._sample_projection(schema, entity)
+        return self.query(schema, entity, projection, None, limit=limit, skip=skip, hints=hints)
+
+    # Data management
+
+    async def insert(self, schema, entity, values):
+        """
+        Inserts column values into an entity.
+
+        @param schema: name of the entity's schema
+        @param entity: entity name
+        @param values: dictionary of (column name, Literal value) key-value pairs
+        @return: query response message
+        """
+        message = self._insert_helper(schema, entity, values)
+        return await self._dml.Insert(message, **self._call_kwargs())
+
+    async def insert_batch(self, schema, entity, columns, values, max_message_size=None, max_rows=None,
+                           max_in_flight=1, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Inserts column values into an entity in a batch, see CottontailDBClient.insert_batch.
+
+        @param schema: name of the entity's schema
+        @param entity: entity name
+        @param columns: The names of the columns to insert values for (same length as values sub-lists)
+        @param values: list of Literal value lists, where each sub-list contains for a value for each column
+        @param max_message_size: maximum serialized size of a batch insert message in bytes, defaults to the maximum
+                                 send message size of the client
+        @param max_rows: maximum number of rows per batch insert message, unbounded if None
+        @param max_in_flight: maximum number of batch insert messages sent concurrently
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: list of chunk reports
+        """
+        messages = self._batch_insert_chunks(schema, entity, columns, values, max_message_size, max_rows)
+        call_kwargs = self._call_kwargs(compression, wait_for_ready, timeout)
+        return await self._send_batches(messages, max_in_flight, call_kwargs)
+
+    async def insert_arrays(self, schema, entity, columns, types=None, max_message_size=None, max_rows=None,
+                            max_in_flight=1, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Inserts columns of values into an entity in a batch, see CottontailDBClient.insert_arrays.
+
+        @param schema: name of the entity's schema
+        @param entity: entity name
+        @param columns: dictionary of (column name, array or list of values) key-value pairs of equal length
+        @param types: dictionary of (column name, Type) key-value pairs, types of other columns are retrieved from
+                      the entity details or inferred from the array dtype
+        @param max_message_size: maximum serialized size of a batch insert message in bytes, defaults to the maximum
+                                 send message size of the client
+        @param max_rows: maximum number of rows per batch insert message, unbounded if None
+        @param max_in_flight: maximum number of batch insert messages sent concurrently
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: list of chunk reports
+        """
+        types = await self._insert_types(schema, entity, columns, types)
+        messages = self._array_insert_chunks(schema, entity, columns, types, max_message_size, max_rows)
+        call_kwargs = self._call_kwargs(compression, wait_for_ready, timeout)
+        return await self._send_batches(messages, max_in_flight, call_kwargs)
+
+    async def _insert_types(self, schema, entity, columns, types):
+        """Completes the given column types with the entity's column types or types inferred from the values."""
+        entity_types = None
+        if self._untyped_columns(columns, types):
+            entity_types = self._entity_column_types(await self.get_entity_details(schema, entity))
+        return self._complete_types(columns, types, entity_types)
+
+    async def _send_batches(self, messages, max_in_flight, call_kwargs):
+        """Sends batch insert messages with up to max_in_flight concurrent calls and reports on each."""
+        semaphore = asyncio.Semaphore(max(max_in_flight, 1))
+
+        async def send(message):
+            try:
+                report = {'rows': len(message.inserts), 'bytes': message.ByteSize()}
+                start = time.perf_counter()
+                await self._dml.InsertBatch(message, **call_kwargs)
+                report['seconds'] = time.perf_counter() - start
+                return report
+            finally:
+                semaphore.release()
+
+        tasks = []
+        try:
+            for message in messages:
+                # Wait for a free slot before encoding the next chunk
+                await semaphore.acquire()
+                tasks.append(asyncio.ensure_future(send(message)))
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def update(self, schema, entity, where, updates):
+        """
+        Updates the rows in schema.entity selected through the where clause with the values from updates.
+
+        @param schema: the schema containing the entity to update
+        @param entity: the entity containing rows to update
+        @param where: where clause selecting rows to update
+        @param updates: dictionary of (column name, Literal value expression) key-value pairs to update selected rows
+        """
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        from_kwarg = {'from': From(scan=Scan(entity=entity_name))}
+        updates_list = [UpdateMessage.UpdateElement(column=ColumnName(name=column), value=value)
+                        for column, value in updates.items()]
+        message = UpdateMessage(metadata=RequestMetadata(transactionId=self._tid), **from_kwarg, where=where,
+                                updates=updates_list)
+        return await self._dml.Update(message, **self._call_kwargs())
+
+    async def delete(self, schema, entity, where):
+        """
+        Deletes the rows in schema.entity selected through the where clause.
+
+        @param schema: the schema containing the entity to delete
+        @param entity: the entity containing rows to delete
+        @param where: where clause selecting rows to delete
+        """
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        from_kwarg = {'from': From(scan=Scan(entity=entity_name))}
+        message = DeleteMessage(metadata=RequestMetadata(transactionId=self._tid), **from_kwarg, where=where)
+        return await self._dml.Delete(message, **self._call_kwargs())
+
+    # Data query
+
+    async def ping(self):
+        """Sends a ping message to the endpoint. If method returns without exception endpoint is connected."""
+        await self._dql.Ping(Empty(), **self._call_kwargs())
+
+    def nns(self, schema, entity, query_vector, distance='manhattan', limit=None, vector_col='feature', id_col='id',
+            half=False, hints=None):
+        """
+        Queries the specified entity with the given vector, see CottontailDBClient.nns.
+
+        @return: async iterator of result rows
+        """
+        projection, order = self._nns_projection(schema, entity, query_vector, distance, vector_col, id_col, half)
+        return self.query(schema, entity, projection, None, limit=limit, order=order, hints=hints)
+
+    def query(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None, batches=False,
+              compact=False, hints=None, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Queries the specified entity where the provided conditions are met and applies the given projection.
+
+        Yields the result as each response message arrives. Closing the iterator before it is exhausted cancels the
+        underlying gRPC call.
+
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param projection: the projection to be applied to the result
+        @param where: where clause specifying the rows to return
+        @param order: order by clause specifying the order of the result
+        @param limit: maximum number of rows to return
+        @param skip: number of rows to skip
+        @param from_: from clause, defaults to scan of the entity
+        @param batches: if True, yields one list of rows per response message instead of single rows
+        @param compact: if True, yields rows as named tuples instead of dictionaries
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: async iterator of result rows
+        """
+        message = self._query_message(schema, entity, projection, where, order, limit, skip, from_, hints)
+        responses = self._dql.Query(message, **self._call_kwargs(compression, wait_for_ready, timeout))
+        return self._iter_responses(responses, batches, compact)
+
+    def execute(self, template, params=None, batches=False, compact=False, hints=None, compression=None,
+                wait_for_ready=None, timeout=None):
+        """
+        Executes a compiled query template with the given parameter values, see CottontailDBClient.execute.
+
+        @return: async iterator of result rows
+        """
+        message = self._template_message(template, params, hints)
+        responses = self._dql.Query(message, **self._call_kwargs(compression, wait_for_ready, timeout))
+        return self._iter_responses(responses, batches, compact)
+
+    def _iter_responses(self, call, batches=False, compact=False):
+        return _ResponseStream(call, self._parse_responses(call, batches, compact))
+
+    async def _parse_responses(self, call, batches, compact):
+        try:
+            async for response in call:
+                rows = self._parse_query_response(response, compact)
+                if batches:
+                    yield rows
+                else:
+                    for row in rows:
+                        yield row
+        finally:
+            call.cancel()
+
+
+class _ResponseStream:
+    """Async iterator over the items of a streaming call that cancels the call when closed before it is exhausted."""
+
+    def __init__(self, call, items):
+        self._call = call
+        self._items = items
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        return self._items.__anext__()
+
+    async def aclose(self):
+        await self._items.aclose()
+        # Closing an async generator that never started skips its cleanup
+        self._call.cancel()
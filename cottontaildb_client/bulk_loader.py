@@ -0,0 +1,156 @@
+import threading
+import time
+from queue import Queue
+
+from .cottontaildb_client import CottontailDBClient
+
+# Marks the end of the input and message queues
+_DONE = object()
+
+
+class BulkLoader:
+    """
+    Pipelined bulk loader for an entity.
+
+    Submitted rows and column arrays are encoded into chunked batch insert messages on a producer thread, while up to
+    max_in_flight insert calls are kept in flight by sender threads sharing the client's channel. Both queues are
+    bounded, so submitting blocks while the loader is busy. Insert errors do not stop the loader, they are collected in
+    the report returned by close.
+
+    Example usage:
+    with BulkLoader(client, 'schema', 'entity', ['id', 'feature']) as loader:
+        for ids, features in batches:
+            loader.submit_arrays({'id': ids, 'feature': features})
+    print(loader.report)
+    """
+
+    def __init__(self, client: CottontailDBClient, schema, entity, columns, types=None,
+                 max_message_size=None, max_rows=None, max_in_flight=4, queue_size=8):
+        """
+        @param client: connected client used to send the batch insert messages
+        @param schema: name of the entity's schema
+        @param entity: entity name
+        @param columns: names of the columns to insert values for
+        @param types: dictionary of (column name, Type) key-value pairs for submitted arrays, types of other columns
+                      are retrieved from the entity details or inferred from the array dtype
+        @param max_message_size: maximum serialized size of a batch insert message in bytes, defaults to the maximum
+                                 send message size of the client
+        @param max_rows: maximum number of rows per batch insert message, unbounded if None
+        @param max_in_flight: number of batch insert calls kept in flight
+        @param queue_size: maximum number of pending submissions and of pending encoded messages
+        """
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be at least 1')
+        self._client = client
+        self._schema = schema
+        self._entity = entity
+        self._columns = list(columns)
+        self._types = types
+        self._max_message_size = max_message_size
+        self._max_rows = max_rows
+        self._input = Queue(maxsize=queue_size)
+        self._messages = Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._start = time.perf_counter()
+        self.report = {'rows': 0, 'batches': 0, 'bytes': 0, 'seconds': 0.0, 'rows_per_second': 0.0, 'errors': []}
+
+        self._producer = threading.Thread(target=self._produce, name='BulkLoader-producer', daemon=True)
+        self._senders = [threading.Thread(target=self._send, name=f'BulkLoader-sender-{i}', daemon=True)
+                         for i in range(max_in_flight)]
+        self._producer.start()
+        for sender in self._senders:
+            sender.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, values):
+        """
+        Submits rows of Literal values for insertion. Blocks while the input queue is full.
+
+        @param values: list of Literal value lists, where each sub-list contains a value for each column
+        """
+        self._submit(('rows', values))
+
+    def submit_arrays(self, columns):
+        """
+        Submits columns of values for insertion, see CottontailDBClient.insert_arrays. Blocks while the input queue is
+        full.
+
+        @param columns: dictionary of (column name, array or list of values) key-value pairs of equal length
+        """
+        if set(columns) != set(self._columns):
+            raise ValueError(f'expected values for columns {self._columns}, got {list(columns)}')
+        self._submit(('arrays', {name: columns[name] for name in self._columns}))
+
+    def close(self):
+        """
+        Flushes all submitted values, waits for all insert calls to complete and stops the loader.
+
+        @return: report containing the number of inserted 'rows', 'batches' and 'bytes', the total 'seconds' and
+                 'rows_per_second', and a list of 'errors' of failed batches
+        """
+        if not self._closed:
+            self._closed = True
+            self._input.put(_DONE)
+            self._producer.join()
+            for sender in self._senders:
+                sender.join()
+            self._client._invalidate(f'{self._schema}.{self._entity}')
+            self.report['seconds'] = time.perf_counter() - self._start
+            if self.report['seconds'] > 0:
+                self.report['rows_per_second'] = self.report['rows'] / self.report['seconds']
+        return self.report
+
+    def _submit(self, item):
+        if self._closed:
+            raise Exception('Bulk loader already closed!')
+        self._input.put(item)
+
+    def _produce(self):
+        types = None
+        try:
+            while True:
+                item = self._input.get()
+                if item is _DONE:
+                    break
+                kind, values = item
+                try:
+                    if kind == 'rows':
+                        messages = self._client._batch_insert_chunks(self._schema, self._entity, self._columns, values,
+                                                                     self._max_message_size, self._max_rows)
+                    else:
+                        if types is None:
+                            types = self._client._insert_types(self._schema, self._entity, values, self._types)
+                        messages = self._client._array_insert_chunks(self._schema, self._entity, values, types,
+                                                                     self._max_message_size, self._max_rows)
+                    for message in messages:
+                        self._messages.put(message)
+                except Exception as error:
+                    self._record_error(len(values) if kind == 'rows' else len(next(iter(values.values()))), error)
+        finally:
+            for _ in self._senders:
+                self._messages.put(_DONE)
+
+    def _send(self):
+        while True:
+            message = self._messages.get()
+            if message is _DONE:
+                break
+            try:
+                self._client._dml.InsertBatch(message, **self._client._call_kwargs())
+            except Exception as error:
+                self._record_error(len(message.inserts), error)
+                continue
+            with self._lock:
+                self.report['rows'] += len(message.inserts)
+                self.report['batches'] += 1
+                self.report['bytes'] += message.ByteSize()
+
+    def _record_error(self, rows, error):
+        with self._lock:
+            self.report['errors'].append({'rows': rows, 'error': error})
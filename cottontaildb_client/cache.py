@@ -0,0 +1,197 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Default memory bound of a query cache in bytes
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class QueryCache:
+    """
+    Least recently used cache of query results with optional time to live, bounded by the total serialized size of
+    the cached response messages.
+
+    Entries are tagged with the entity they were read from, so the client can invalidate all results of an entity it
+    modifies. Results of queries that were running while their entity was invalidated are not cached, as they may
+    predate the write, see generation. Writes by other clients are only reflected once entries expire. A cache can be
+    shared by several clients, entries are keyed by endpoint. The cache is safe to share across threads.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_SIZE, ttl=None):
+        """
+        @param max_bytes: maximum total size of the cached entries in bytes
+        @param ttl: time in seconds after which entries expire, never if None
+        """
+        if max_bytes < 1:
+            raise ValueError('max_bytes must be at least 1')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be a positive number of seconds')
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._entities = {}
+        self._generations = {}
+        self._schema_generations = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """
+        @return: dictionary of the numbers of 'hits', 'misses', entries evicted to stay within the memory bound
+                 ('evictions'), expired entries ('expirations') and entries dropped by writes ('invalidations'), the
+                 number of cached 'entries' and their total size in 'bytes'
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        return stats
+
+    def get(self, key):
+        """
+        Looks up an entry and marks it as most recently used.
+
+        @param key: hashable cache key
+        @return: cached value or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[3] > self.ttl:
+                self._remove(key)
+                self._stats['expirations'] += 1
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[0]
+
+    def generation(self, entity):
+        """
+        Returns the generation of an entity, which changes whenever the entity or its schema is invalidated.
+
+        @param entity: entity as 'schema.entity', or None for values depending on no entity
+        @return: opaque generation to pass to put
+        """
+        with self._lock:
+            return self._generations.get(entity, 0), self._schema_generations.get(_schema(entity), 0)
+
+    def put(self, key, entity, value, size, generation=None):
+        """
+        Caches a value, evicting the least recently used entries to stay within the memory bound. Values larger than
+        the bound are not cached.
+
+        @param key: hashable cache key
+        @param entity: entity the value was read from as 'schema.entity', or None for values depending on no entity
+        @param value: cached value
+        @param size: size of the value in bytes
+        @param generation: generation of the entity before the value was read, the value is not cached if the entity
+                           was invalidated since
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            current = self._generations.get(entity, 0), self._schema_generations.get(_schema(entity), 0)
+            if generation is not None and generation != current:
+                return
+            if key in self._entries:
+                self._remove(key)
+            while self._bytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+            self._entries[key] = (value, entity, size, time.monotonic())
+            self._entities.setdefault(entity, set()).add(key)
+            self._bytes += size
+
+    def invalidate(self, entity=None, schema=None):
+        """
+        Drops the entries read from an entity or all entities of a schema.
+
+        @param entity: entity as 'schema.entity', None for the entries depending on no entity
+        @param schema: schema name, drops entries of all its entities
+        """
+        with self._lock:
+            if schema is not None:
+                self._schema_generations[schema] = self._schema_generations.get(schema, 0) + 1
+                entities = [e for e in self._entities if e is not None and _schema(e) == schema]
+            else:
+                self._generations[entity] = self._generations.get(entity, 0) + 1
+                entities = [entity] if entity in self._entities else []
+            for e in entities:
+                for key in list(self._entities[e]):
+                    self._remove(key)
+                    self._stats['invalidations'] += 1
+
+    def clear(self):
+        """Drops all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._entities.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, entity, size, _ = self._entries.pop(key)
+        keys = self._entities[entity]
+        keys.discard(key)
+        if not keys:
+            del self._entities[entity]
+        self._bytes -= size
+
+
+def _schema(entity):
+    return entity.split('.', 1)[0] if entity is not None else None
+
+
+class CachingCall:
+    """Response iterator of a streaming call that stores all responses in the cache once the call completes."""
+
+    def __init__(self, call, store):
+        """
+        @param call: response iterator of the streaming call
+        @param store: function receiving the list of responses of the completed call
+        """
+        self._call = call
+        self._store = store
+        self._responses = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            response = next(self._call)
+        except StopIteration:
+            if self._responses is not None:
+                self._store(self._responses)
+                self._responses = None
+            raise
+        if self._responses is not None:
+            self._responses.append(response)
+        return response
+
+    def cancel(self):
+        # Results of cancelled calls are incomplete and never stored
+        self._responses = None
+        return self._call.cancel()
+
+
+class CachedCall:
+    """Response iterator replaying cached responses in place of a streaming call."""
+
+    def __init__(self, responses):
+        self._responses = iter(responses)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._responses)
+
+    def cancel(self):
+        return False
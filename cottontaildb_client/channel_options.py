@@ -0,0 +1,64 @@
+import grpc
+
+COMPRESSION_ALGORITHMS = {
+    'none': grpc.Compression.NoCompression,
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate,
+}
+
+
+def parse_compression(compression):
+    """
+    Parses a compression algorithm.
+
+    @param compression: 'none', 'gzip', 'deflate', a grpc.Compression or None for the default
+    @return: grpc.Compression or None
+    """
+    if compression is None or isinstance(compression, grpc.Compression):
+        return compression
+    if isinstance(compression, str) and compression.lower() in COMPRESSION_ALGORITHMS:
+        return COMPRESSION_ALGORITHMS[compression.lower()]
+    raise ValueError(f'unknown compression {compression!r}, expected one of {list(COMPRESSION_ALGORITHMS)}')
+
+
+def channel_options(max_send_message_size=None, max_receive_message_size=None, keepalive_time_ms=None,
+                    keepalive_timeout_ms=None, keepalive_permit_without_calls=None, http2_window_size=None,
+                    http2_bdp_probe=None):
+    """
+    Validates channel arguments and converts them into gRPC channel options. Arguments that are None keep the gRPC
+    defaults.
+
+    @param max_send_message_size: maximum size of sent messages in bytes, -1 for unlimited
+    @param max_receive_message_size: maximum size of received messages in bytes, -1 for unlimited
+    @param keepalive_time_ms: interval of keepalive pings in milliseconds
+    @param keepalive_timeout_ms: time to wait for a keepalive ping acknowledgement before closing the connection
+    @param keepalive_permit_without_calls: if keepalive pings are sent while there are no calls in flight
+    @param http2_window_size: initial HTTP/2 stream flow control window in bytes
+    @param http2_bdp_probe: if the HTTP/2 flow control window is adjusted by bandwidth-delay product probing
+    @return: list of (option name, value) pairs
+    """
+    options = []
+    for name, value in (('grpc.max_send_message_length', max_send_message_size),
+                        ('grpc.max_receive_message_length', max_receive_message_size)):
+        if value is not None:
+            if not _is_int(value) or (value < 1 and value != -1):
+                raise ValueError(f'{name} must be a positive number of bytes or -1, got {value!r}')
+            options.append((name, value))
+    for name, value in (('grpc.keepalive_time_ms', keepalive_time_ms),
+                        ('grpc.keepalive_timeout_ms', keepalive_timeout_ms),
+                        ('grpc.http2.lookahead_bytes', http2_window_size)):
+        if value is not None:
+            if not _is_int(value) or value < 1:
+                raise ValueError(f'{name} must be a positive integer, got {value!r}')
+            options.append((name, value))
+    for name, value in (('grpc.keepalive_permit_without_calls', keepalive_permit_without_calls),
+                        ('grpc.http2.bdp_probe', http2_bdp_probe)):
+        if value is not None:
+            if not isinstance(value, bool):
+                raise ValueError(f'{name} must be a boolean, got {value!r}')
+            options.append((name, int(value)))
+    return options
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
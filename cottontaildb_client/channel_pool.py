@@ -0,0 +1,139 @@
+import threading
+
+import grpc
+from google.protobuf.empty_pb2 import Empty
+
+from .cottontail_pb2_grpc import DQLStub
+
+ROUND_ROBIN = 'round_robin'
+LEAST_IN_FLIGHT = 'least_in_flight'
+BALANCING_POLICIES = (ROUND_ROBIN, LEAST_IN_FLIGHT)
+
+
+class ChannelPool:
+    """
+    Pool of gRPC channels to the same Cottontail DB endpoint.
+
+    Each channel is its own HTTP/2 connection, so calls from many threads are not limited by the concurrent stream
+    limit of a single connection. Stubs created with stub dispatch every call to a channel selected by the balancing
+    policy, either in turn (round_robin) or the one with the fewest calls in flight (least_in_flight). Channels that
+    failed the last health check are skipped unless no channel is healthy. The pool is safe to share across threads.
+    """
+
+    def __init__(self, target, size=4, balancing=ROUND_ROBIN, options=None, compression=None):
+        """
+        @param target: endpoint address as 'host:port'
+        @param size: number of channels
+        @param balancing: channel selection policy, 'round_robin' or 'least_in_flight'
+        @param options: channel options passed to grpc.insecure_channel
+        @param compression: default compression of the channels as grpc.Compression
+        """
+        if size < 1:
+            raise ValueError('pool size must be at least 1')
+        if balancing not in BALANCING_POLICIES:
+            raise ValueError(f'unknown balancing policy {balancing!r}, expected one of {BALANCING_POLICIES}')
+        # Channels with equal arguments share subchannels of the global pool and thus their connection
+        options = list(options or []) + [('grpc.use_local_subchannel_pool', 1)]
+        self.channels = [grpc.insecure_channel(target, options, compression) for _ in range(size)]
+        self._balancing = balancing
+        self._in_flight = [0] * size
+        self._healthy = [True] * size
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def stub(self, stub_class):
+        """Creates a stub of the given class that dispatches each call to a channel of the pool."""
+        return _PooledStub(self, [stub_class(channel) for channel in self.channels])
+
+    @property
+    def in_flight(self):
+        """Number of calls in flight per channel."""
+        with self._lock:
+            return list(self._in_flight)
+
+    def health_check(self, timeout=1.0):
+        """
+        Pings the endpoint through every channel and skips channels that fail until the next health check.
+
+        @param timeout: timeout of each ping in seconds
+        @return: list of booleans indicating which channels are healthy
+        """
+        healthy = []
+        for channel in self.channels:
+            try:
+                DQLStub(channel).Ping(Empty(), timeout=timeout)
+                healthy.append(True)
+            except grpc.RpcError:
+                healthy.append(False)
+        with self._lock:
+            self._healthy = healthy
+        return healthy
+
+    def acquire(self):
+        """Selects a channel for a call and counts the call as in flight until released."""
+        with self._lock:
+            candidates = [i for i, healthy in enumerate(self._healthy) if healthy] or list(range(len(self.channels)))
+            # Rotate the candidates so ties between channels are broken in turn
+            offset = self._next % len(candidates)
+            candidates = candidates[offset:] + candidates[:offset]
+            self._next += 1
+            if self._balancing == LEAST_IN_FLIGHT:
+                index = min(candidates, key=self._in_flight.__getitem__)
+            else:
+                index = candidates[0]
+            self._in_flight[index] += 1
+            return index
+
+    def release(self, index):
+        """Marks a call on the given channel as completed."""
+        with self._lock:
+            self._in_flight[index] -= 1
+
+    def close(self):
+        for channel in self.channels:
+            channel.close()
+
+
+class _PooledStub:
+    """Stub proxy creating pooled methods on first access."""
+
+    def __init__(self, pool, stubs):
+        self._pool = pool
+        self._stubs = stubs
+
+    def __getattr__(self, name):
+        method = _PooledMethod(self._pool, [getattr(stub, name) for stub in self._stubs])
+        setattr(self, name, method)
+        return method
+
+
+class _PooledMethod:
+    """Multi-callable invoking the method of the stub on the channel selected by the pool."""
+
+    def __init__(self, pool, methods):
+        self._pool = pool
+        self._methods = methods
+
+    def __call__(self, request, *args, **kwargs):
+        index = self._pool.acquire()
+        try:
+            result = self._methods[index](request, *args, **kwargs)
+        except BaseException:
+            self._pool.release(index)
+            raise
+        if isinstance(result, grpc.Future):
+            # Response streams are in flight until they complete or are cancelled
+            result.add_done_callback(lambda _: self._pool.release(index))
+        else:
+            self._pool.release(index)
+        return result
+
+    def future(self, request, *args, **kwargs):
+        index = self._pool.acquire()
+        try:
+            future = self._methods[index].future(request, *args, **kwargs)
+        except BaseException:
+            self._pool.release(index)
+            raise
+        future.add_done_callback(lambda _: self._pool.release(index))
+        return future
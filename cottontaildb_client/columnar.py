@@ -0,0 +1,172 @@
+from itertools import chain
+from operator import attrgetter
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from .cottontail_pb2 import Type, QueryResponseMessage
+
+# Literal field and NumPy dtype of column types that can be decoded into flat typed arrays
+SCALAR_COLUMN_TYPES = {
+    Type.BOOLEAN: ('booleanData', np.bool_),
+    Type.BYTE: ('intData', np.int8),
+    Type.SHORT: ('intData', np.int16),
+    Type.INTEGER: ('intData', np.int32),
+    Type.LONG: ('longData', np.int64),
+    Type.FLOAT: ('floatData', np.float32),
+    Type.DOUBLE: ('doubleData', np.float64),
+    Type.DATE: ('dateData', np.dtype('datetime64[ms]')),
+    Type.STRING: ('stringData', np.object_),
+    Type.BYTESTRING: ('byteStringData', np.object_),
+}
+
+# Vector field, NumPy dtype and whether elements have a fixed wire size of vector column types
+VECTOR_COLUMN_TYPES = {
+    Type.HALF_VECTOR: ('half', np.float16, True),
+    Type.FLOAT_VECTOR: ('float', np.float32, True),
+    Type.DOUBLE_VECTOR: ('double', np.float64, True),
+    Type.SHORT_VECTOR: ('short', np.int16, False),
+    Type.INTEGER_VECTOR: ('int', np.int32, False),
+    Type.LONG_VECTOR: ('long', np.int64, False),
+    Type.BOOLEAN_VECTOR: ('bool', np.bool_, True),
+    Type.COMPLEX32_VECTOR: ('complex32', np.complex64, False),
+    Type.COMPLEX64_VECTOR: ('complex64', np.complex128, False),
+}
+
+# Little-endian dtypes of vector elements with a fixed size in the packed wire format
+_WIRE_DTYPES = {
+    'half': np.dtype('<f4'),
+    'float': np.dtype('<f4'),
+    'double': np.dtype('<f8'),
+    'bool': np.dtype('u1'),
+}
+
+
+def decode_columns(response: QueryResponseMessage, parse_literal: Callable) -> Dict[str, np.ndarray]:
+    """
+    Decodes the tuples of a query response column by column into NumPy arrays.
+
+    Columns of scalar types are decoded into arrays of the matching dtype and columns of vector types into 2-D arrays
+    with one row per tuple. Columns of nullable types containing null values are returned as masked arrays, vector
+    columns containing null values as masked object arrays of vectors. All other columns are decoded into object
+    arrays using parse_literal.
+
+    @param response: query response message to decode
+    @param parse_literal: function decoding a single literal into a Python object
+    @return: dictionary of (column name, array) key-value pairs
+    """
+    rows = [t.data for t in response.tuples]
+    return {
+        c.name.name: _decode_column(rows, i, c, parse_literal) for i, c in enumerate(response.columns)
+    }
+
+
+def concatenate_columns(batches: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """
+    Concatenates the decoded columns of multiple query responses.
+
+    @param batches: list of column dictionaries as returned by decode_columns
+    @return: dictionary of (column name, array) key-value pairs
+    """
+    if not batches:
+        return {}
+    if len(batches) == 1:
+        return batches[0]
+    return {name: _concatenate([b[name] for b in batches]) for name in batches[0]}
+
+
+def _concatenate(arrays):
+    # Empty responses decode vector columns of undeclared length to shape (0, 0), which does not match other batches
+    arrays = [a for a in arrays if len(a)] or arrays[:1]
+    if any(a.ndim != arrays[0].ndim for a in arrays):
+        # Vector columns fall back to object arrays of vectors in responses containing null values
+        arrays = [a if a.ndim == 1 else _rows_to_objects(a) for a in arrays]
+    if any(isinstance(a, np.ma.MaskedArray) for a in arrays):
+        return np.ma.concatenate(arrays)
+    return np.concatenate(arrays)
+
+
+def _rows_to_objects(array):
+    objects = np.empty(len(array), dtype=np.object_)
+    for i, row in enumerate(array):
+        objects[i] = row
+    return objects
+
+
+def _decode_column(rows, index, column, parse_literal):
+    n = len(rows)
+    mask = _null_mask(rows, index, column)
+    has_nulls = mask is not None and mask.any()
+
+    if column.type in SCALAR_COLUMN_TYPES:
+        field, dtype = SCALAR_COLUMN_TYPES[column.type]
+        getter = attrgetter(field)
+        values = (getter(r[index]) for r in rows)
+        if dtype == np.object_:
+            array = np.empty(n, dtype=np.object_)
+            array[:] = list(values)
+        elif np.issubdtype(dtype, np.datetime64):
+            array = np.fromiter(values, dtype=np.int64, count=n).view(dtype)
+        else:
+            array = np.fromiter(values, dtype=dtype, count=n)
+    elif column.type in VECTOR_COLUMN_TYPES and not has_nulls:
+        array = _decode_vector_column(rows, index, column, parse_literal)
+    else:
+        array = _decode_objects(rows, index, parse_literal)
+
+    return np.ma.masked_array(array, mask=mask) if has_nulls else array
+
+
+def _decode_objects(rows, index, parse_literal):
+    array = np.empty(len(rows), dtype=np.object_)
+    for i, r in enumerate(rows):
+        array[i] = parse_literal(r[index])
+    return array
+
+
+def _null_mask(rows, index, column):
+    if not column.nullable:
+        return None
+    return np.fromiter((r[index].WhichOneof('data') == 'nullData' for r in rows), dtype=np.bool_, count=len(rows))
+
+
+def _decode_vector_column(rows, index, column, parse_literal):
+    field, dtype, fixed_size = VECTOR_COLUMN_TYPES[column.type]
+    n = len(rows)
+    if n == 0:
+        return np.empty((0, column.length), dtype=dtype)
+    dimension = len(getattr(rows[0][index].vectorData, field).vector)
+
+    if fixed_size and dimension > 0:
+        array = _decode_packed_vectors(rows, index, field, dimension)
+        if array is not None:
+            return array if array.dtype == dtype else array.astype(dtype)
+
+    vectors = [getattr(r[index].vectorData, field).vector for r in rows]
+    if any(len(v) != dimension for v in vectors):
+        # Vectors of differing lengths cannot be represented as a 2-D array
+        return _decode_objects(rows, index, parse_literal)
+    if np.issubdtype(dtype, np.complexfloating):
+        parts = chain.from_iterable((c.real, c.imaginary) for v in vectors for c in v)
+        real_dtype = np.float32 if dtype == np.complex64 else np.float64
+        return np.fromiter(parts, dtype=real_dtype, count=2 * n * dimension).view(dtype).reshape(n, dimension)
+    return np.fromiter(chain.from_iterable(vectors), dtype=dtype, count=n * dimension).reshape(n, dimension)
+
+
+def _decode_packed_vectors(rows, index, field, dimension):
+    """
+    Decodes vectors with fixed size elements directly from the packed wire format of their literals.
+
+    All literals of a column of equal length vectors serialize to the same number of bytes, with the packed vector
+    elements at the end. The elements can therefore be read from the concatenated serialized literals without creating
+    a Python object per element. Returns None if the literals do not share the same layout.
+    """
+    wire_dtype = _WIRE_DTYPES[field]
+    serialized = [r[index].SerializeToString() for r in rows]
+    length = len(serialized[0])
+    header = length - dimension * wire_dtype.itemsize
+    if header <= 0 or any(len(s) != length for s in serialized):
+        return None
+    buffer = np.frombuffer(b''.join(serialized), dtype=np.uint8).reshape(len(rows), length)
+    array = np.ascontiguousarray(buffer[:, header:]).view(wire_dtype)
+    return array.view(np.bool_) if field == 'bool' else array
@@ -1,31 +1,322 @@
+import time
+from collections import namedtuple, deque
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List
+from uuid import UUID
 
 import grpc
+import numpy as np
 from google.protobuf.empty_pb2 import Empty
 
+from .arrow import pa, record_batch, require_pyarrow
+from .cache import QueryCache, CachingCall, CachedCall
+from .channel_options import channel_options, parse_compression
+from .channel_pool import ChannelPool, ROUND_ROBIN, BALANCING_POLICIES
+from .columnar import decode_columns, concatenate_columns
 from .cottontail_pb2 import SchemaName, CreateSchemaMessage, DropSchemaMessage, EntityName, ColumnDefinition, \
     CreateEntityMessage, InsertMessage, ColumnName, Scan, From, Type, ListSchemaMessage, ListEntityMessage, \
     EntityDetailsMessage, DropEntityMessage, TruncateEntityMessage, IndexName, IndexType, CreateIndexMessage, \
-    DropIndexMessage, RebuildIndexMessage, UpdateMessage, DeleteMessage, Literal, Vector, FloatVector, \
-    BatchInsertMessage, RequestMetadata, QueryMessage, Query, AnalyzeEntityMessage, Expression, FunctionName, Function, \
-    Projection, Order
+    DropIndexMessage, RebuildIndexMessage, UpdateMessage, DeleteMessage, BatchInsertMessage, RequestMetadata, \
+    QueryMessage, Query, AnalyzeEntityMessage, Expression, FunctionName, Function, Projection, Order
 from .cottontail_pb2_grpc import DDLStub, DMLStub, TXNStub, DQLStub
+from .encoding import encode_inserts, infer_type, parse_type_name, chunk_rows, encoded_size, vector_literal
+from .errors import ResponseStream, TypedErrorStub, typed_error
+from .explain import plan_tree, response_metadata
+from .query_builder import QueryTemplate
+from .query_hints import merge_hints
+from .pagination import Page, keyset_order, keyset_where, encode_token, decode_token
+from .scan import scan_ranges, merge_partitions
+from .sampling import sample_from, estimate_count, estimate_sum, estimate_mean
+from .retry import RetryPolicy, CircuitBreaker, EndpointGuard, GuardedStub
+
+# Default maximum size of messages received by gRPC servers
+DEFAULT_MAX_MESSAGE_SIZE = 4 * 1024 * 1024
+
+# Result of a batched nearest neighbour search
+NNSBatchResult = namedtuple('NNSBatchResult', ['ids', 'distances', 'errors'])
+
+
+class _CottontailDBClientBase:
+    """Message construction and response parsing shared by the blocking and the asyncio client."""
+
+    def _init_call_options(self, timeout, compression, wait_for_ready, channel_args):
+        """Validates and stores the default channel and call options."""
+        if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise ValueError(f'timeout must be a positive number of seconds, got {timeout!r}')
+        if wait_for_ready is not None and not isinstance(wait_for_ready, bool):
+            raise ValueError(f'wait_for_ready must be a boolean, got {wait_for_ready!r}')
+        self._timeout = timeout
+        self._compression = parse_compression(compression)
+        self._wait_for_ready = wait_for_ready
+        self._channel_options = channel_options(**channel_args)
+        self._max_send_message_size = channel_args.get('max_send_message_size')
+
+    def _call_kwargs(self, compression=None, wait_for_ready=None, timeout=None):
+        """Returns the keyword arguments of a stub call, overriding the client defaults with the given options."""
+        kwargs = {}
+        timeout = self._timeout if timeout is None else timeout
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        if compression is not None:
+            kwargs['compression'] = parse_compression(compression)
+        wait_for_ready = self._wait_for_ready if wait_for_ready is None else wait_for_ready
+        if wait_for_ready is not None:
+            kwargs['wait_for_ready'] = wait_for_ready
+        return kwargs
+
+    def _message_size_limit(self, max_message_size=None):
+        """Returns the maximum size of batch insert messages, defaulting to the send limit of the channel."""
+        if max_message_size is not None:
+            return max_message_size
+        if self._max_send_message_size is not None and self._max_send_message_size != -1:
+            return self._max_send_message_size
+        # Unlimited channels are still bound by the receive limit of the server
+        return DEFAULT_MAX_MESSAGE_SIZE
+
+    def _batch_insert_chunks(self, schema, entity, columns, values, max_message_size, max_rows):
+        """Yields batch insert messages for rows of Literal values, chunked by size and number of rows."""
+        message = self._batch_insert_message(schema, entity, columns)
+        inserts = [BatchInsertMessage.Insert(values=row) for row in values]
+        sizes = [encoded_size(insert.ByteSize()) for insert in inserts]
+        max_message_size = self._message_size_limit(max_message_size)
+        for start, end in chunk_rows(sizes, max_message_size - message.ByteSize(), max_rows):
+            chunk = BatchInsertMessage()
+            chunk.CopyFrom(message)
+            chunk.inserts.extend(inserts[start:end])
+            yield chunk
+
+    def _array_insert_chunks(self, schema, entity, columns, types, max_message_size, max_rows):
+        """Yields batch insert messages for columns of values, chunked by size and number of rows."""
+        message = self._batch_insert_message(schema, entity, list(columns))
+        inserts = encode_inserts(columns, types)
+        sizes = [len(insert) for insert in inserts]
+        max_message_size = self._message_size_limit(max_message_size)
+        for start, end in chunk_rows(sizes, max_message_size - message.ByteSize(), max_rows):
+            chunk = BatchInsertMessage()
+            chunk.CopyFrom(message)
+            chunk.MergeFromString(b''.join(inserts[start:end]))
+            yield chunk
+
+    @staticmethod
+    def _untyped_columns(columns, types):
+        """Returns the names of the inserted columns without a given type."""
+        return [name for name in columns if not types or name not in types]
+
+    @staticmethod
+    def _entity_column_types(details):
+        """Extracts the column types from entity details as dictionary of (column name, Type) key-value pairs."""
+        return {c['name'].split('.')[-1]: parse_type_name(c['type']) for c in details['columns']}
+
+    @staticmethod
+    def _complete_types(columns, types, entity_types=None):
+        """Completes the given column types with the entity's column types or types inferred from the values."""
+        types = dict(types) if types else {}
+        entity_types = entity_types or {}
+        for name, values in columns.items():
+            if name not in types:
+                # Type.BOOLEAN is 0, so declared types are checked against None
+                type_ = entity_types.get(name)
+                types[name] = type_ if type_ is not None else infer_type(np.asarray(values))
+        return types
+
+    def _batch_insert_message(self, schema, entity, columns):
+        """Creates a batch insert message without inserts for the given columns."""
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        kwargs = {
+            'from': From(scan=Scan(entity=entity_name)),
+            'columns': [ColumnName(name=column) for column in columns]
+        }
+        return BatchInsertMessage(metadata=RequestMetadata(transactionId=self._tid), **kwargs)
+
+    def _query_message(self, schema, entity, projection, where, order, limit, skip, from_, hints=None):
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        from_kwarg = {'from': from_ if from_ else From(scan=Scan(entity=entity_name))}
+        query = Query(**from_kwarg, projection=projection, where=where, order=order, limit=limit, skip=skip)
+        # Hints of the call replace the client defaults
+        metadata = merge_hints(RequestMetadata(transactionId=self._tid), self._hints, hints)
+        return QueryMessage(metadata=metadata, query=query)
+
+    def _template_message(self, template: QueryTemplate, params, hints=None):
+        """Binds the parameters of a query template into a query message of the current transaction."""
+        return template.bind(params, merge_hints(RequestMetadata(transactionId=self._tid), self._hints, hints))
+
+    @staticmethod
+    def _parse_query_response(response, compact=False):
+        names, decoders = _result_plan(tuple((c.name.name, c.type) for c in response.columns))
+        if compact:
+            make_row = _row_type(names)._make
+            return [make_row([decode(value) for decode, value in zip(decoders, item.data)]) for item in response.tuples]
+        return [
+            dict(zip(names, [decode(value) for decode, value in zip(decoders, item.data)]))
+            for item in response.tuples
+        ]
+
+    @staticmethod
+    def _parse_literal(literal):
+        data_type = literal.WhichOneof('data')
+        if data_type is None:
+            return None
+        return _LITERAL_DECODERS[data_type](literal)
+
+    def _insert_helper(self, schema, entity, values):
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        from_kwarg = {'from': From(scan=Scan(entity=entity_name))}
+        elements = [InsertMessage.InsertElement(column=ColumnName(name=column), value=value)
+                    for column, value in values.items()]
+        return InsertMessage(metadata=RequestMetadata(transactionId=self._tid), **from_kwarg, elements=elements)
+
+    @staticmethod
+    def _nns_projection(schema, entity, query_vector, distance, vector_col, id_col, half=False):
+        """Creates the projection and order of a nearest neighbour search query."""
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        nns_col = Expression(column=ColumnName(entity=entity_name, name=vector_col))
+
+        distance_col = ColumnName(name='distance')
+        id_expression = Expression(column=ColumnName(name=id_col))
+
+        vector_type = Type.HALF_VECTOR if half else Type.FLOAT_VECTOR
+        nns_expression = Expression(literal=vector_literal(query_vector, vector_type))
+        fn = FunctionName(name=distance)
+        fun = Function(name=fn, arguments=[nns_col, nns_expression])
+
+        expression = Expression(function=fun)
+
+        projection_element = Projection.ProjectionElement(alias=distance_col,
+                                                          expression=expression)
+        projection = Projection(op=Projection.ProjectionOperation.SELECT,
+                                elements=[projection_element, Projection.ProjectionElement(expression=id_expression)])
+
+        order_component = Order.Component(column=distance_col, direction=Order.Direction.ASCENDING)
+
+        order = Order(components=[order_component])
+
+        return projection, order
+
+    @staticmethod
+    def _sample_projection(schema, entity):
+        """Creates the projection selecting all columns of an entity."""
+        schema_name = SchemaName(name=schema)
+        entity_name = EntityName(schema=schema_name, name=entity)
+        op = Projection.ProjectionOperation.SELECT
+        column = ColumnName(entity=entity_name, name="*")
+        elements = [Projection.ProjectionElement(expression=Expression(column=column))]
+        projection = Projection(op=op, elements=elements)
+        return projection
+
+    @staticmethod
+    def _parse_entity_details(response):
+        entity_data = response.tuples[0]
+        data_names = [c.name.name for c in response.columns]
+        name_index = data_names.index('dbo')
+        class_index = data_names.index('class')
+        type_index = data_names.index('type')
+        rows_index = data_names.index('rows')
+        size_index = data_names.index('l_size')
+        nullable_index = data_names.index('nullable')
+        entity_details = {
+            'name': entity_data.data[name_index].stringData,
+            'rows': entity_data.data[rows_index].longData,
+            'columns': [
+                {
+                    'name': c.data[name_index].stringData,
+                    'type': c.data[type_index].stringData,
+                    'size': c.data[size_index].intData,
+                    'nullable': c.data[nullable_index].booleanData
+                } for c in response.tuples if c.data[class_index].stringData == 'COLUMN'
+            ],
+            'indexes': [
+                {
+                    'name': c.data[name_index].stringData,
+                    'type': c.data[type_index].stringData
+                } for c in response.tuples if c.data[class_index].stringData == 'INDEX'
+            ]
+        }
+
+        return entity_details
 
 
-class CottontailDBClient:
-    def __init__(self, host, port, with_transaction=False):
+class CottontailDBClient(_CottontailDBClientBase):
+    def __init__(self, host, port, with_transaction=False, channels=1, balancing=ROUND_ROBIN, timeout=None,
+                 compression=None, wait_for_ready=None, max_send_message_size=None, max_receive_message_size=None,
+                 keepalive_time_ms=None, keepalive_timeout_ms=None, keepalive_permit_without_calls=None,
+                 http2_window_size=None, http2_bdp_probe=None, retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None, hints: RequestMetadata = None, cache: QueryCache = None):
+        """
+        @param host: Cottontail DB host
+        @param port: Cottontail DB port
+        @param with_transaction: if a transaction should be started when entering the client
+        @param channels: number of channels to the endpoint, more than one opens a pool of channels that can be
+                         shared by many threads without being limited by the streams of a single connection
+        @param balancing: channel selection policy of the pool, 'round_robin' or 'least_in_flight'
+        @param timeout: default deadline of calls in seconds, None for no deadline. Every method accepts a timeout
+                        keyword argument overriding it. Streaming calls must complete within the deadline.
+        @param compression: default compression of calls, 'none', 'gzip' or 'deflate'
+        @param wait_for_ready: if calls wait for the channel to be ready instead of failing while it is not connected
+        @param max_send_message_size: maximum size of sent messages in bytes, -1 for unlimited
+        @param max_receive_message_size: maximum size of received messages in bytes, -1 for unlimited
+        @param keepalive_time_ms: interval of keepalive pings in milliseconds
+        @param keepalive_timeout_ms: time to wait for a keepalive ping acknowledgement before closing the connection
+        @param keepalive_permit_without_calls: if keepalive pings are sent while there are no calls in flight
+        @param http2_window_size: initial HTTP/2 stream flow control window in bytes
+        @param http2_bdp_probe: if the HTTP/2 flow control window is adjusted by bandwidth-delay product probing
+        @param retry_policy: retry policy of idempotent calls (queries, listings, entity details and ping), no
+                             retries if None. Every attempt gets the full timeout.
+        @param circuit_breaker: circuit breaker failing calls fast with CircuitOpenError while the endpoint is down
+        @param hints: default query planner hints of queries as created by query_hints. Hints given to a query replace
+                      the defaults of the same kind and always the no_optimise default.
+        @param cache: cache of query and schema listing results, no caching if None. Results of an entity are
+                      invalidated when this client modifies the entity, changes by other clients are only seen once
+                      the results expire.
+        """
+        if channels < 1:
+            raise ValueError('number of channels must be at least 1')
+        if balancing not in BALANCING_POLICIES:
+            raise ValueError(f'unknown balancing policy {balancing!r}, expected one of {BALANCING_POLICIES}')
         self._host = host
         self._port = port
+        self._target = f'{host}:{port}'
         self._transaction = with_transaction
         self._tid = None
+        self._channels = channels
+        self._balancing = balancing
+        self._pool = None
+        self._channel = None
+        self._guard = None
+        self._hints = merge_hints(RequestMetadata(), hints)
+        self._cache = cache
+        self._written = set()
+        if retry_policy is not None or circuit_breaker is not None:
+            self._guard = EndpointGuard(f'{host}:{port}', retry_policy, circuit_breaker)
+        self._init_call_options(timeout, compression, wait_for_ready, {
+            'max_send_message_size': max_send_message_size,
+            'max_receive_message_size': max_receive_message_size,
+            'keepalive_time_ms': keepalive_time_ms,
+            'keepalive_timeout_ms': keepalive_timeout_ms,
+            'keepalive_permit_without_calls': keepalive_permit_without_calls,
+            'http2_window_size': http2_window_size,
+            'http2_bdp_probe': http2_bdp_probe,
+        })
 
     def __enter__(self):
-        self._channel = grpc.insecure_channel(f'{self._host}:{self._port}')
-        self._ddl = DDLStub(self._channel)
-        self._dml = DMLStub(self._channel)
-        self._txn = TXNStub(self._channel)
-        self._dql = DQLStub(self._channel)
+        target = self._target
+        if self._channels > 1:
+            self._pool = ChannelPool(target, self._channels, self._balancing, self._channel_options,
+                                     self._compression)
+            ddl, dml, txn, dql = (self._pool.stub(stub) for stub in (DDLStub, DMLStub, TXNStub, DQLStub))
+        else:
+            self._channel = grpc.insecure_channel(target, self._channel_options, self._compression)
+            ddl, dml, txn, dql = (stub(self._channel) for stub in (DDLStub, DMLStub, TXNStub, DQLStub))
+        if self._guard is not None:
+            ddl, dml, txn, dql = (GuardedStub(stub, self._guard) for stub in (ddl, dml, txn, dql))
+        self._ddl = TypedErrorStub(ddl)
+        self._dml = TypedErrorStub(dml)
+        self._txn = TypedErrorStub(txn)
+        self._dql = TypedErrorStub(dql)
         if self._transaction:
             self.start_transaction()
         return self
@@ -36,79 +327,91 @@ class CottontailDBClient:
     def close(self):
         if self._transaction:
             self.commit_transaction()
-        self._channel.close()
+        if self._pool is not None:
+            self._pool.close()
+        elif self._channel is not None:
+            self._channel.close()
 
     # Transactions
 
-    def start_transaction(self):
+    def start_transaction(self, timeout=None):
         """Starts a transaction that all further changes will be associated with."""
         if self._transaction:
             raise Exception('Transaction already running!')
         self._transaction = True
-        metadata = self._txn.Begin(Empty())
+        metadata = self._txn.Begin(Empty(), **self._call_kwargs(timeout=timeout))
         self._tid = metadata.transactionId
 
-    def commit_transaction(self):
+    def commit_transaction(self, timeout=None):
         """Commits the current transaction."""
         if not self._transaction:
             raise Exception('No transaction running!')
-        self._txn.Commit(RequestMetadata(transactionId=self._tid))
+        self._txn.Commit(RequestMetadata(transactionId=self._tid), **self._call_kwargs(timeout=timeout))
         self._tid = None
         self._transaction = False
+        self._invalidate_written()
 
-    def abort_transaction(self):
+    def abort_transaction(self, timeout=None):
         """Aborts the current transaction and rolls back work. Blocks if a query is ongoing."""
         if not self._transaction:
             raise Exception('No transaction running!')
-        self._txn.Rollback(RequestMetadata(transactionId=self._tid))
+        self._txn.Rollback(RequestMetadata(transactionId=self._tid), **self._call_kwargs(timeout=timeout))
         self._tid = None
         self._transaction = False
+        self._invalidate_written()
 
-    def kill_transaction(self):
+    def kill_transaction(self, timeout=None):
         """Kills the current transaction and rolls back work."""
         if not self._transaction:
             raise Exception('No transaction running!')
-        self._txn.Kill(RequestMetadata(transactionId=self._tid))
+        self._txn.Kill(RequestMetadata(transactionId=self._tid), **self._call_kwargs(timeout=timeout))
         self._tid = None
         self._transaction = False
+        self._invalidate_written()
 
-    def list_transactions(self):
+    def list_transactions(self, timeout=None):
         """Lists all active transactions."""
-        responses = [response for response in self._txn.ListTransactions(Empty())]
         # TODO: Parse into Python data structure
-        return [r for response in responses for r in self._parse_query_response(response)]
+        return list(self._iter_responses(self._txn.ListTransactions(Empty(), **self._call_kwargs(timeout=timeout))))
 
-    def list_locks(self):
+    def list_locks(self, timeout=None):
         """Lists all active locks on database objects."""
-        responses = [response for response in self._txn.ListLocks(Empty())]
         # TODO: Parse into Python data structure
-        return [r for response in responses for r in self._parse_query_response(response)]
+        return list(self._iter_responses(self._txn.ListLocks(Empty(), **self._call_kwargs(timeout=timeout))))
 
     # Data definition
 
-    def create_schema(self, schema, exist_ok=False):
+    def create_schema(self, schema, exist_ok=False, timeout=None):
         """
         Creates a new schema with the given name.
 
         @param schema: name of the entity's schema
         @param exist_ok: if the client should first check if the schema already exists
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         @return: query response if there was a schema create attempt or None if exist_ok and schema already exists
         """
-        if exist_ok and schema in [s.split('.')[-1] for s in self.list_schemas()]:
+        if exist_ok and schema in [s.split('.')[-1] for s in self.list_schemas(timeout)]:
             return
         schema_name = SchemaName(name=schema)
-        response = self._ddl.CreateSchema(
-            CreateSchemaMessage(metadata=RequestMetadata(transactionId=self._tid), schema=schema_name))
+        message = CreateSchemaMessage(metadata=RequestMetadata(transactionId=self._tid), schema=schema_name)
+        try:
+            response = self._ddl.CreateSchema(message, **self._call_kwargs(timeout=timeout))
+        finally:
+            self._invalidate(None)
         return self._parse_query_response(response)
 
-    def drop_schema(self, schema):
+    def drop_schema(self, schema, timeout=None):
         """Drops the schema with the given name."""
         schema_name = SchemaName(name=schema)
-        response = self._ddl.DropSchema(
-            DropSchemaMessage(metadata=RequestMetadata(transactionId=self._tid), schema=schema_name))
+        message = DropSchemaMessage(metadata=RequestMetadata(transactionId=self._tid), schema=schema_name)
+        try:
+            response = self._ddl.DropSchema(message, **self._call_kwargs(timeout=timeout))
+        finally:
+            self._invalidate(None)
+            self._invalidate(schema=schema)
         return self._parse_query_response(response)
 
-    def create_entity(self, schema, entity, columns, exist_ok=False):
+    def create_entity(self, schema, entity, columns, exist_ok=False, timeout=None):
         """
         Creates an entity in the given schema with the defined columns.
 
@@ -119,47 +422,54 @@ class CottontailDBClient:
         @param entity: entity name
         @param columns: list of ColumnDefinition objects defining the entity's columns
         @param exist_ok: if the client should first check if the entity already exists
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         @return: query response if there was an entity create attempt or None if exist_ok and entity already exists
         """
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
-        response = self._ddl.CreateEntity(
-            CreateEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name, columns=columns,
-                                mayExist=exist_ok))
+        message = CreateEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name,
+                                      columns=columns, mayExist=exist_ok)
+        response = self._ddl.CreateEntity(message, **self._call_kwargs(timeout=timeout))
         return self._parse_query_response(response)
 
-    def drop_entity(self, schema, entity, not_exist_ok=True):
+    def drop_entity(self, schema, entity, not_exist_ok=True, timeout=None):
         """Drops the given entity from the given schema."""
-        if not_exist_ok and entity not in [s.split('.')[-1] for s in self.list_entities(schema)]:
+        if not_exist_ok and entity not in [s.split('.')[-1] for s in self.list_entities(schema, timeout)]:
             return
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
-        response = self._ddl.DropEntity(
-            DropEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name))
+        message = DropEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name)
+        try:
+            response = self._ddl.DropEntity(message, **self._call_kwargs(timeout=timeout))
+        finally:
+            self._invalidate(f'{schema}.{entity}')
         return self._parse_query_response(response)
 
-    def truncate_entity(self, schema, entity, not_exist_ok=True):
+    def truncate_entity(self, schema, entity, not_exist_ok=True, timeout=None):
         """Truncates the specified entity."""
-        if not_exist_ok and entity not in [s.split('.')[-1] for s in self.list_entities(schema)]:
+        if not_exist_ok and entity not in [s.split('.')[-1] for s in self.list_entities(schema, timeout)]:
             return
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
-        response = self._ddl.TruncateEntity(
-            TruncateEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name))
+        message = TruncateEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name)
+        try:
+            response = self._ddl.TruncateEntity(message, **self._call_kwargs(timeout=timeout))
+        finally:
+            self._invalidate(f'{schema}.{entity}')
         return self._parse_query_response(response)
 
-    def analyze_entity(self, schema, entity, async_=False):
+    def analyze_entity(self, schema, entity, async_=False, timeout=None):
         """Optimizes the specified entity."""
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
         kwargs = {
             'async': async_
         }
-        response = self._ddl.AnalyzeEntity(
-            AnalyzeEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name, **kwargs))
+        message = AnalyzeEntityMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name, **kwargs)
+        response = self._ddl.AnalyzeEntity(message, **self._call_kwargs(timeout=timeout))
         return self._parse_query_response(response)
 
-    def create_index(self, schema, entity, index, index_type: IndexType, columns: List[str], params=None):
+    def create_index(self, schema, entity, index, index_type: IndexType, columns: List[str], params=None, timeout=None):
         """
         Creates an index on a column.
 
@@ -169,107 +479,95 @@ class CottontailDBClient:
         @param index_type: type of index
         @param columns: columns to build index for
         @param params: additional parameters for the index
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         """
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
-        response = self._ddl.CreateIndex(
-            CreateIndexMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name, type=index_type,
-                               indexName=index, columns=columns, params=params))
+        message = CreateIndexMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name,
+                                     type=index_type, indexName=index, columns=columns, params=params)
+        response = self._ddl.CreateIndex(message, **self._call_kwargs(timeout=timeout))
         return self._parse_query_response(response)
 
-    def drop_index(self, schema, entity, index):
+    def drop_index(self, schema, entity, index, timeout=None):
         """
         Drops the specified index.
 
         @param schema: name of the index's schema
         @param entity: name of the index's entity
         @param index: index name
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         """
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
         index_name = IndexName(entity=entity_name, name=index)
-        response = self._ddl.DropIndex(
-            DropIndexMessage(metadata=RequestMetadata(transactionId=self._tid), index=index_name))
+        message = DropIndexMessage(metadata=RequestMetadata(transactionId=self._tid), index=index_name)
+        response = self._ddl.DropIndex(message, **self._call_kwargs(timeout=timeout))
         return self._parse_query_response(response)
 
-    def rebuild_index(self, schema, entity, index):
+    def rebuild_index(self, schema, entity, index, timeout=None):
         """
         Rebuilds the specified index.
 
         @param schema: name of the index's schema
         @param entity: name of the index's entity
         @param index: index name
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         """
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
         index_name = IndexName(entity=entity_name, name=index)
-        response = self._ddl.RebuildIndex(
-            RebuildIndexMessage(metadata=RequestMetadata(transactionId=self._tid), index=index_name))
+        message = RebuildIndexMessage(metadata=RequestMetadata(transactionId=self._tid), index=index_name)
+        response = self._ddl.RebuildIndex(message, **self._call_kwargs(timeout=timeout))
         return self._parse_query_response(response)
 
-    def list_schemas(self):
+    def list_schemas(self, timeout=None):
         """Lists all schemas in the database."""
-        responses = [response for response in
-                     self._ddl.ListSchemas(ListSchemaMessage(metadata=RequestMetadata(transactionId=self._tid)))]
-        tuples = [t.data[0].stringData for response in responses for t in response.tuples]
-        return tuples
-
-    def list_entities(self, schema):
+        key = (self._target, 'ListSchemas', self._tid)
+        if self._cache is not None:
+            schemas = self._cache.get(key)
+            if schemas is not None:
+                return list(schemas)
+            generation = self._cache.generation(None)
+        message = ListSchemaMessage(metadata=RequestMetadata(transactionId=self._tid))
+        responses = self._ddl.ListSchemas(message, **self._call_kwargs(timeout=timeout))
+        schemas = list(ResponseStream(responses, lambda response: [t.data[0].stringData for t in response.tuples]))
+        if self._cache is not None:
+            self._cache.put(key, None, tuple(schemas), sum(len(schema) for schema in schemas), generation)
+        return schemas
+
+    def list_entities(self, schema, timeout=None):
         """
         Lists all entities of the specified schema
 
         @param schema: schema of which to list entities
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         @return: list of entity names
         """
         schema_name = SchemaName(name=schema)
-        responses = [response for response in
-                     self._ddl.ListEntities(
-                         ListEntityMessage(metadata=RequestMetadata(transactionId=self._tid), schema=schema_name))]
-        tuples = [t.data[0].stringData for response in responses for t in response.tuples]
-        return tuples
+        message = ListEntityMessage(metadata=RequestMetadata(transactionId=self._tid), schema=schema_name)
+        responses = self._ddl.ListEntities(message, **self._call_kwargs(timeout=timeout))
+        return list(ResponseStream(responses, lambda response: [t.data[0].stringData for t in response.tuples]))
 
-    def get_entity_details(self, schema, entity):
+    def get_entity_details(self, schema, entity, timeout=None):
         """
         Retrieves details about an entity.
 
         @param schema: the entity's schema
         @param entity: entity name
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         @return: dictionary containing entity details
         """
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
-        response = self._ddl.EntityDetails(
-            EntityDetailsMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name))
-        entity_data = response.tuples[0]
-        data_names = [c.name.name for c in response.columns]
-        name_index = data_names.index('dbo')
-        class_index = data_names.index('class')
-        type_index = data_names.index('type')
-        rows_index = data_names.index('rows')
-        size_index = data_names.index('l_size')
-        nullable_index = data_names.index('nullable')
-        entity_details = {
-            'name': entity_data.data[name_index].stringData,
-            'rows': entity_data.data[rows_index].longData,
-            'columns': [
-                {
-                    'name': c.data[name_index].stringData,
-                    'type': c.data[type_index].stringData,
-                    'size': c.data[size_index].intData,
-                    'nullable': c.data[nullable_index].booleanData
-                } for c in response.tuples if c.data[class_index].stringData == 'COLUMN'
-            ],
-            'indexes': [
-                {
-                    'name': c.data[name_index].stringData,
-                    'type': c.data[type_index].stringData
-                } for c in response.tuples if c.data[class_index].stringData == 'INDEX'
-            ]
-        }
+        message = EntityDetailsMessage(metadata=RequestMetadata(transactionId=self._tid), entity=entity_name)
+        response = self._ddl.EntityDetails(message, **self._call_kwargs(timeout=timeout))
+        return self._parse_entity_details(response)
 
-        return entity_details
+    def _column_types(self, schema, entity, timeout=None):
+        """Retrieves the column types of an entity as dictionary of (column name, Type) key-value pairs."""
+        return self._entity_column_types(self.get_entity_details(schema, entity, timeout))
 
-    def sample_entity(self, schema, entity, limit=10, skip=0):
+    def sample_entity(self, schema, entity, limit=10, skip=0, hints=None, timeout=None):
         """
         Retrieves a preview of the specified entity.
 
@@ -277,56 +575,131 @@ class CottontailDBClient:
         @param entity: entity name
         @param limit: number of rows to return
         @param skip: number of rows to skip from the beginning
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         @return: query response message
         """
-        schema_name = SchemaName(name=schema)
-        entity_name = EntityName(schema=schema_name, name=entity)
-        op = Projection.ProjectionOperation.SELECT
-        column = ColumnName(entity=entity_name, name="*")
-        elements = [Projection.ProjectionElement(expression=Expression(column=column))]
-        projection = Projection(op=op, elements=elements)
-        return self.query(schema, entity, projection, None, limit=limit, skip=skip)
+        projection = self._sample_projection(schema, entity)
+        return self.query(schema, entity, projection, None, limit=limit, skip=skip, hints=hints, timeout=timeout)
 
     # Data management
 
-    def insert(self, schema, entity, values):
+    def insert(self, schema, entity, values, timeout=None):
         """
         Inserts column values into an entity.
 
         @param schema: name of the entity's schema
         @param entity: entity name
         @param values: dictionary of (column name, Literal value) key-value pairs
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         @return: query response message
         """
         message = self._insert_helper(schema, entity, values)
-        return self._dml.Insert(message)
+        try:
+            return self._dml.Insert(message, **self._call_kwargs(timeout=timeout))
+        finally:
+            self._invalidate(f'{schema}.{entity}')
 
-    def insert_batch(self, schema, entity, columns, values):
+    def insert_batch(self, schema, entity, columns, values, max_message_size=None, max_rows=None,
+                     max_in_flight=1, compression=None, wait_for_ready=None, timeout=None):
         """
         Inserts column values into an entity in a batch.
 
+        The batch is split into chunks whose messages do not exceed max_message_size bytes and max_rows rows. Chunks
+        are sent in order within the current transaction, with up to max_in_flight chunks in flight at a time.
+
         @param schema: name of the entity's schema
         @param entity: entity name
         @param columns: The names of the columns to insert values for (same length as values sub-lists)
         @param values: list of Literal value lists, where each sub-list contains for a value for each column
-        @return: query response message
+        @param max_message_size: maximum serialized size of a batch insert message in bytes, defaults to the maximum
+                                 send message size of the client
+        @param max_rows: maximum number of rows per batch insert message, unbounded if None
+        @param max_in_flight: maximum number of batch insert messages sent concurrently
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: list of chunk reports, dictionaries containing the number of 'rows', the message size in 'bytes' and
+                 the duration in 'seconds' of each chunk
         """
-        schema_name = SchemaName(name=schema)
-        entity_name = EntityName(schema=schema_name, name=entity)
-        column_names = [ColumnName(name=column) for column in columns]
-        inserts = [BatchInsertMessage.Insert(values=row) for row in values]
-
-        kwargs = {
-            'from': From(scan=Scan(entity=entity_name)),
-            'columns': column_names,
-            'inserts': inserts
-        }
+        messages = self._batch_insert_chunks(schema, entity, columns, values, max_message_size, max_rows)
+        try:
+            return self._send_batches(messages, max_in_flight, self._call_kwargs(compression, wait_for_ready, timeout))
+        finally:
+            self._invalidate(f'{schema}.{entity}')
+
+    def insert_arrays(self, schema, entity, columns, types=None, max_message_size=None,
+                      max_rows=None, max_in_flight=1, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Inserts columns of values into an entity in a batch without constructing a Literal per value.
 
-        message = BatchInsertMessage(metadata=RequestMetadata(transactionId=self._tid), **kwargs)
+        Values are encoded in bulk according to the column types of the entity, vector columns are given as 2-D arrays
+        with one vector per row. Null values are given by masked array elements or None in lists, e.g.:
+        columns = {'id': ['a', 'b'], 'feature': np.array([[0.1, 0.2], [0.3, 0.4]], dtype=np.float32)}
 
-        self._dml.InsertBatch(message)
+        The batch is split into chunks like in insert_batch.
 
-    def update(self, schema, entity, where, updates):
+        @param schema: name of the entity's schema
+        @param entity: entity name
+        @param columns: dictionary of (column name, array or list of values) key-value pairs of equal length
+        @param types: dictionary of (column name, Type) key-value pairs, types of other columns are retrieved from
+                      the entity details or inferred from the array dtype
+        @param max_message_size: maximum serialized size of a batch insert message in bytes, defaults to the maximum
+                                 send message size of the client
+        @param max_rows: maximum number of rows per batch insert message, unbounded if None
+        @param max_in_flight: maximum number of batch insert messages sent concurrently
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: list of chunk reports as returned by insert_batch
+        """
+        types = self._insert_types(schema, entity, columns, types, timeout)
+        messages = self._array_insert_chunks(schema, entity, columns, types, max_message_size, max_rows)
+        try:
+            return self._send_batches(messages, max_in_flight, self._call_kwargs(compression, wait_for_ready, timeout))
+        finally:
+            self._invalidate(f'{schema}.{entity}')
+
+    def _insert_types(self, schema, entity, columns, types, timeout=None):
+        """Completes the given column types with the entity's column types or types inferred from the values."""
+        entity_types = self._column_types(schema, entity, timeout) if self._untyped_columns(columns, types) else None
+        return self._complete_types(columns, types, entity_types)
+
+    def _send_batches(self, messages, max_in_flight, call_kwargs):
+        """Sends batch insert messages in order with up to max_in_flight pending calls and reports on each."""
+        reports = []
+        pending = deque()
+
+        def complete():
+            future, report, start = pending.popleft()
+            try:
+                future.result()
+            except grpc.RpcError as error:
+                raise typed_error(error) from error
+            report['seconds'] = time.perf_counter() - start
+            reports.append(report)
+
+        try:
+            for message in messages:
+                report = {'rows': len(message.inserts), 'bytes': message.ByteSize()}
+                start = time.perf_counter()
+                if max_in_flight <= 1:
+                    self._dml.InsertBatch(message, **call_kwargs)
+                    report['seconds'] = time.perf_counter() - start
+                    reports.append(report)
+                    continue
+                pending.append((self._dml.InsertBatch.future(message, **call_kwargs), report, start))
+                if len(pending) >= max_in_flight:
+                    complete()
+            while pending:
+                complete()
+        except Exception:
+            for future, _, _ in pending:
+                future.cancel()
+            raise
+        return reports
+
+    def update(self, schema, entity, where, updates, timeout=None):
         """
         Updates the rows in schema.entity selected through the where clause with the values from updates.
 
@@ -334,6 +707,7 @@ class CottontailDBClient:
         @param entity: the entity containing rows to update
         @param where: where clause selecting rows to update
         @param updates: dictionary of (column name, Literal value expression) key-value pairs to update selected rows
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         """
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
@@ -341,32 +715,71 @@ class CottontailDBClient:
         updates_list = [UpdateMessage.UpdateElement(column=ColumnName(name=column), value=value)
                         for column, value in updates.items()]
         # TODO: Simplify where specification
-        return self._dml.Update(
-            UpdateMessage(metadata=RequestMetadata(transactionId=self._tid), **from_kwarg, where=where,
-                          updates=updates_list))
-
-    def delete(self, schema, entity, where):
+        message = UpdateMessage(metadata=RequestMetadata(transactionId=self._tid), **from_kwarg, where=where,
+                                updates=updates_list)
+        try:
+            return self._dml.Update(message, **self._call_kwargs(timeout=timeout))
+        finally:
+            self._invalidate(f'{schema}.{entity}')
+
+    def delete(self, schema, entity, where, timeout=None):
         """
         Deletes the rows in schema.entity selected through the where clause.
 
         @param schema: the schema containing the entity to delete
         @param entity: the entity containing rows to delete
         @param where: where clause selecting rows to delete
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         """
         schema_name = SchemaName(name=schema)
         entity_name = EntityName(schema=schema_name, name=entity)
         from_kwarg = {'from': From(scan=Scan(entity=entity_name))}
         # TODO: Simplify where specification
-        return self._dml.Delete(
-            DeleteMessage(metadata=RequestMetadata(transactionId=self._tid), **from_kwarg, where=where))
+        message = DeleteMessage(metadata=RequestMetadata(transactionId=self._tid), **from_kwarg, where=where)
+        try:
+            return self._dml.Delete(message, **self._call_kwargs(timeout=timeout))
+        finally:
+            self._invalidate(f'{schema}.{entity}')
 
     # Data query
 
-    def ping(self):
+    def ping(self, timeout=None):
         """Sends a ping message to the endpoint. If method returns without exception endpoint is connected."""
-        self._dql.Ping(Empty())
+        self._dql.Ping(Empty(), **self._call_kwargs(timeout=timeout))
+
+    def health_check(self, timeout=1.0):
+        """
+        Pings the endpoint through every channel. Pooled channels that fail are skipped until the next health check.
 
-    def nns(self, schema, entity, query_vector, distance='manhattan', limit=None, vector_col='feature', id_col='id'):
+        @param timeout: timeout of each ping in seconds
+        @return: list of booleans indicating which channels are healthy
+        """
+        if self._pool is not None:
+            return self._pool.health_check(timeout)
+        try:
+            self._dql.Ping(Empty(), timeout=timeout)
+            return [True]
+        except grpc.RpcError:
+            return [False]
+
+    def metrics(self):
+        """
+        Returns the retry and circuit breaker metrics of the endpoint, see EndpointGuard.metrics.
+
+        @return: dictionary of metrics or None if neither a retry policy nor a circuit breaker is configured
+        """
+        return self._guard.metrics() if self._guard is not None else None
+
+    def cache_stats(self):
+        """
+        Returns the hit and miss statistics of the result cache, see QueryCache.stats.
+
+        @return: dictionary of statistics or None if no cache is configured
+        """
+        return self._cache.stats() if self._cache is not None else None
+
+    def nns(self, schema, entity, query_vector, distance='manhattan', limit=None, vector_col='feature', id_col='id',
+            half=False, hints=None, with_metadata=False, timeout=None):
         """
         Queries the specified entity with the given vector.
 
@@ -377,34 +790,160 @@ class CottontailDBClient:
         @param limit: maximum number of rows to return
         @param vector_col: column name where the vector is stored
         @param id_col: column name where the id is stored
+        @param half: if the query vector is sent as half precision vector, for queries of HALF_VECTOR columns
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param with_metadata: if True, returns the response metadata along with the rows, see response_metadata
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
         """
-        schema_name = SchemaName(name=schema)
-        entity_name = EntityName(schema=schema_name, name=entity)
-        nns_col = Expression(column=ColumnName(entity=entity_name, name=vector_col))
+        projection, order = self._nns_projection(schema, entity, query_vector, distance, vector_col, id_col, half)
+        return self.query(schema, entity, projection, None, limit=limit, order=order, hints=hints,
+                          with_metadata=with_metadata, timeout=timeout)
 
-        distance_col = ColumnName(name='distance')
-        id_expression = Expression(column=ColumnName(name=id_col))
+    def nns_batch(self, schema, entity, query_vectors, k, distance='manhattan', vector_col='feature', id_col='id',
+                  max_in_flight=16, half=False, hints=None, timeout=None):
+        """
+        Queries the k nearest neighbours of each of the given vectors with up to max_in_flight concurrent queries.
 
-        nns_expression = Expression(literal=float_vector(*query_vector))
-        fn = FunctionName(name=distance)
-        fun = Function(name=fn, arguments=[nns_col, nns_expression])
+        Failed queries do not affect the others, their errors are returned per row and their rows remain padded.
 
-        expression = Expression(function=fun)
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param query_vectors: 2-D array with one query vector per row
+        @param k: number of nearest neighbours per query vector
+        @param distance: the distance to be used
+        @param vector_col: column name where the vector is stored
+        @param id_col: column name where the id is stored
+        @param max_in_flight: maximum number of concurrent queries
+        @param half: if the query vectors are sent as half precision vectors, for queries of HALF_VECTOR columns
+        @param hints: query planner hints of the queries as created by query_hints, replacing the client defaults
+        @param timeout: deadline of each query in seconds, defaults to the client timeout
+        @return: NNSBatchResult of 2-D arrays ids and distances of shape (len(query_vectors), k) ordered by distance,
+                 padded with None and nan where a query returned fewer than k rows, and a dictionary errors of
+                 (row index, error) key-value pairs of failed queries. ids is an object array regardless of padding.
+        """
+        query_vectors = np.asarray(query_vectors)
+        if query_vectors.ndim != 2:
+            raise ValueError(f'expected a 2-D array of query vectors, got shape {query_vectors.shape}')
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be at least 1')
+        ids = np.full((len(query_vectors), k), None, dtype=object)
+        distances = np.full((len(query_vectors), k), np.nan)
+        errors = {}
+        pending = deque()
+
+        def complete():
+            row, responses = pending.popleft()
+            try:
+                columns = concatenate_columns(list(ResponseStream(
+                    responses, lambda response: [decode_columns(response, self._parse_literal)])))
+            except grpc.RpcError as error:
+                errors[row] = error
+                return
+            if columns:
+                count = min(k, len(columns['distance']))
+                ids[row, :count] = columns[id_col][:count]
+                distances[row, :count] = columns['distance'][:count]
+
+        for row, vector in enumerate(query_vectors):
+            projection, order = self._nns_projection(schema, entity, vector, distance, vector_col, id_col, half)
+            message = self._query_message(schema, entity, projection, None, order, k, None, None, hints)
+            try:
+                pending.append((row, self._query_call(message, self._call_kwargs(timeout=timeout))))
+            except grpc.RpcError as error:
+                errors[row] = error
+                continue
+            if len(pending) >= max_in_flight:
+                complete()
+        while pending:
+            complete()
+        return NNSBatchResult(ids, distances, errors)
+
+    def query(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None, compact=False,
+              hints=None, with_metadata=False, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Queries the specified entity where the provided conditions are met and applies the given projection.
 
-        projection_element = Projection.ProjectionElement(alias=distance_col,
-                                                          expression=expression)
-        projection = Projection(op=Projection.ProjectionOperation.SELECT,
-                                elements=[projection_element, Projection.ProjectionElement(expression=id_expression)])
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param projection: the projection to be applied to the result
+        @param where: where clause specifying the rows to return
+        @param order: order by clause specifying the order of the result
+        @param limit: maximum number of rows to return
+        @param skip: number of rows to skip
+        @param from_: from clause, defaults to scan of the entity
+        @param compact: if True, returns rows as named tuples of a row type generated per result schema instead of
+                        dictionaries
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param with_metadata: if True, returns the response metadata along with the rows, see response_metadata
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: list of result rows, or tuple of the rows and the metadata dictionary if with_metadata is True
+        """
+        stream = self.iter_query(schema, entity, projection, where, order, limit, skip, from_, compact=compact,
+                                 hints=hints, compression=compression, wait_for_ready=wait_for_ready, timeout=timeout)
+        rows = list(stream)
+        return (rows, response_metadata(stream.metadata)) if with_metadata else rows
 
-        order_component = Order.Component(column=distance_col, direction=Order.Direction.ASCENDING)
+    def iter_query(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None,
+                   batches=False, compact=False, hints=None, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Queries the specified entity like query, but yields the result as each response message arrives.
 
-        order = Order(components=[order_component])
+        The query is sent immediately. The returned stream can be cancelled from any thread with its cancel method,
+        closing it before it is exhausted cancels the underlying gRPC call. Once consumed, the metadata of the
+        response is available as metadata of the stream.
 
-        return self.query(schema, entity, projection, None, limit=limit, order=order)
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param projection: the projection to be applied to the result
+        @param where: where clause specifying the rows to return
+        @param order: order by clause specifying the order of the result
+        @param limit: maximum number of rows to return
+        @param skip: number of rows to skip
+        @param from_: from clause, defaults to scan of the entity
+        @param batches: if True, yields one list of rows per response message instead of single rows
+        @param compact: if True, yields rows as named tuples of a row type generated per result schema instead of
+                        dictionaries
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: ResponseStream of result rows
+        """
+        message = self._query_message(schema, entity, projection, where, order, limit, skip, from_, hints)
+        responses = self._query_call(message, self._call_kwargs(compression, wait_for_ready, timeout))
+        return self._iter_responses(responses, batches, compact)
 
-    def query(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None):
+    def execute(self, template: QueryTemplate, params=None, compact=False, hints=None, with_metadata=False,
+                compression=None, wait_for_ready=None, timeout=None):
         """
-        Queries the specified entity where the provided conditions are met and applies the given projection.
+        Executes a compiled query template with the given parameter values, see QueryBuilder.
+
+        @param template: query template
+        @param params: dictionary of (parameter name, value) key-value pairs
+        @param compact: if True, returns rows as named tuples instead of dictionaries
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param with_metadata: if True, returns the response metadata along with the rows, see response_metadata
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: list of result rows, or tuple of the rows and the metadata dictionary if with_metadata is True
+        """
+        message = self._template_message(template, params, hints)
+        responses = self._query_call(message, self._call_kwargs(compression, wait_for_ready, timeout))
+        stream = self._iter_responses(responses, compact=compact)
+        rows = list(stream)
+        return (rows, response_metadata(stream.metadata)) if with_metadata else rows
+
+    def query_columnar(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None,
+                       hints=None, with_metadata=False, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Queries the specified entity like query, but decodes the result column by column into NumPy arrays.
+
+        Columns of numeric, boolean and date types are returned as arrays of the corresponding dtype, string columns
+        as object arrays. Vector columns are returned as 2-D arrays with one row per result tuple. Columns of nullable
+        types containing null values are returned as masked arrays.
 
         @param schema: the schema containing the queried entity
         @param entity: the entity being queried
@@ -414,67 +953,417 @@ class CottontailDBClient:
         @param limit: maximum number of rows to return
         @param skip: number of rows to skip
         @param from_: from clause, defaults to scan of the entity
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param with_metadata: if True, returns the response metadata along with the columns, see response_metadata
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: dictionary of (column name, array) key-value pairs, or tuple of the columns and the metadata
+                 dictionary if with_metadata is True
         """
-        schema_name = SchemaName(name=schema)
-        entity_name = EntityName(schema=schema_name, name=entity)
-        from_kwarg = {'from': from_ if from_ else From(scan=Scan(entity=entity_name))}
-        query = Query(**from_kwarg, projection=projection, where=where, order=order, limit=limit, skip=skip)
-        responses = self._dql.Query(QueryMessage(metadata=RequestMetadata(transactionId=self._tid), query=query))
-        return [r for response in responses for r in self._parse_query_response(response)]
+        message = self._query_message(schema, entity, projection, where, order, limit, skip, from_, hints)
+        responses = self._query_call(message, self._call_kwargs(compression, wait_for_ready, timeout))
+        stream = ResponseStream(responses, lambda response: [decode_columns(response, self._parse_literal)])
+        columns = concatenate_columns(list(stream))
+        return (columns, response_metadata(stream.metadata)) if with_metadata else columns
+
+    def query_arrow(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None,
+                    hints=None, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Queries the specified entity like query, but yields the result as Arrow record batches. Requires pyarrow.
 
-    @staticmethod
-    def _parse_query_response(response):
-        data_names = [c.name.name for c in response.columns]
-        return [
-            {
-                key: CottontailDBClient._parse_literal(value) for key, value in zip(data_names, item.data)
-            } for item in response.tuples
-        ]
+        One record batch is yielded per response message. The schema of the batches is derived from the result column
+        definitions, vector columns are represented as fixed size lists. The returned stream can be cancelled like
+        the one of iter_query and holds the metadata of the response once consumed.
 
-    @staticmethod
-    def _parse_literal(literal):
-        data_types = [
-            'booleanData',
-            'intData',
-            'longData',
-            'floatData',
-            'doubleData',
-            'stringData'
-        ]
-        for data_type in data_types:
-            if literal.HasField(data_type):
-                return getattr(literal, data_type)
-
-        if literal.HasField('dateData'):
-            return datetime.fromtimestamp(literal.dateData.utc_timestamp / 1000.0, timezone.utc)
-
-        if literal.HasField('vectorData'):
-            vector = literal.vectorData
-            vector_types = [
-                'float',
-                'double',
-                'int',
-                'long',
-                'bool',
-                'complex32',
-                'complex64'
-            ]
-            for vector_type in vector_types:
-                if vector.HasField(vector_type):
-                    return list(getattr(vector, vector_type).vector)
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param projection: the projection to be applied to the result
+        @param where: where clause specifying the rows to return
+        @param order: order by clause specifying the order of the result
+        @param limit: maximum number of rows to return
+        @param skip: number of rows to skip
+        @param from_: from clause, defaults to scan of the entity
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: ResponseStream of record batches
+        """
+        require_pyarrow()
+        message = self._query_message(schema, entity, projection, where, order, limit, skip, from_, hints)
+        responses = self._query_call(message, self._call_kwargs(compression, wait_for_ready, timeout))
+        return ResponseStream(responses, lambda response: [record_batch(response, self._parse_literal)])
 
-        # TODO: Object types
-        # complex32Data
-        # complex64Data
-        return literal
+    def query_df(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None,
+                 hints=None, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Queries the specified entity like query, but returns the result as pandas DataFrame. Requires pyarrow and
+        pandas.
 
-    def _insert_helper(self, schema, entity, values):
-        schema_name = SchemaName(name=schema)
-        entity_name = EntityName(schema=schema_name, name=entity)
-        from_kwarg = {'from': From(scan=Scan(entity=entity_name))}
-        elements = [InsertMessage.InsertElement(column=ColumnName(name=column), value=value)
-                    for column, value in values.items()]
-        return InsertMessage(metadata=RequestMetadata(transactionId=self._tid), **from_kwarg, elements=elements)
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param projection: the projection to be applied to the result
+        @param where: where clause specifying the rows to return
+        @param order: order by clause specifying the order of the result
+        @param limit: maximum number of rows to return
+        @param skip: number of rows to skip
+        @param from_: from clause, defaults to scan of the entity
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: DataFrame with one column per result column
+        """
+        batches = list(self.query_arrow(schema, entity, projection, where, order, limit, skip, from_, hints,
+                                        compression, wait_for_ready, timeout))
+        table = pa.Table.from_batches(batches) if batches else pa.table({})
+        return table.to_pandas()
+
+    def sample_query(self, schema, entity, projection, where, probability, seed=None, order=None, limit=None,
+                     skip=None, compact=False, hints=None, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Queries a random sample of the specified entity like query. Every row is sampled with the given probability
+        before the where clause is applied.
+
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param projection: the projection to be applied to the result
+        @param where: where clause specifying the rows to return
+        @param probability: probability of a row being sampled, in (0, 1]
+        @param seed: seed of the sample, random if None. Equal seeds select equal samples of an unchanged entity.
+        @param order: order by clause specifying the order of the result
+        @param limit: maximum number of rows to return
+        @param skip: number of rows to skip
+        @param compact: if True, returns rows as named tuples instead of dictionaries
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: list of result rows
+        """
+        from_ = sample_from(schema, entity, probability, seed)
+        return self.query(schema, entity, projection, where, order, limit, skip, from_, compact=compact, hints=hints,
+                          compression=compression, wait_for_ready=wait_for_ready, timeout=timeout)
+
+    def approximate_count(self, schema, entity, probability, where=None, seed=None, confidence=0.95, hints=None,
+                          timeout=None):
+        """
+        Estimates the number of rows of an entity matching a where clause by counting them in a random sample.
+
+        @param schema: the schema containing the entity
+        @param entity: the entity being counted
+        @param probability: probability of a row being sampled, in (0, 1]
+        @param where: where clause specifying the rows to count, all rows if None
+        @param seed: seed of the sample, random if None
+        @param confidence: confidence level of the interval
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: Estimate of the count with the bounds of its confidence interval
+        """
+        projection = self._sample_projection(schema, entity)
+        projection.op = Projection.ProjectionOperation.COUNT
+        rows = self.sample_query(schema, entity, projection, where, probability, seed, compact=True, hints=hints,
+                                 timeout=timeout)
+        return estimate_count(rows[0][0] if rows else 0, probability, confidence)
+
+    def approximate_aggregates(self, schema, entity, column, probability, where=None, seed=None, confidence=0.95,
+                               hints=None, timeout=None):
+        """
+        Estimates the count of rows and the sum and mean of a numeric column from a random sample of an entity.
+
+        Only the values of the column are transferred. Null values are not counted. The intervals assume that the
+        values of the sample are independent, which holds for samples drawn with a small probability.
+
+        @param schema: the schema containing the entity
+        @param entity: the entity being aggregated
+        @param column: name of the numeric column
+        @param probability: probability of a row being sampled, in (0, 1]
+        @param where: where clause specifying the rows to aggregate, all rows if None
+        @param seed: seed of the sample, random if None
+        @param confidence: confidence level of the intervals
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: dictionary of the 'count', 'sum' and 'mean' Estimate and the 'sample_size'
+        """
+        entity_name = EntityName(schema=SchemaName(name=schema), name=entity)
+        projection = Projection(op=Projection.ProjectionOperation.SELECT, elements=[
+            Projection.ProjectionElement(expression=Expression(column=ColumnName(entity=entity_name, name=column)))])
+        from_ = sample_from(schema, entity, probability, seed)
+        columns = self.query_columnar(schema, entity, projection, where, from_=from_, hints=hints, timeout=timeout)
+        values = next(iter(columns.values()), np.empty(0))
+        if np.ma.isMaskedArray(values):
+            values = values.compressed()
+        return {
+            'count': estimate_count(len(values), probability, confidence),
+            'sum': estimate_sum(values, probability, confidence),
+            'mean': estimate_mean(values, probability, confidence),
+            'sample_size': len(values),
+        }
+
+    def query_page(self, schema, entity, key, page_size, projection=None, where=None, token=None, descending=False,
+                   compact=False, hints=None, compression=None, wait_for_ready=None, timeout=None):
+        """
+        Queries a page of rows ordered by key columns, resuming after the last row of the previous page.
+
+        Pages are selected by comparing the keys with those of the last row of the previous page instead of skipping
+        rows, so every page costs the same as the first, and pages stay consistent when rows are inserted or deleted
+        before the current position. The key columns must be non-null, unique in combination and part of the
+        projection.
+
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param key: name of the key column, or list of names of key columns ordered lexicographically
+        @param page_size: maximum number of rows of the page
+        @param projection: the projection to be applied to the result, all columns if None
+        @param where: where clause specifying the rows to return
+        @param token: token of the previous page, None for the first page
+        @param descending: if the keys are ordered descending
+        @param compact: if True, returns rows as named tuples instead of dictionaries
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param compression: compression of this call, 'none', 'gzip' or 'deflate', defaults to the client compression
+        @param wait_for_ready: if this call waits for the channel to be ready, defaults to the client setting
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: Page of the rows and the token of the next page, None if this is the last page
+        """
+        keys = [key] if isinstance(key, str) else list(key)
+        if not keys:
+            raise ValueError('at least one key column is required')
+        if page_size < 1:
+            raise ValueError(f'page_size must be at least 1, got {page_size}')
+        if projection is None:
+            projection = self._sample_projection(schema, entity)
+        where = keyset_where(keys, decode_token(token, keys), descending, where)
+        message = self._query_message(schema, entity, projection, where, keyset_order(keys, descending), page_size,
+                                      None, None, hints)
+        responses = self._query_call(message, self._call_kwargs(compression, wait_for_ready, timeout))
+        last = []
+
+        def parse(response):
+            if response.tuples:
+                last[:] = [response]
+            return self._parse_query_response(response, compact)
+
+        rows = list(ResponseStream(responses, parse))
+        return Page(rows, encode_token(last[0], keys) if len(rows) >= page_size else None)
+
+    def iter_pages(self, schema, entity, key, page_size, token=None, **kwargs):
+        """
+        Iterates over the pages of a keyset paginated query, see query_page.
+
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param key: name of the key column, or list of names of key columns
+        @param page_size: maximum number of rows per page
+        @param token: token of the page before the first one to return, None to start at the beginning
+        @param kwargs: further keyword arguments of query_page
+        @return: generator of Page, the token of each page resumes the iteration after it
+        """
+        while True:
+            page = self.query_page(schema, entity, key, page_size, token=token, **kwargs)
+            if page.rows:
+                yield page
+            token = page.token
+            if token is None:
+                return
+
+    def parallel_scan(self, schema, entity, projection=None, where=None, partitions=4, ordered=True, rows=None,
+                      compact=False, max_buffered=8, hints=None, timeout=None):
+        """
+        Reads an entity with concurrent queries on ranges of its tuple ids, yielding one list of rows per response.
+
+        The tuple id range is split into partitions of about equal size based on the row count of the entity. Each
+        partition is read by its own query, all of which run concurrently. Outside of a transaction, the partitions
+        may observe different states of a concurrently modified entity.
+
+        @param schema: the schema containing the entity
+        @param entity: the entity being read
+        @param projection: the projection to be applied to the result, all columns if None
+        @param where: where clause specifying the rows to return
+        @param partitions: number of partitions
+        @param ordered: if True, yields the batches in tuple id order of the partitions, otherwise as they arrive
+        @param rows: row count of the entity, retrieved with get_entity_details if None
+        @param compact: if True, returns rows as named tuples instead of dictionaries
+        @param max_buffered: maximum number of batches buffered per partition, or in total if not ordered
+        @param hints: query planner hints of the queries as created by query_hints, replacing the client defaults
+        @param timeout: deadline of each query in seconds, defaults to the client timeout
+        @return: generator of lists of result rows, closing it cancels the running queries
+        """
+        if rows is None:
+            rows = self.get_entity_details(schema, entity, timeout)['rows']
+        if projection is None:
+            projection = self._sample_projection(schema, entity)
+        entity_name = EntityName(schema=SchemaName(name=schema), name=entity)
+        streams = []
+        try:
+            for start, end in scan_ranges(rows, partitions):
+                from_ = From(scan=Scan(entity=entity_name, start=start, end=end))
+                message = self._query_message(schema, entity, projection, where, None, None, None, from_, hints)
+                responses = self._query_call(message, self._call_kwargs(timeout=timeout))
+                streams.append(self._iter_responses(responses, batches=True, compact=compact))
+        except Exception:
+            for stream in streams:
+                stream.cancel()
+            raise
+        return merge_partitions(streams, ordered, max_buffered)
+
+    def explain(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None, hints=None,
+                with_metadata=False, timeout=None):
+        """
+        Explains the execution plan of a query without executing it.
+
+        @param schema: the schema containing the queried entity
+        @param entity: the entity being queried
+        @param projection: the projection to be applied to the result
+        @param where: where clause specifying the rows to return
+        @param order: order by clause specifying the order of the result
+        @param limit: maximum number of rows to return
+        @param skip: number of rows to skip
+        @param from_: from clause, defaults to scan of the entity
+        @param hints: query planner hints of this call as created by query_hints, replacing the client defaults
+        @param with_metadata: if True, returns the response metadata along with the plan, see response_metadata
+        @param timeout: deadline of the call in seconds, defaults to the client timeout
+        @return: list of root operators of the plan as created by plan_tree, or tuple of the plan and the metadata
+                 dictionary if with_metadata is True
+        """
+        message = self._query_message(schema, entity, projection, where, order, limit, skip, from_, hints)
+        stream = self._iter_responses(self._dql.Explain(message, **self._call_kwargs(timeout=timeout)))
+        plan = plan_tree(list(stream))
+        return (plan, response_metadata(stream.metadata)) if with_metadata else plan
+
+    def _query_call(self, message, call_kwargs):
+        """Sends a query and returns its response iterator, replaying the cached responses of a repeated query."""
+        if self._cache is None:
+            return self._dql.Query(message, **call_kwargs)
+        # Serialized messages include the transaction, so results read within a transaction are cached separately
+        key = (self._target, message.SerializeToString(deterministic=True))
+        responses = self._cache.get(key)
+        if responses is not None:
+            return CachedCall(responses)
+        entity = _query_entity(message.query)
+        # Results of queries overlapping a write to their entity may predate it and are not stored
+        generation = self._cache.generation(entity)
+
+        def store(responses):
+            size = len(key[1]) + sum(response.ByteSize() for response in responses)
+            self._cache.put(key, entity, tuple(responses), size, generation)
+
+        return CachingCall(self._dql.Query(message, **call_kwargs), store)
+
+    def _invalidate(self, entity=None, schema=None):
+        """Drops cached results of a modified entity or schema, and again once a running transaction ends."""
+        if self._cache is None:
+            return
+        self._cache.invalidate(entity, schema)
+        if self._transaction:
+            self._written.add((entity, schema))
+
+    def _invalidate_written(self):
+        # Results read outside the transaction while it was running are stale once it is committed
+        while self._written:
+            self._invalidate(*self._written.pop())
+
+    def _iter_responses(self, responses, batches=False, compact=False):
+        if batches:
+            return ResponseStream(responses, lambda response: [self._parse_query_response(response, compact)])
+        return ResponseStream(responses, lambda response: self._parse_query_response(response, compact))
+
+
+@lru_cache(maxsize=256)
+def _result_plan(signature):
+    """
+    Compiles the decoder plan for query results with the given column signature.
+
+    @param signature: tuple of (column name, column type) pairs of the result
+    @return: tuple of column names and tuple of per-column literal decode functions
+    """
+    names = tuple(name for name, _ in signature)
+    decoders = tuple(_column_decoder(type_) for _, type_ in signature)
+    return names, decoders
+
+
+@lru_cache(maxsize=256)
+def _row_type(names):
+    """
+    Returns the compact row type for query results with the given column names.
+
+    Rows are named tuples, supporting both attribute and index access. Column names that are not valid identifiers are
+    replaced by positional names (e.g. _0).
+
+    @param names: tuple of result column names
+    @return: named tuple type
+    """
+    return namedtuple('Row', names, rename=True)
+
+
+def _column_decoder(type_):
+    field = _SCALAR_FIELDS.get(type_)
+    if field is None:
+        return CottontailDBClient._parse_literal
+
+    def decode(literal):
+        if literal.WhichOneof('data') == field:
+            return getattr(literal, field)
+        return CottontailDBClient._parse_literal(literal)
+
+    return decode
+
+
+def _query_entity(query):
+    """Returns the entity read by a query as 'schema.entity'."""
+    from_ = getattr(query, 'from')
+    source = from_.WhichOneof('from')
+    if source == 'query':
+        return _query_entity(from_.query)
+    entity = getattr(from_, source).entity if source is not None else None
+    return f'{entity.schema.name}.{entity.name}' if entity is not None else None
+
+
+def _parse_uuid(uuid):
+    return UUID(int=((uuid.mostSignificant & 0xFFFFFFFFFFFFFFFF) << 64) | (uuid.leastSignificant & 0xFFFFFFFFFFFFFFFF))
+
+
+def _parse_vector(vector):
+    vector_type = vector.WhichOneof('vectorData')
+    if vector_type is None:
+        return None
+    values = getattr(vector, vector_type).vector
+    if vector_type == 'half':
+        return np.array(values, dtype=np.float16)
+    if vector_type in ('complex32', 'complex64'):
+        return [complex(c.real, c.imaginary) for c in values]
+    return list(values)
+
+
+# Literal field holding the values of scalar column types
+_SCALAR_FIELDS = {
+    Type.BOOLEAN: 'booleanData',
+    Type.BYTE: 'intData',
+    Type.SHORT: 'intData',
+    Type.INTEGER: 'intData',
+    Type.LONG: 'longData',
+    Type.FLOAT: 'floatData',
+    Type.DOUBLE: 'doubleData',
+    Type.STRING: 'stringData',
+    Type.BYTESTRING: 'byteStringData',
+}
+
+# Decode functions by set field of the Literal.data oneof
+_LITERAL_DECODERS = {
+    'nullData': lambda literal: None,
+    'booleanData': lambda literal: literal.booleanData,
+    'intData': lambda literal: literal.intData,
+    'longData': lambda literal: literal.longData,
+    'floatData': lambda literal: literal.floatData,
+    'doubleData': lambda literal: literal.doubleData,
+    'stringData': lambda literal: literal.stringData,
+    'dateData': lambda literal: datetime.fromtimestamp(literal.dateData / 1000.0, timezone.utc),
+    'uuidData': lambda literal: _parse_uuid(literal.uuidData),
+    'complex32Data': lambda literal: complex(literal.complex32Data.real, literal.complex32Data.imaginary),
+    'complex64Data': lambda literal: complex(literal.complex64Data.real, literal.complex64Data.imaginary),
+    'vectorData': lambda literal: _parse_vector(literal.vectorData),
+    'byteStringData': lambda literal: literal.byteStringData,
+}
 
 
 def column_def(name: str, type_: Type, length: int = None, primary: bool = None, nullable: bool = None):
@@ -503,4 +1392,67 @@ def column_def(name: str, type_: Type, length: int = None, primary: bool = None,
 
 
 def float_vector(*elements):
-    return Literal(vectorData=Vector(float=FloatVector(vector=elements)))
+    """
+    Creates a float vector literal, e.g. float_vector(0.5, 1.0) or float_vector(np.array([0.5, 1.0])).
+
+    @param elements: vector elements, or a single 1-D array, buffer or sequence of vector elements
+    @return: vector literal
+    """
+    return vector_literal(_vector_elements(elements), Type.FLOAT_VECTOR)
+
+
+def half_vector(*elements):
+    """
+    Creates a half precision vector literal for HALF_VECTOR columns. The elements are rounded to half precision.
+
+    @param elements: vector elements, or a single 1-D array, buffer or sequence of vector elements
+    @return: vector literal
+    """
+    return vector_literal(_vector_elements(elements), Type.HALF_VECTOR)
+
+
+def double_vector(*elements):
+    """
+    Creates a double vector literal.
+
+    @param elements: vector elements, or a single 1-D array, buffer or sequence of vector elements
+    @return: vector literal
+    """
+    return vector_literal(_vector_elements(elements), Type.DOUBLE_VECTOR)
+
+
+def int_vector(*elements):
+    """
+    Creates an integer vector literal.
+
+    @param elements: vector elements, or a single 1-D array, buffer or sequence of vector elements
+    @return: vector literal
+    """
+    return vector_literal(_vector_elements(elements), Type.INTEGER_VECTOR)
+
+
+def long_vector(*elements):
+    """
+    Creates a long vector literal.
+
+    @param elements: vector elements, or a single 1-D array, buffer or sequence of vector elements
+    @return: vector literal
+    """
+    return vector_literal(_vector_elements(elements), Type.LONG_VECTOR)
+
+
+def bool_vector(*elements):
+    """
+    Creates a boolean vector literal.
+
+    @param elements: vector elements, or a single 1-D array, buffer or sequence of vector elements
+    @return: vector literal
+    """
+    return vector_literal(_vector_elements(elements), Type.BOOLEAN_VECTOR)
+
+
+def _vector_elements(elements):
+    # A single argument that is not a scalar holds the elements
+    if len(elements) == 1 and np.ndim(elements[0]) == 1:
+        return elements[0]
+    return elements
@@ -0,0 +1,328 @@
+from datetime import datetime
+from typing import Dict, List
+from uuid import UUID
+
+import numpy as np
+
+from .cottontail_pb2 import Type, Literal, Null, Vector, FloatVector, DoubleVector, IntVector, LongVector, BoolVector, \
+    Complex32Vector, Complex64Vector, Complex32, Complex64, Uuid
+
+# Tag of the BatchInsertMessage.inserts field and the BatchInsertMessage.Insert.values field (length delimited)
+_INSERTS_TAG = b'\x22'
+_VALUES_TAG = b'\x0a'
+
+# Tag of the Literal.vectorData field, the Vector fields with a fixed size element encoding and the packed vector
+# field of the vector messages (length delimited)
+_VECTOR_DATA_TAG = b'\xf2\x01'
+_VECTOR_FIELD_TAGS = {'half': b'\x0a', 'float': b'\x12', 'double': b'\x1a', 'bool': b'\x3a'}
+_ELEMENTS_TAG = b'\x0a'
+
+# Literal field and wire dtype of scalar column types with a fixed size encoding
+_FIXED_SCALAR_TYPES = {
+    Type.BOOLEAN: ('booleanData', np.dtype('u1')),
+    Type.FLOAT: ('floatData', np.dtype('<f4')),
+    Type.DOUBLE: ('doubleData', np.dtype('<f8')),
+}
+
+# Literal field of scalar column types with a variable size encoding
+_SCALAR_TYPES = {
+    Type.BYTE: 'intData',
+    Type.SHORT: 'intData',
+    Type.INTEGER: 'intData',
+    Type.LONG: 'longData',
+    Type.STRING: 'stringData',
+    Type.BYTESTRING: 'byteStringData',
+}
+
+# Vector field and vector message of vector column types
+_VECTOR_TYPES = {
+    Type.HALF_VECTOR: ('half', FloatVector),
+    Type.FLOAT_VECTOR: ('float', FloatVector),
+    Type.DOUBLE_VECTOR: ('double', DoubleVector),
+    Type.SHORT_VECTOR: ('short', IntVector),
+    Type.INTEGER_VECTOR: ('int', IntVector),
+    Type.LONG_VECTOR: ('long', LongVector),
+    Type.BOOLEAN_VECTOR: ('bool', BoolVector),
+    Type.COMPLEX32_VECTOR: ('complex32', Complex32Vector),
+    Type.COMPLEX64_VECTOR: ('complex64', Complex64Vector),
+}
+
+# Wire dtype of vector fields with a fixed size element encoding
+_FIXED_VECTOR_DTYPES = {
+    'half': np.dtype('<f4'),
+    'float': np.dtype('<f4'),
+    'double': np.dtype('<f8'),
+    'bool': np.dtype('u1'),
+}
+
+# Column types by dtype kind and size for type inference
+_INFERRED_SCALAR_TYPES = {
+    ('b', 1): Type.BOOLEAN,
+    ('i', 1): Type.BYTE,
+    ('i', 2): Type.SHORT,
+    ('i', 4): Type.INTEGER,
+    ('i', 8): Type.LONG,
+    ('f', 4): Type.FLOAT,
+    ('f', 8): Type.DOUBLE,
+}
+_INFERRED_VECTOR_TYPES = {
+    ('b', 1): Type.BOOLEAN_VECTOR,
+    ('i', 2): Type.SHORT_VECTOR,
+    ('i', 4): Type.INTEGER_VECTOR,
+    ('i', 8): Type.LONG_VECTOR,
+    ('f', 2): Type.HALF_VECTOR,
+    ('f', 4): Type.FLOAT_VECTOR,
+    ('f', 8): Type.DOUBLE_VECTOR,
+    ('c', 8): Type.COMPLEX32_VECTOR,
+    ('c', 16): Type.COMPLEX64_VECTOR,
+}
+
+_NULL_LITERAL = Literal(nullData=Null()).SerializeToString()
+
+
+def parse_type_name(name: str):
+    """
+    Parses a column type name as reported by Cottontail DB entity details into a Type.
+
+    @param name: type name, e.g. 'INTEGER' or 'FLOAT_VEC'
+    @return: column type or None if the name is unknown
+    """
+    name = name.upper()
+    if name.endswith('_VEC'):
+        name += 'TOR'
+    name = name.replace('BOOL_', 'BOOLEAN_').replace('INT_', 'INTEGER_')
+    return Type.Value(name) if name in Type.keys() else None
+
+
+def infer_type(values: np.ndarray):
+    """
+    Infers the column type of an array of values from its dtype and shape.
+
+    @param values: 1-D array of scalar values or 2-D array of vectors
+    @return: column type
+    """
+    key = (values.dtype.kind, values.dtype.itemsize)
+    if values.ndim == 2 and key in _INFERRED_VECTOR_TYPES:
+        return _INFERRED_VECTOR_TYPES[key]
+    if values.ndim == 1:
+        if key in _INFERRED_SCALAR_TYPES:
+            return _INFERRED_SCALAR_TYPES[key]
+        if values.dtype.kind == 'M':
+            return Type.DATE
+        if values.dtype.kind in 'OU':
+            return Type.STRING
+        if values.dtype.kind == 'S':
+            return Type.BYTESTRING
+        if key == ('c', 8):
+            return Type.COMPLEX32
+        if key == ('c', 16):
+            return Type.COMPLEX64
+    raise ValueError(f'cannot infer column type of array with dtype {values.dtype} and shape {values.shape}')
+
+
+def encode_inserts(columns: Dict[str, np.ndarray], types: Dict[str, int]) -> List[bytes]:
+    """
+    Encodes columns of values into serialized BatchInsertMessage.Insert messages.
+
+    Each returned element is the serialized inserts field of one row, such that the concatenation of any of them can be
+    merged into a BatchInsertMessage with MergeFromString. Null values are given by masked array elements or None.
+
+    @param columns: dictionary of (column name, array) key-value pairs, 2-D arrays for vector columns
+    @param types: dictionary of (column name, column type) key-value pairs
+    @return: list of serialized inserts, one per row
+    """
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f'columns have differing lengths {sorted(lengths)}')
+    encoded = [encode_values(values, types[name]) for name, values in columns.items()]
+    return [_INSERTS_TAG + _varint(len(row)) + row for row in map(b''.join, zip(*encoded))]
+
+
+def chunk_rows(sizes: List[int], max_bytes: int, max_rows: int = None):
+    """
+    Splits rows into consecutive chunks bounded by their total serialized size and number of rows.
+
+    @param sizes: serialized size in bytes of each row
+    @param max_bytes: maximum total size of the rows of a chunk
+    @param max_rows: maximum number of rows of a chunk, unbounded if None
+    @return: generator of (start, end) row index ranges
+    """
+    start = 0
+    total = 0
+    for i, size in enumerate(sizes):
+        if size > max_bytes:
+            raise ValueError(f'row {i} of {size} bytes exceeds the maximum message size of {max_bytes} bytes')
+        if i > start and (total + size > max_bytes or (max_rows is not None and i - start >= max_rows)):
+            yield start, i
+            start = i
+            total = 0
+        total += size
+    if start < len(sizes):
+        yield start, len(sizes)
+
+
+def encoded_size(message_size: int) -> int:
+    """Returns the size of a length delimited field containing a message of the given size, including its tag."""
+    return 1 + len(_varint(message_size)) + message_size
+
+
+def encode_values(values, type_) -> List[bytes]:
+    """
+    Encodes a column of values into serialized BatchInsertMessage.Insert.values fields.
+
+    @param values: array or list of values, 2-D array or list of vectors for vector columns
+    @param type_: column type
+    @return: list of serialized values fields, one per row
+    """
+    mask = np.ma.getmaskarray(values) if isinstance(values, np.ma.MaskedArray) else None
+    if type_ in _FIXED_SCALAR_TYPES:
+        field, wire_dtype = _FIXED_SCALAR_TYPES[type_]
+        if mask is None and not _contains_none(values):
+            array = np.asarray(values).astype(wire_dtype).reshape(-1, 1)
+            return _encode_fixed(Literal(**{field: array[0, 0].item()}) if len(array) else None, array)
+    if type_ in _VECTOR_TYPES:
+        field, vector_type = _VECTOR_TYPES[type_]
+        if field in _FIXED_VECTOR_DTYPES and mask is None and not _contains_none(values):
+            array = np.asarray(values)
+            if field == 'half':
+                # Half precision vectors are sent as single precision, round to the precision they are stored in
+                array = array.astype(np.float16)
+            array = array.astype(_FIXED_VECTOR_DTYPES[field])
+            if array.ndim == 2:
+                sample = vector_literal(array[0], type_) if len(array) else None
+                return _encode_fixed(sample, array)
+
+    encoded = []
+    for i, value in enumerate(values):
+        if value is None or (mask is not None and mask[i].any()):
+            literal = _NULL_LITERAL
+        else:
+            literal = to_literal(value, type_).SerializeToString()
+        encoded.append(_VALUES_TAG + _varint(len(literal)) + literal)
+    return encoded
+
+
+def to_literal(value, type_):
+    """
+    Converts a Python or NumPy value into a literal of the given column type.
+
+    @param value: value to convert, None for null
+    @param type_: column type
+    @return: literal
+    """
+    if value is None:
+        return Literal(nullData=Null(type=type_))
+    if type_ in _FIXED_SCALAR_TYPES:
+        return Literal(**{_FIXED_SCALAR_TYPES[type_][0]: value.item() if isinstance(value, np.generic) else value})
+    if type_ in _SCALAR_TYPES:
+        field = _SCALAR_TYPES[type_]
+        if field == 'stringData':
+            value = str(value)
+        elif field == 'byteStringData':
+            value = bytes(value)
+        else:
+            value = int(value)
+        return Literal(**{field: value})
+    if type_ in _VECTOR_TYPES:
+        return vector_literal(value, type_)
+    if type_ == Type.DATE:
+        if isinstance(value, datetime):
+            return Literal(dateData=int(value.timestamp() * 1000))
+        return Literal(dateData=int(np.datetime64(value, 'ms').astype(np.int64)))
+    if type_ == Type.UUID:
+        value = value if isinstance(value, UUID) else UUID(str(value))
+        most, least = value.int >> 64, value.int & 0xFFFFFFFFFFFFFFFF
+        return Literal(uuidData=Uuid(mostSignificant=_signed(most), leastSignificant=_signed(least)))
+    if type_ == Type.COMPLEX32:
+        return Literal(complex32Data=Complex32(real=value.real, imaginary=value.imag))
+    if type_ == Type.COMPLEX64:
+        return Literal(complex64Data=Complex64(real=value.real, imaginary=value.imag))
+    raise ValueError(f'unsupported column type {Type.Name(type_)}')
+
+
+def vector_literal(vector, type_):
+    """
+    Creates a vector literal of the given vector column type.
+
+    Vectors of fixed size elements (half, float, double and boolean) are encoded in bulk and parsed into the literal,
+    other vectors are converted into a list first.
+
+    @param vector: array, buffer or sequence of vector elements
+    @param type_: vector column type
+    @return: literal
+    """
+    field, vector_type = _VECTOR_TYPES[type_]
+    if field in _FIXED_VECTOR_DTYPES:
+        return Literal.FromString(_fixed_vector_bytes(vector, field))
+    values = np.asarray(vector).tolist()
+    if field == 'complex32':
+        values = [Complex32(real=v.real, imaginary=v.imag) for v in values]
+    elif field == 'complex64':
+        values = [Complex64(real=v.real, imaginary=v.imag) for v in values]
+    return Literal(vectorData=Vector(**{field: vector_type(vector=values)}))
+
+
+def literal_bytes(value, type_):
+    """
+    Serializes a Python or NumPy value as literal of the given column type. Vectors of fixed size elements are encoded
+    without constructing a literal.
+
+    @param value: value to convert, None for null
+    @param type_: column type
+    @return: serialized literal
+    """
+    if value is not None and type_ in _VECTOR_TYPES and _VECTOR_TYPES[type_][0] in _FIXED_VECTOR_DTYPES:
+        return _fixed_vector_bytes(value, _VECTOR_TYPES[type_][0])
+    return to_literal(value, type_).SerializeToString()
+
+
+def _fixed_vector_bytes(vector, field):
+    """Serializes a vector literal of fixed size elements from the packed little-endian elements."""
+    array = np.asarray(vector)
+    if array.ndim != 1:
+        raise ValueError(f'expected a 1-D array of vector elements, got shape {array.shape}')
+    if field == 'half':
+        array = array.astype(np.float16)
+    elif field == 'bool':
+        array = array.astype(np.bool_)
+    payload = array.astype(_FIXED_VECTOR_DTYPES[field]).tobytes()
+    elements = _ELEMENTS_TAG + _varint(len(payload)) + payload
+    data = _VECTOR_FIELD_TAGS[field] + _varint(len(elements)) + elements
+    return _VECTOR_DATA_TAG + _varint(len(data)) + data
+
+
+def _encode_fixed(sample, array):
+    """
+    Encodes values with a fixed size wire format by prefixing the raw little-endian rows of array with the header of
+    the serialized sample literal, which is identical for all rows.
+    """
+    if sample is None:
+        return []
+    payload = np.ascontiguousarray(array).view(np.uint8).reshape(len(array), array.itemsize * array.shape[1])
+    literal = sample.SerializeToString()
+    header = _VALUES_TAG + _varint(len(literal)) + literal[:len(literal) - payload.shape[1]]
+    buffer = np.empty((len(array), len(header) + payload.shape[1]), dtype=np.uint8)
+    buffer[:, :len(header)] = np.frombuffer(header, dtype=np.uint8)
+    buffer[:, len(header):] = payload
+    data = buffer.tobytes()
+    width = buffer.shape[1]
+    return [data[i:i + width] for i in range(0, len(data), width)]
+
+
+def _contains_none(values):
+    return isinstance(values, list) and any(v is None for v in values)
+
+
+def _signed(value):
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _varint(value):
+    if value < 0x80:
+        return bytes((value,))
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
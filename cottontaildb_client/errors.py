@@ -0,0 +1,145 @@
+import grpc
+
+
+class CottontailDBError(grpc.RpcError):
+    """
+    Error of a failed Cottontail DB call. Subclasses grpc.RpcError, so existing handlers of gRPC errors keep working,
+    and provides the status code and details of the underlying error.
+    """
+
+    def __init__(self, error):
+        super().__init__(error)
+        self.error = error
+
+    def code(self):
+        return self.error.code()
+
+    def details(self):
+        return self.error.details()
+
+    def __str__(self):
+        return f'{self.code().name}: {self.details()}'
+
+
+class DeadlineExceededError(CottontailDBError):
+    """The call did not complete before its deadline."""
+
+
+class CancelledError(CottontailDBError):
+    """The call was cancelled by the client."""
+
+
+class UnavailableError(CottontailDBError):
+    """The endpoint is not reachable."""
+
+
+class CircuitOpenError(UnavailableError):
+    """The circuit breaker of the endpoint is open after repeated failures, the call was not sent."""
+
+    def __init__(self, endpoint):
+        super().__init__(None)
+        self.endpoint = endpoint
+
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self):
+        return f'circuit breaker open for {self.endpoint}'
+
+
+_ERROR_TYPES = {
+    grpc.StatusCode.DEADLINE_EXCEEDED: DeadlineExceededError,
+    grpc.StatusCode.CANCELLED: CancelledError,
+    grpc.StatusCode.UNAVAILABLE: UnavailableError,
+}
+
+
+def typed_error(error):
+    """
+    Converts a gRPC error into the CottontailDBError subclass of its status code.
+
+    @param error: error raised by a gRPC call
+    @return: typed error, or the given error if it is already typed or has no status code
+    """
+    if isinstance(error, CottontailDBError) or not callable(getattr(error, 'code', None)):
+        return error
+    return _ERROR_TYPES.get(error.code(), CottontailDBError)(error)
+
+
+class TypedErrorStub:
+    """Stub proxy raising typed errors from failed unary calls. Streaming calls are returned unchanged."""
+
+    def __init__(self, stub):
+        self._stub = stub
+
+    def __getattr__(self, name):
+        method = _TypedErrorMethod(getattr(self._stub, name))
+        setattr(self, name, method)
+        return method
+
+
+class _TypedErrorMethod:
+
+    def __init__(self, method):
+        self._method = method
+
+    def __call__(self, request, *args, **kwargs):
+        try:
+            return self._method(request, *args, **kwargs)
+        except grpc.RpcError as error:
+            raise typed_error(error) from error
+
+    def future(self, request, *args, **kwargs):
+        return self._method.future(request, *args, **kwargs)
+
+
+class ResponseStream:
+    """
+    Iterator over the items parsed from the responses of a streaming call.
+
+    The call can be cancelled from any thread with cancel, after which iteration raises CancelledError. Failed calls
+    raise typed errors. The call is cancelled when the stream is closed or garbage collected before it is exhausted.
+    The metadata of the latest response carrying metadata is available as metadata.
+    """
+
+    def __init__(self, call, parse):
+        """
+        @param call: response iterator of the streaming call
+        @param parse: function mapping a response to an iterable of items
+        """
+        self._call = call
+        self.metadata = None
+        self._items = self._iterate(parse)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._items)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def cancel(self):
+        """Cancels the call. Safe to call from any thread."""
+        self._call.cancel()
+
+    def close(self):
+        """Stops iteration and cancels the call if it is still running. Must be called from the iterating thread."""
+        self._items.close()
+        # Closing a generator that never started skips its cleanup
+        self._call.cancel()
+
+    def _iterate(self, parse):
+        try:
+            for response in self._call:
+                if hasattr(response, 'metadata') and response.HasField('metadata'):
+                    self.metadata = response.metadata
+                yield from parse(response)
+        except grpc.RpcError as error:
+            raise typed_error(error) from error
+        finally:
+            self._call.cancel()
@@ -0,0 +1,51 @@
+from .cottontail_pb2 import ResponseMetadata, TransactionMode
+
+
+def plan_tree(rows, path_column='path', separator='.'):
+    """
+    Builds the tree of an execution plan from the rows returned by Explain.
+
+    Every row describes one operator of the plan and holds its position in the plan as path of child indexes, e.g.
+    '0.1' for the second input of the root operator. Rows without a path are returned as roots in the order received.
+
+    @param rows: result rows as dictionaries
+    @param path_column: name of the column holding the path of an operator
+    @param separator: separator of the path components
+    @return: list of root nodes, dictionaries of the columns of an operator with a list of child nodes as 'children'
+    """
+    nodes = {}
+    roots = []
+    for row in rows:
+        node = dict(row, children=[])
+        path = row.get(path_column)
+        if path is None:
+            roots.append(node)
+            continue
+        nodes[str(path)] = node
+    for path, node in nodes.items():
+        parent = nodes.get(path.rpartition(separator)[0]) if separator in path else None
+        if parent is not None:
+            parent['children'].append(node)
+        else:
+            roots.append(node)
+    return roots
+
+
+def response_metadata(metadata: ResponseMetadata):
+    """
+    Converts the metadata of a query response into a dictionary.
+
+    @param metadata: response metadata message, None if the response had none
+    @return: dictionary of the 'transaction_id', 'transaction_mode', 'query_id', the 'plan_duration' and
+             'query_duration' in milliseconds and the 'plan_score' of the selected plan, or None
+    """
+    if metadata is None:
+        return None
+    return {
+        'transaction_id': metadata.transactionId,
+        'transaction_mode': TransactionMode.Name(metadata.transactionMode),
+        'query_id': metadata.queryId,
+        'plan_duration': metadata.planDuration,
+        'plan_score': metadata.planScore,
+        'query_duration': metadata.queryDuration,
+    }
@@ -0,0 +1,92 @@
+import base64
+from collections import namedtuple
+
+from google.protobuf.message import DecodeError
+
+from .cottontail_pb2 import ColumnName, Expression, Order, Where, Predicate, QueryResponseMessage
+
+# Page of a keyset paginated query with the token resuming after its last row, None after the last page
+Page = namedtuple('Page', ['rows', 'token'])
+
+
+def keyset_order(keys, descending=False):
+    """
+    Creates the order of a keyset paginated query.
+
+    @param keys: names of the key columns
+    @param descending: if the keys are ordered descending
+    @return: Order message
+    """
+    direction = Order.Direction.DESCENDING if descending else Order.Direction.ASCENDING
+    return Order(components=[Order.Component(column=ColumnName(name=key), direction=direction) for key in keys])
+
+
+def keyset_where(keys, literals, descending=False, where: Where = None):
+    """
+    Creates the where clause selecting the rows after the given key values in key order, (a, b) > (x, y) being
+    expanded to a > x or (a = x and b > y).
+
+    @param keys: names of the key columns
+    @param literals: Literal values of the key columns of the last row of the previous page, None for the first page
+    @param descending: if the keys are ordered descending
+    @param where: where clause of the query, combined with the key condition by and
+    @return: Where message, or the given where clause for the first page
+    """
+    if literals is None:
+        return where
+    after = Predicate.Comparison.Operator.LESS if descending else Predicate.Comparison.Operator.GREATER
+    predicate = None
+    for i in reversed(range(len(keys))):
+        condition = _comparison(keys[i], after, literals[i])
+        if predicate is not None:
+            equal = _comparison(keys[i], Predicate.Comparison.Operator.EQUAL, literals[i])
+            condition = Predicate(**{'or': Predicate.Or(p1=condition, p2=Predicate(
+                **{'and': Predicate.And(p1=equal, p2=predicate)}))})
+        predicate = condition
+    if where is not None and where.HasField('predicate'):
+        predicate = Predicate(**{'and': Predicate.And(p1=where.predicate, p2=predicate)})
+    return Where(predicate=predicate)
+
+
+def encode_token(response: QueryResponseMessage, keys):
+    """
+    Creates the token resuming a keyset paginated query after the last row of a response.
+
+    @param response: last non-empty response of the page
+    @param keys: names of the key columns
+    @return: opaque URL-safe string
+    """
+    names = [c.name.name for c in response.columns]
+    missing = [key for key in keys if key not in names]
+    if missing:
+        raise ValueError(f'key columns {missing} are not part of the result')
+    indexes = [names.index(key) for key in keys]
+    last = response.tuples[-1]
+    token = QueryResponseMessage(columns=[response.columns[i] for i in indexes],
+                                 tuples=[QueryResponseMessage.Tuple(data=[last.data[i] for i in indexes])])
+    return base64.urlsafe_b64encode(token.SerializeToString()).decode('ascii')
+
+
+def decode_token(token, keys):
+    """
+    Retrieves the key values of the last row of the previous page from a token.
+
+    @param token: token created by encode_token, None for the first page
+    @param keys: names of the key columns, must equal those of the token
+    @return: list of Literal values, None for the first page
+    """
+    if token is None:
+        return None
+    try:
+        message = QueryResponseMessage.FromString(base64.urlsafe_b64decode(token.encode('ascii')))
+    except (ValueError, DecodeError) as error:
+        raise ValueError(f'invalid page token {token!r}') from error
+    names = [c.name.name for c in message.columns]
+    if names != list(keys) or len(message.tuples) != 1:
+        raise ValueError(f'page token of keys {names} does not match keys {list(keys)}')
+    return list(message.tuples[0].data)
+
+
+def _comparison(column, operator, literal):
+    return Predicate(comparison=Predicate.Comparison(lexp=Expression(column=ColumnName(name=column)),
+                                                     operator=operator, rexp=Expression(literal=literal)))
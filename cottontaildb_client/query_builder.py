@@ -0,0 +1,304 @@
+import numpy as np
+
+from .cottontail_pb2 import SchemaName, EntityName, ColumnName, Scan, From, Literal, Expression, FunctionName, \
+    Function, Projection, Order, Where, Predicate, Query, QueryMessage, RequestMetadata, Type
+from .encoding import literal_bytes, to_literal, vector_literal, infer_type, _varint
+
+# Comparison operators of where clauses by symbol
+COMPARISON_OPERATORS = {
+    '=': Predicate.Comparison.Operator.EQUAL,
+    '!=': Predicate.Comparison.Operator.NOTEQUAL,
+    '>': Predicate.Comparison.Operator.GREATER,
+    '<': Predicate.Comparison.Operator.LESS,
+    '>=': Predicate.Comparison.Operator.GEQUAL,
+    '<=': Predicate.Comparison.Operator.LEQUAL,
+    'like': Predicate.Comparison.Operator.LIKE,
+    'match': Predicate.Comparison.Operator.MATCH,
+}
+
+# String data marking the placeholder literal of a parameter during compilation
+_PARAM_MARKER = '\x00cottontaildb-param\x00'
+
+# Tag of the QueryMessage.metadata and QueryMessage.query fields (length delimited)
+_METADATA_TAG = b'\x0a'
+_QUERY_TAG = b'\x12'
+
+
+class Param:
+    """Named parameter of a query template, bound to a value each time the template is executed."""
+
+    def __init__(self, name, type_=None):
+        """
+        @param name: parameter name
+        @param type_: column type of the values, values must be given as Literal if None
+        """
+        if not isinstance(name, str) or not name:
+            raise ValueError(f'parameter name must be a non-empty string, got {name!r}')
+        self.name = name
+        self.type = type_
+
+    def __repr__(self):
+        return f'Param({self.name!r})'
+
+
+class QueryBuilder:
+    """
+    Fluent builder of queries on an entity that compiles into a reusable QueryTemplate.
+
+    Values given as Param are bound when the template is executed, so the query is only constructed once, e.g.:
+    template = QueryBuilder('schema', 'entity') \\
+        .select('id') \\
+        .distance('feature', Param('vector', Type.FLOAT_VECTOR), 'euclidean') \\
+        .where('category', '=', Param('category', Type.STRING)) \\
+        .order('distance') \\
+        .limit(10) \\
+        .compile()
+    rows = client.execute(template, {'vector': query_vector, 'category': 'shoes'})
+    """
+
+    def __init__(self, schema, entity):
+        """
+        @param schema: name of the entity's schema
+        @param entity: entity name
+        """
+        self._entity = EntityName(schema=SchemaName(name=schema), name=entity)
+        self._operation = Projection.ProjectionOperation.SELECT
+        self._elements = []
+        self._predicates = []
+        self._components = []
+        self._limit = None
+        self._skip = None
+        self._params = {}
+
+    def select(self, *columns):
+        """
+        Adds columns to the projection.
+
+        @param columns: column names, '*' for all columns
+        @return: this builder
+        """
+        for column in columns:
+            expression = Expression(column=ColumnName(entity=self._entity, name=column))
+            self._elements.append(Projection.ProjectionElement(expression=expression))
+        return self
+
+    def distance(self, column, vector, distance='euclidean', alias='distance'):
+        """
+        Adds the distance between the vectors of a column and a query vector to the projection.
+
+        @param column: name of the vector column
+        @param vector: query vector as Param, Literal or array of floats
+        @param distance: name of the distance function
+        @param alias: name of the distance column in the result
+        @return: this builder
+        """
+        arguments = [Expression(column=ColumnName(entity=self._entity, name=column)), self._value(vector, True)]
+        function = Function(name=FunctionName(name=distance), arguments=arguments)
+        self._elements.append(Projection.ProjectionElement(alias=ColumnName(name=alias),
+                                                           expression=Expression(function=function)))
+        return self
+
+    def count(self):
+        """
+        Counts the selected rows instead of returning them.
+
+        @return: this builder
+        """
+        self._operation = Projection.ProjectionOperation.COUNT
+        return self
+
+    def where(self, column, operator, value):
+        """
+        Adds a comparison of a column with a value to the where clause. Comparisons are combined with and.
+
+        @param column: column name
+        @param operator: comparison operator, one of '=', '!=', '>', '<', '>=', '<=', 'like' and 'match'
+        @param value: compared value as Param, Literal or Python value
+        @return: this builder
+        """
+        if operator not in COMPARISON_OPERATORS:
+            raise ValueError(f'unknown operator {operator!r}, expected one of {list(COMPARISON_OPERATORS)}')
+        comparison = Predicate.Comparison(lexp=Expression(column=ColumnName(name=column)),
+                                          operator=COMPARISON_OPERATORS[operator], rexp=self._value(value))
+        self._predicates.append(Predicate(comparison=comparison))
+        return self
+
+    def order(self, column, descending=False):
+        """
+        Adds a column to the order of the result.
+
+        @param column: column name
+        @param descending: if the column is ordered descending instead of ascending
+        @return: this builder
+        """
+        direction = Order.Direction.DESCENDING if descending else Order.Direction.ASCENDING
+        self._components.append(Order.Component(column=ColumnName(name=column), direction=direction))
+        return self
+
+    def limit(self, limit):
+        """Limits the number of returned rows and returns this builder."""
+        self._limit = limit
+        return self
+
+    def skip(self, skip):
+        """Skips rows from the beginning of the result and returns this builder."""
+        self._skip = skip
+        return self
+
+    def build(self):
+        """
+        Builds the query. Parameters are represented by placeholder literals.
+
+        @return: Query message
+        """
+        kwargs = {'from': From(scan=Scan(entity=self._entity))}
+        elements = self._elements or [Projection.ProjectionElement(
+            expression=Expression(column=ColumnName(entity=self._entity, name='*')))]
+        where = None
+        if self._predicates:
+            predicate = self._predicates[0]
+            for other in self._predicates[1:]:
+                predicate = Predicate(**{'and': Predicate.And(p1=predicate, p2=other)})
+            where = Where(predicate=predicate)
+        order = Order(components=self._components) if self._components else None
+        return Query(**kwargs, projection=Projection(op=self._operation, elements=elements), where=where, order=order,
+                     limit=self._limit, skip=self._skip)
+
+    def compile(self):
+        """
+        Compiles the query into a template.
+
+        @return: QueryTemplate
+        """
+        return QueryTemplate(self.build(), self._params)
+
+    def _value(self, value, vector=False):
+        """Creates the expression of a value, a placeholder literal for parameters."""
+        if isinstance(value, Param):
+            if self._params.setdefault(value.name, value) is not value:
+                raise ValueError(f'duplicate parameter {value.name!r}')
+            return Expression(literal=Literal(stringData=_PARAM_MARKER + value.name))
+        if isinstance(value, Literal):
+            return Expression(literal=value)
+        if vector:
+            return Expression(literal=vector_literal(value, Type.FLOAT_VECTOR))
+        return Expression(literal=to_literal(value, infer_type(np.asarray([value]))))
+
+
+class QueryTemplate:
+    """
+    Compiled query with parameters.
+
+    The query is serialized once at compilation into static byte segments and parameter slots. Binding parameters
+    serializes their values and splices them into the static segments, so no message tree is constructed per call.
+    Templates are immutable and safe to share across threads.
+    """
+
+    def __init__(self, query: Query, params):
+        """
+        @param query: query containing placeholder literals of the parameters
+        @param params: dictionary of (parameter name, Param) key-value pairs
+        """
+        self.query = query
+        self.params = dict(params)
+        self._segments = _compile(query)
+
+    def serialize(self, params=None):
+        """
+        Serializes the query with the given parameter values.
+
+        @param params: dictionary of (parameter name, value) key-value pairs, values are Literal or converted
+                       according to the type of the parameter
+        @return: serialized Query message
+        """
+        params = params or {}
+        missing = [name for name in self.params if name not in params]
+        if missing:
+            raise ValueError(f'missing values of parameters {missing}')
+        literals = {}
+        for name, param in self.params.items():
+            value = params[name]
+            if isinstance(value, Literal):
+                literals[name] = value.SerializeToString()
+            elif param.type is None:
+                raise ValueError(f'parameter {name!r} has no type, its value must be a Literal')
+            else:
+                literals[name] = literal_bytes(value, param.type)
+        return _render(self._segments, literals)
+
+    def bind(self, params=None, metadata: RequestMetadata = None):
+        """
+        Binds parameter values and creates the query message.
+
+        @param params: dictionary of (parameter name, value) key-value pairs, see serialize
+        @param metadata: request metadata of the message
+        @return: QueryMessage
+        """
+        query = self.serialize(params)
+        data = _QUERY_TAG + _varint(len(query)) + query
+        if metadata is not None:
+            serialized = metadata.SerializeToString()
+            data = _METADATA_TAG + _varint(len(serialized)) + serialized + data
+        return QueryMessage.FromString(data)
+
+
+def _compile(message):
+    """
+    Splits the serialization of a message into a list of static bytes, parameter slots (tag, parameter name) and
+    nested messages containing parameters (tag, list of segments). Fields are serialized one by one, which is valid
+    as fields may appear in any order.
+    """
+    segments = []
+    for field, value in message.ListFields():
+        values = value if _is_repeated(field) else [value]
+        if field.message_type is None or not any(_has_param(v) for v in values):
+            partial = type(message)()
+            if _is_repeated(field):
+                getattr(partial, field.name).extend(value)
+            elif field.message_type is not None:
+                getattr(partial, field.name).CopyFrom(value)
+            else:
+                setattr(partial, field.name, value)
+            _append(segments, partial.SerializeToString())
+            continue
+        tag = _varint(field.number << 3 | 2)
+        for v in values:
+            if isinstance(v, Literal) and v.WhichOneof('data') == 'stringData' and \
+                    v.stringData.startswith(_PARAM_MARKER):
+                segments.append((tag, v.stringData[len(_PARAM_MARKER):]))
+            elif _has_param(v):
+                segments.append((tag, _compile(v)))
+            else:
+                serialized = v.SerializeToString()
+                _append(segments, tag + _varint(len(serialized)) + serialized)
+    return segments
+
+
+def _render(segments, literals):
+    parts = []
+    for segment in segments:
+        if isinstance(segment, bytes):
+            parts.append(segment)
+            continue
+        tag, content = segment
+        data = literals[content] if isinstance(content, str) else _render(content, literals)
+        parts.append(tag + _varint(len(data)) + data)
+    return b''.join(parts)
+
+
+def _append(segments, data):
+    if segments and isinstance(segments[-1], bytes):
+        segments[-1] += data
+    else:
+        segments.append(data)
+
+
+def _is_repeated(field):
+    # Protocol buffers 6 replaced the label of field descriptors by is_repeated
+    if hasattr(field, 'is_repeated'):
+        return field.is_repeated
+    return field.label == field.LABEL_REPEATED
+
+
+def _has_param(message):
+    return _PARAM_MARKER.encode('utf-8') in message.SerializeToString()
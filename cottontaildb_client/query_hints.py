@@ -0,0 +1,94 @@
+from .cottontail_pb2 import IndexType, RequestMetadata
+
+
+def query_hints(parallelism=None, index=None, index_type=None, disallow_index=False, weight_io=None, weight_cpu=None,
+                weight_memory=None, weight_accuracy=None, no_optimise=None):
+    """
+    Creates hints for the query planner of Cottontail DB. Arguments that are None leave the choice to the planner.
+
+    Hints are passed to queries with the hints keyword argument or as client defaults, e.g. to force a PQ index for a
+    latency-critical search and to cap the parallelism of a background scan:
+    client.nns('schema', 'entity', query_vector, limit=10, hints=query_hints(index_type=IndexType.PQ))
+    client.query('schema', 'entity', projection, None, hints=query_hints(parallelism=2))
+
+    @param parallelism: maximum number of workers executing the query
+    @param index: name of the index to use, or to avoid if disallow_index
+    @param index_type: type of index to use, or to avoid if disallow_index, as IndexType or its name
+    @param disallow_index: if the given index or index type must not be used instead of being preferred
+    @param weight_io: weight of the I/O cost in the cost policy of the planner
+    @param weight_cpu: weight of the CPU cost in the cost policy of the planner
+    @param weight_memory: weight of the memory cost in the cost policy of the planner
+    @param weight_accuracy: weight of the accuracy loss in the cost policy of the planner
+    @param no_optimise: if the query is executed as given without optimisation by the planner. Unlike the other
+                        hints, an unset value cannot be told apart from False, so hints of a call always replace the
+                        no_optimise setting of the client defaults.
+    @return: RequestMetadata holding the hints
+    """
+    metadata = RequestMetadata()
+    if parallelism is not None:
+        if not _is_int(parallelism) or parallelism < 1:
+            raise ValueError(f'parallelism must be a positive integer, got {parallelism!r}')
+        metadata.parallelHint.limit = parallelism
+    if index is not None or index_type is not None:
+        if index is not None and not isinstance(index, str):
+            raise ValueError(f'index must be an index name, got {index!r}')
+        if not isinstance(disallow_index, bool):
+            raise ValueError(f'disallow_index must be a boolean, got {disallow_index!r}')
+        metadata.indexHint.SetInParent()
+        metadata.indexHint.disallow = disallow_index
+        if index is not None:
+            metadata.indexHint.name = index
+        if index_type is not None:
+            metadata.indexHint.type = _parse_index_type(index_type)
+    elif disallow_index:
+        raise ValueError('disallow_index requires an index or index_type')
+    weights = {'weightIo': weight_io, 'weightCpu': weight_cpu, 'weightMemory': weight_memory,
+               'weightAccuracy': weight_accuracy}
+    if any(weight is not None for weight in weights.values()):
+        for name, weight in weights.items():
+            if weight is not None:
+                if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight < 0:
+                    raise ValueError(f'{name} must be a non-negative number, got {weight!r}')
+                setattr(metadata.policyHint, name, weight)
+        # Set the policy hint even if all given weights are zero
+        metadata.policyHint.SetInParent()
+    if no_optimise is not None:
+        if not isinstance(no_optimise, bool):
+            raise ValueError(f'no_optimise must be a boolean, got {no_optimise!r}')
+        metadata.noOptimiseHint = no_optimise
+    return metadata
+
+
+def merge_hints(metadata: RequestMetadata, *hints: RequestMetadata):
+    """
+    Sets the hints on request metadata. Every hint of a later argument replaces the same hint of earlier ones. The
+    no optimisation flag has no presence in the message, so the flag of the last given hints applies even if False.
+
+    @param metadata: request metadata of a query
+    @param hints: RequestMetadata holding hints as created by query_hints, None values are ignored
+    @return: the given metadata
+    """
+    for source in hints:
+        if source is None:
+            continue
+        if not isinstance(source, RequestMetadata):
+            raise ValueError(f'hints must be created with query_hints, got {source!r}')
+        for name in ('parallelHint', 'indexHint', 'policyHint'):
+            if source.HasField(name):
+                getattr(metadata, name).CopyFrom(getattr(source, name))
+        metadata.noOptimiseHint = source.noOptimiseHint
+    return metadata
+
+
+def _parse_index_type(index_type):
+    if isinstance(index_type, str):
+        if index_type.upper() not in IndexType.keys():
+            raise ValueError(f'unknown index type {index_type!r}, expected one of {IndexType.keys()}')
+        return IndexType.Value(index_type.upper())
+    if index_type not in IndexType.values():
+        raise ValueError(f'unknown index type {index_type!r}, expected one of {IndexType.keys()}')
+    return index_type
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
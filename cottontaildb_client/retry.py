@@ -0,0 +1,341 @@
+import random
+import threading
+import time
+
+import grpc
+
+from .errors import CircuitOpenError
+
+# Calls that only read and can be repeated without side effects
+IDEMPOTENT_METHODS = frozenset({
+    'Ping', 'Query', 'Explain', 'ListSchemas', 'ListEntities', 'EntityDetails', 'EntityStatistics', 'ListTransactions',
+    'ListLocks'
+})
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class RetryPolicy:
+    """
+    Retry policy for idempotent calls with jittered exponential backoff and a retry budget.
+
+    The delay before retry n is drawn uniformly from [0, min(max_backoff, initial_backoff * multiplier ** (n - 1))].
+    The retry budget is a token bucket holding up to budget_burst tokens, every call deposits budget_ratio tokens and
+    every retry takes one, so retries add at most a budget_ratio share of load once the burst is spent.
+    """
+
+    def __init__(self, max_attempts=4, initial_backoff=0.05, max_backoff=2.0, multiplier=2.0,
+                 retryable_codes=(grpc.StatusCode.UNAVAILABLE,), budget_ratio=0.2, budget_burst=10):
+        """
+        @param max_attempts: maximum number of attempts of a call including the first
+        @param initial_backoff: maximum delay before the first retry in seconds
+        @param max_backoff: upper bound of the maximum delay in seconds
+        @param multiplier: growth factor of the maximum delay per retry
+        @param retryable_codes: status codes of failed calls that are retried
+        @param budget_ratio: tokens deposited into the retry budget per call
+        @param budget_burst: initial and maximum number of tokens of the retry budget
+        """
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        if initial_backoff <= 0 or max_backoff < initial_backoff:
+            raise ValueError('backoffs must be positive and max_backoff at least initial_backoff')
+        if multiplier < 1:
+            raise ValueError('multiplier must be at least 1')
+        if budget_ratio < 0 or budget_burst < 0:
+            raise ValueError('retry budget must not be negative')
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.retryable_codes = frozenset(retryable_codes)
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+
+    def backoff(self, attempt):
+        """Returns the delay in seconds before the retry following the given attempt."""
+        return random.uniform(0, min(self.max_backoff, self.initial_backoff * self.multiplier ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of an endpoint.
+
+    After failure_threshold consecutive failed calls the circuit opens and calls fail fast with CircuitOpenError
+    without being sent. After reset_timeout seconds a single trial call is let through (half open), which closes the
+    circuit on success or opens it again on failure.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=5.0,
+                 failure_codes=(grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)):
+        """
+        @param failure_threshold: number of consecutive failures opening the circuit
+        @param reset_timeout: time in seconds after which an open circuit lets a trial call through
+        @param failure_codes: status codes of failed calls counted as endpoint failures
+        """
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1')
+        if reset_timeout <= 0:
+            raise ValueError('reset_timeout must be positive')
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_codes = frozenset(failure_codes)
+        self._state = CLOSED
+        self._failures = 0
+        self._opened = 0.0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """Returns whether a call may be sent, letting a single trial call through once the reset timeout passed."""
+        return self._admit() is not None
+
+    def release_trial(self):
+        """Lets another trial call through if the trial call of the half open circuit ended without outcome."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._trial = False
+
+    def _admit(self):
+        # None if the call is rejected, otherwise whether it is the trial call that must be recorded or released
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            if self._state == OPEN and time.monotonic() - self._opened >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._trial = False
+            if self._state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return True
+            return None
+
+    def record(self, error):
+        """Records the outcome of a call, None for success."""
+        with self._lock:
+            if error is None or error.code() not in self.failure_codes:
+                self._state = CLOSED
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened = time.monotonic()
+                self._trial = False
+
+
+class EndpointGuard:
+    """Retry budget, circuit breaker and metrics of one endpoint, shared by all stubs of a client."""
+
+    def __init__(self, endpoint, policy: RetryPolicy = None, breaker: CircuitBreaker = None):
+        """
+        @param endpoint: endpoint address reported in metrics and errors
+        @param policy: retry policy of idempotent calls, no retries if None
+        @param breaker: circuit breaker of the endpoint, never fails fast if None
+        """
+        self.endpoint = endpoint
+        self.policy = policy
+        self.breaker = breaker
+        self._tokens = policy.budget_burst if policy is not None else 0
+        self._lock = threading.Lock()
+        self._metrics = {'calls': 0, 'failures': 0, 'retries': 0, 'rejected': 0, 'budget_exhausted': 0}
+
+    def metrics(self):
+        """
+        @return: dictionary of the 'endpoint', the 'circuit' state and the numbers of 'calls', failed calls
+                 ('failures'), 'retries', calls 'rejected' by the open circuit and retries denied by the exhausted
+                 retry budget ('budget_exhausted')
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics['endpoint'] = self.endpoint
+        metrics['circuit'] = self.breaker.state if self.breaker is not None else None
+        return metrics
+
+    def start(self):
+        """Counts a new call and deposits into the retry budget."""
+        with self._lock:
+            self._metrics['calls'] += 1
+            if self.policy is not None:
+                self._tokens = min(self.policy.budget_burst, self._tokens + self.policy.budget_ratio)
+
+    def check(self):
+        """
+        Raises CircuitOpenError if the circuit is open.
+
+        @return: True if the call is the trial call of the half open circuit, which must be recorded or released
+        """
+        if self.breaker is None:
+            return False
+        trial = self.breaker._admit()
+        if trial is None:
+            with self._lock:
+                self._metrics['rejected'] += 1
+            raise CircuitOpenError(self.endpoint)
+        return trial
+
+    def release(self, trial):
+        """Releases the trial call of the half open circuit if the call ended without outcome, e.g. was cancelled."""
+        if trial and self.breaker is not None:
+            self.breaker.release_trial()
+
+    def record(self, error):
+        """Records the outcome of an attempt, None for success."""
+        if error is not None:
+            with self._lock:
+                self._metrics['failures'] += 1
+        if self.breaker is not None:
+            self.breaker.record(error)
+
+    def retry(self, error, attempt):
+        """
+        Decides if a failed attempt of an idempotent call is retried and waits for the backoff delay if so.
+
+        @param error: error of the failed attempt
+        @param attempt: number of the failed attempt, starting at 1
+        @return: True if the call should be retried
+        """
+        policy = self.policy
+        if policy is None or attempt >= policy.max_attempts or error.code() not in policy.retryable_codes:
+            return False
+        with self._lock:
+            if self._tokens < 1:
+                self._metrics['budget_exhausted'] += 1
+                return False
+            self._tokens -= 1
+            self._metrics['retries'] += 1
+        time.sleep(policy.backoff(attempt))
+        return True
+
+
+class GuardedStub:
+    """Stub proxy applying the circuit breaker to all calls and the retry policy to idempotent calls."""
+
+    def __init__(self, stub, guard: EndpointGuard):
+        self._stub = stub
+        self._guard = guard
+
+    def __getattr__(self, name):
+        method = _GuardedMethod(getattr(self._stub, name), self._guard, name in IDEMPOTENT_METHODS)
+        setattr(self, name, method)
+        return method
+
+
+class _GuardedMethod:
+
+    def __init__(self, method, guard, idempotent):
+        self._method = method
+        self._guard = guard
+        self._idempotent = idempotent
+
+    def __call__(self, request, *args, **kwargs):
+        guard = self._guard
+        guard.start()
+        attempt = 1
+        while True:
+            trial = guard.check()
+            try:
+                result = self._method(request, *args, **kwargs)
+            except grpc.RpcError as error:
+                guard.record(error)
+                if self._idempotent and guard.retry(error, attempt):
+                    attempt += 1
+                    continue
+                raise
+            except BaseException:
+                guard.release(trial)
+                raise
+            if isinstance(result, grpc.Future):
+                # Response streams report their outcome once their first response arrives or they fail
+                return _GuardedStream(result, lambda: self._method(request, *args, **kwargs), guard, self._idempotent,
+                                      trial)
+            guard.record(None)
+            return result
+
+    def future(self, request, *args, **kwargs):
+        self._guard.start()
+        trial = self._guard.check()
+        try:
+            future = self._method.future(request, *args, **kwargs)
+        except BaseException:
+            self._guard.release(trial)
+            raise
+        future.add_done_callback(lambda done: self._record(done, trial))
+        return future
+
+    def _record(self, future, trial):
+        if future.cancelled():
+            self._guard.release(trial)
+        else:
+            error = future.exception()
+            self._guard.record(error if isinstance(error, grpc.RpcError) else None)
+
+
+class _GuardedStream:
+    """
+    Response iterator of a streaming call that is reissued if it fails with a retryable error before responding.
+
+    A trial call of the half open circuit that is cancelled or dropped before its outcome is known releases the trial.
+    """
+
+    def __init__(self, call, invoke, guard, idempotent, trial=False):
+        self._call = call
+        self._invoke = invoke
+        self._guard = guard
+        self._idempotent = idempotent
+        self._trial = trial
+        self._attempt = 1
+        self._responded = False
+        self._cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            try:
+                response = next(self._call)
+            except StopIteration:
+                self._record(None)
+                raise
+            except grpc.RpcError as error:
+                if self._responded or self._cancelled:
+                    raise
+                self._trial = False
+                self._guard.record(error)
+                if not self._idempotent or not self._guard.retry(error, self._attempt):
+                    raise
+                self._attempt += 1
+                self._trial = self._guard.check()
+                self._call = self._invoke()
+                if self._cancelled:
+                    self._call.cancel()
+                continue
+            self._record(None)
+            return response
+
+    def cancel(self):
+        self._cancelled = True
+        self._release()
+        return self._call.cancel()
+
+    def __del__(self):
+        self._release()
+
+    def _record(self, error):
+        if not self._responded:
+            self._responded = True
+            self._trial = False
+            self._guard.record(error)
+
+    def _release(self):
+        if self._trial and not self._responded:
+            self._trial = False
+            self._guard.release(True)
@@ -0,0 +1,89 @@
+import random
+from collections import namedtuple
+from math import sqrt
+from statistics import NormalDist
+
+import numpy as np
+
+from .cottontail_pb2 import SchemaName, EntityName, From, Sample
+
+# Estimate of an aggregate with the bounds of its confidence interval
+Estimate = namedtuple('Estimate', ['value', 'lower', 'upper'])
+
+
+def sample_from(schema, entity, probability, seed=None):
+    """
+    Creates the from clause of a random sample of an entity. Every row is included with the given probability.
+
+    @param schema: name of the entity's schema
+    @param entity: entity name
+    @param probability: probability of a row being sampled, in (0, 1]
+    @param seed: seed of the sample, random if None. Equal seeds select equal samples of an unchanged entity.
+    @return: From message
+    """
+    if not 0 < probability <= 1:
+        raise ValueError(f'sample probability must be in (0, 1], got {probability}')
+    if seed is None:
+        seed = random.getrandbits(63)
+    entity_name = EntityName(schema=SchemaName(name=schema), name=entity)
+    return From(sample=Sample(entity=entity_name, seed=seed, probability=probability))
+
+
+def estimate_count(sample_count, probability, confidence=0.95):
+    """
+    Estimates the number of rows of an entity from the number of rows of a sample.
+
+    @param sample_count: number of sampled rows
+    @param probability: sample probability
+    @param confidence: confidence level of the interval
+    @return: Estimate
+    """
+    count = sample_count / probability
+    error = _z(confidence) * sqrt(sample_count * (1 - probability)) / probability
+    return Estimate(count, max(count - error, sample_count), count + error)
+
+
+def estimate_sum(values, probability, confidence=0.95):
+    """
+    Estimates the sum of a column from its sampled values (Horvitz-Thompson estimator).
+
+    @param values: sampled values, null values are ignored if given as masked array
+    @param probability: sample probability
+    @param confidence: confidence level of the interval
+    @return: Estimate
+    """
+    values = _values(values)
+    total = float(values.sum()) / probability
+    error = _z(confidence) * sqrt((1 - probability) * float(np.square(values).sum())) / probability
+    return Estimate(total, total - error, total + error)
+
+
+def estimate_mean(values, probability, confidence=0.95):
+    """
+    Estimates the mean of a column from its sampled values.
+
+    @param values: sampled values, null values are ignored if given as masked array
+    @param probability: sample probability
+    @param confidence: confidence level of the interval
+    @return: Estimate, with nan values for samples without values
+    """
+    values = _values(values)
+    if len(values) == 0:
+        return Estimate(float('nan'), float('nan'), float('nan'))
+    mean = float(values.mean())
+    deviation = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+    # Finite population correction of a sample containing the expected fraction of the rows
+    error = _z(confidence) * deviation * sqrt((1 - probability) / len(values))
+    return Estimate(mean, mean - error, mean + error)
+
+
+def _values(values):
+    if np.ma.isMaskedArray(values):
+        values = values.compressed()
+    return np.asarray(values, dtype=np.float64)
+
+
+def _z(confidence):
+    if not 0 < confidence < 1:
+        raise ValueError(f'confidence must be in (0, 1), got {confidence}')
+    return NormalDist().inv_cdf((1 + confidence) / 2)
@@ -0,0 +1,88 @@
+import threading
+from queue import Queue, Empty
+
+# Largest tuple id, the end of the last partition such that rows appended after the row count was read are included
+MAX_TUPLE_ID = 2 ** 63 - 1
+
+# Marks the end of a partition in the batch queues
+_DONE = object()
+
+
+def scan_ranges(rows, partitions):
+    """
+    Splits the tuple id range of an entity into contiguous ranges of about equal size.
+
+    Tuple ids are assumed to be dense from 0, the last range is open-ended to include ids beyond the row count, e.g.
+    of rows inserted after deletions.
+
+    @param rows: number of rows of the entity
+    @param partitions: maximum number of ranges, fewer are returned for entities with fewer rows
+    @return: list of (start, end) pairs of the ranges, start inclusive and end exclusive
+    """
+    if partitions < 1:
+        raise ValueError(f'partitions must be at least 1, got {partitions}')
+    partitions = max(1, min(partitions, rows))
+    step = -(-rows // partitions)
+    bounds = [i * step for i in range(partitions)] + [MAX_TUPLE_ID]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def merge_partitions(streams, ordered=True, max_buffered=8):
+    """
+    Consumes the streams of partitions concurrently, one thread per stream, and yields their items.
+
+    Closing the generator cancels the streams that are not exhausted.
+
+    @param streams: list of ResponseStream of the partitions
+    @param ordered: if True, yields the items of the partitions in the order of the streams, otherwise as they arrive
+    @param max_buffered: maximum number of items buffered per partition, or in total if not ordered
+    @return: generator of items, raising the first error of a partition
+    """
+    if ordered:
+        queues = [Queue(maxsize=max_buffered) for _ in streams]
+    else:
+        queues = [Queue(maxsize=max_buffered)] * len(streams)
+    stop = threading.Event()
+
+    def consume(stream, queue):
+        try:
+            for item in stream:
+                if stop.is_set():
+                    return
+                queue.put(item)
+        except Exception as error:
+            if not stop.is_set():
+                queue.put(error)
+            return
+        queue.put(_DONE)
+
+    threads = [threading.Thread(target=consume, args=(stream, queue), name=f'ParallelScan-{i}', daemon=True)
+               for i, (stream, queue) in enumerate(zip(streams, queues))]
+    for thread in threads:
+        thread.start()
+    try:
+        pending = len(streams)
+        index = 0
+        while pending:
+            item = queues[index].get()
+            if item is _DONE:
+                pending -= 1
+                if ordered:
+                    index += 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        for stream in streams:
+            stream.cancel()
+        # Unblocks consumers waiting for space in a full queue
+        while any(thread.is_alive() for thread in threads):
+            for queue in set(queues):
+                try:
+                    while True:
+                        queue.get_nowait()
+                except Empty:
+                    pass
+            threads[0].join(0.01)
@@ -0,0 +1,283 @@
+import heapq
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+
+import numpy as np
+
+from .cottontail_pb2 import Literal, Order
+from .cottontaildb_client import CottontailDBClient, NNSBatchResult
+
+
+def hash_partitioner(key, shards):
+    """
+    Default partitioning rule assigning keys to shards by a hash of their string representation that is stable across
+    processes.
+
+    @param key: partition key value
+    @param shards: number of shards
+    @return: shard index
+    """
+    return zlib.crc32(str(key).encode('utf-8')) % shards
+
+
+class ShardedCottontailClient:
+    """
+    Client for an entity sharded across several Cottontail DB instances.
+
+    Queries and nearest neighbour searches run concurrently on all shards and the per-shard results are merged
+    according to the query order, such that the result equals that of a single instance holding all rows. Inserts
+    are routed to one shard by the value of the partition column, updates, deletes and data definition statements are
+    sent to all shards.
+
+    Example usage:
+    with ShardedCottontailClient([('node1', 1865), ('node2', 1865)], partition_column='id') as client:
+        client.insert_arrays('schema', 'entity', {'id': ids, 'feature': features})
+        neighbours = client.nns('schema', 'entity', query_vector, limit=10)
+    """
+
+    def __init__(self, endpoints, partition_column='id', partitioner=hash_partitioner, **client_kwargs):
+        """
+        @param endpoints: list of (host, port) pairs of the shards
+        @param partition_column: name of the column whose values route inserted rows to shards
+        @param partitioner: function mapping a partition key value and the number of shards to a shard index
+        @param client_kwargs: keyword arguments passed to the CottontailDBClient of each shard
+        """
+        if not endpoints:
+            raise ValueError('at least one endpoint is required')
+        self.clients = [CottontailDBClient(host, port, **client_kwargs) for host, port in endpoints]
+        self._partition_column = partition_column
+        self._partitioner = partitioner
+        self._executor = None
+
+    def __enter__(self):
+        entered = []
+        try:
+            for client in self.clients:
+                client.__enter__()
+                entered.append(client)
+        except Exception:
+            for client in entered:
+                client.close()
+            raise
+        self._executor = ThreadPoolExecutor(max_workers=len(self.clients), thread_name_prefix='ShardedClient')
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        for client in self.clients:
+            client.close()
+
+    # Data definition
+
+    def create_schema(self, schema, exist_ok=False):
+        """Creates the schema on all shards."""
+        return self._scatter('create_schema', schema, exist_ok)
+
+    def drop_schema(self, schema):
+        """Drops the schema on all shards."""
+        return self._scatter('drop_schema', schema)
+
+    def create_entity(self, schema, entity, columns, exist_ok=False):
+        """Creates the entity on all shards."""
+        return self._scatter('create_entity', schema, entity, columns, exist_ok)
+
+    def drop_entity(self, schema, entity, not_exist_ok=True):
+        """Drops the entity on all shards."""
+        return self._scatter('drop_entity', schema, entity, not_exist_ok)
+
+    def truncate_entity(self, schema, entity, not_exist_ok=True):
+        """Truncates the entity on all shards."""
+        return self._scatter('truncate_entity', schema, entity, not_exist_ok)
+
+    def create_index(self, schema, entity, index, index_type, columns, params=None):
+        """Creates the index on all shards."""
+        return self._scatter('create_index', schema, entity, index, index_type, columns, params)
+
+    def drop_index(self, schema, entity, index):
+        """Drops the index on all shards."""
+        return self._scatter('drop_index', schema, entity, index)
+
+    def rebuild_index(self, schema, entity, index):
+        """Rebuilds the index on all shards."""
+        return self._scatter('rebuild_index', schema, entity, index)
+
+    # Data management
+
+    def insert(self, schema, entity, values):
+        """
+        Inserts column values into the shard selected by the value of the partition column.
+
+        @param schema: name of the entity's schema
+        @param entity: entity name
+        @param values: dictionary of (column name, Literal value) key-value pairs
+        @return: query response message
+        """
+        shard = self._shard(values[self._partition_column])
+        return self.clients[shard].insert(schema, entity, values)
+
+    def insert_batch(self, schema, entity, columns, values, **kwargs):
+        """
+        Inserts rows of Literal values in a batch per shard, see CottontailDBClient.insert_batch. The batches of all
+        shards are sent concurrently.
+
+        @return: list of chunk reports of each shard
+        """
+        key_index = list(columns).index(self._partition_column)
+        rows = [[] for _ in self.clients]
+        for row in values:
+            rows[self._shard(row[key_index])].append(row)
+        arguments = [(schema, entity, columns, shard_rows) if shard_rows else None for shard_rows in rows]
+        return self._scatter_per_shard('insert_batch', arguments, kwargs)
+
+    def insert_arrays(self, schema, entity, columns, types=None, **kwargs):
+        """
+        Inserts columns of values in a batch per shard, see CottontailDBClient.insert_arrays. The batches of all shards
+        are sent concurrently.
+
+        @return: list of chunk reports of each shard
+        """
+        keys = columns[self._partition_column]
+        shards = np.fromiter((self._shard(key) for key in keys), dtype=np.intp, count=len(keys))
+        arguments = []
+        for shard in range(len(self.clients)):
+            rows = np.flatnonzero(shards == shard)
+            if len(rows) == 0:
+                arguments.append(None)
+                continue
+            arguments.append((schema, entity, {name: _take(values, rows) for name, values in columns.items()}, types))
+        return self._scatter_per_shard('insert_arrays', arguments, kwargs)
+
+    def update(self, schema, entity, where, updates):
+        """Updates the selected rows on all shards."""
+        return self._scatter('update', schema, entity, where, updates)
+
+    def delete(self, schema, entity, where):
+        """Deletes the selected rows on all shards."""
+        return self._scatter('delete', schema, entity, where)
+
+    # Data query
+
+    def ping(self):
+        """Pings all shards. If method returns without exception all shards are connected."""
+        self._scatter('ping')
+
+    def metrics(self):
+        """Returns the retry and circuit breaker metrics of each shard, see CottontailDBClient.metrics."""
+        return [client.metrics() for client in self.clients]
+
+    def nns(self, schema, entity, query_vector, distance='manhattan', limit=None, vector_col='feature', id_col='id',
+            **kwargs):
+        """
+        Queries all shards with the given vector and merges the per-shard nearest neighbours by distance, see
+        CottontailDBClient.nns.
+
+        @return: list of the limit nearest rows of all shards ordered by distance
+        """
+        results = self._scatter('nns', schema, entity, query_vector, distance, limit, vector_col, id_col, **kwargs)
+        merged = heapq.merge(*results, key=lambda row: row['distance'])
+        return list(islice(merged, limit))
+
+    def nns_batch(self, schema, entity, query_vectors, k, distance='manhattan', vector_col='feature', id_col='id',
+                  **kwargs):
+        """
+        Queries the k nearest neighbours of each of the given vectors on all shards and merges the per-shard
+        neighbours of each row by distance, see CottontailDBClient.nns_batch. Rows whose query failed on any shard
+        remain padded.
+
+        @return: NNSBatchResult of ids as object array, distances and errors
+        """
+        results = self._scatter('nns_batch', schema, entity, query_vectors, k, distance, vector_col, id_col, **kwargs)
+        ids = np.concatenate([result.ids.astype(object) for result in results], axis=1)
+        distances = np.concatenate([result.distances for result in results], axis=1)
+        # NaN padding sorts last
+        nearest = np.argsort(distances, axis=1, kind='stable')[:, :k]
+        ids = np.take_along_axis(ids, nearest, axis=1)
+        distances = np.take_along_axis(distances, nearest, axis=1)
+        errors = {}
+        for result in results:
+            for row, error in result.errors.items():
+                errors.setdefault(row, error)
+        for row in errors:
+            ids[row] = None
+            distances[row] = np.nan
+        return NNSBatchResult(ids, distances, errors)
+
+    def query(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None, **kwargs):
+        """
+        Queries all shards and merges the results, see CottontailDBClient.query.
+
+        Every shard returns up to limit + skip rows in the given order, which are merged into one ordered result before
+        skip and limit are applied. Without order the results of the shards are concatenated.
+
+        @return: list of result rows
+        """
+        shard_limit = None if limit is None else limit + (skip or 0)
+        results = self._scatter('query', schema, entity, projection, where, order, shard_limit, None, from_, **kwargs)
+        merged = merge_ordered(results, order) if order is not None else chain.from_iterable(results)
+        stop = None if limit is None else (skip or 0) + limit
+        return list(islice(merged, skip or 0, stop))
+
+    def _shard(self, key):
+        if isinstance(key, Literal):
+            key = CottontailDBClient._parse_literal(key)
+        elif isinstance(key, np.generic):
+            key = key.item()
+        shard = self._partitioner(key, len(self.clients))
+        if not 0 <= shard < len(self.clients):
+            raise ValueError(f'partitioner returned shard {shard} for {len(self.clients)} shards')
+        return shard
+
+    def _scatter(self, method, *args, **kwargs):
+        """Calls a method with the same arguments on all shards concurrently and returns the results in shard order."""
+        futures = [self._executor.submit(getattr(client, method), *args, **kwargs) for client in self.clients]
+        return [future.result() for future in futures]
+
+    def _scatter_per_shard(self, method, arguments, kwargs):
+        """
+        Calls a method with per-shard arguments on all shards concurrently and returns the results in shard order.
+        Shards without arguments are skipped and get an empty result.
+        """
+        futures = [self._executor.submit(getattr(client, method), *args, **kwargs) if args is not None else None
+                   for client, args in zip(self.clients, arguments)]
+        return [future.result() if future is not None else [] for future in futures]
+
+
+def merge_ordered(results, order: Order):
+    """
+    Merges lists of rows that are each sorted by the given order into one sorted iterable. Null values are ordered
+    last.
+
+    @param results: lists of rows, either dictionaries or named tuples
+    @param order: order of the rows
+    @return: iterable of merged rows
+    """
+    components = [(c.column.name, c.direction == Order.Direction.DESCENDING) for c in order.components]
+    directions = {descending for _, descending in components}
+    if len(directions) == 1:
+        names = [name for name, _ in components]
+        descending = directions.pop()
+        return heapq.merge(*results, key=lambda row: tuple(_sort_value(row, name, descending) for name in names),
+                           reverse=descending)
+    # Mixed directions, sort by each component from last to first relying on the stability of sorted
+    rows = list(chain.from_iterable(results))
+    for name, descending in reversed(components):
+        rows.sort(key=lambda row: _sort_value(row, name, descending), reverse=descending)
+    return rows
+
+
+def _sort_value(row, name, descending):
+    value = row[name] if isinstance(row, dict) else getattr(row, name)
+    # Nulls compare greater than all values in ascending and less than all values in descending order
+    return (value is None) != descending, value
+
+
+def _take(values, rows):
+    if isinstance(values, np.ndarray):
+        return values[rows]
+    return [values[i] for i in rows]
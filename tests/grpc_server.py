@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import grpc
+
+from cottontaildb_client.cottontail_pb2_grpc import DDLServicer, DMLServicer, TXNServicer, DQLServicer, \
+    add_DDLServicer_to_server, add_DMLServicer_to_server, add_TXNServicer_to_server, add_DQLServicer_to_server
+
+# Registration functions by service base class
+_SERVICES = (
+    (DDLServicer, add_DDLServicer_to_server),
+    (DMLServicer, add_DMLServicer_to_server),
+    (TXNServicer, add_TXNServicer_to_server),
+    (DQLServicer, add_DQLServicer_to_server),
+)
+
+
+def start_server(*servicers, max_workers=4):
+    """
+    Starts an in-process gRPC server on a free local port.
+
+    @param servicers: servicer instances, each registered for the service it implements
+    @param max_workers: number of threads handling calls
+    @return: tuple of the started server and its port
+    """
+    server = grpc.server(ThreadPoolExecutor(max_workers=max_workers))
+    for servicer in servicers:
+        registered = [add(servicer, server) for base, add in _SERVICES if isinstance(servicer, base)]
+        if not registered:
+            raise ValueError(f'{type(servicer).__name__} does not implement a Cottontail DB service')
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    return server, port
+
+
+class ServerTestCase(TestCase):
+    """Test case serving fake Cottontail DB services from in-process gRPC servers."""
+
+    def serve(self, *servicers, max_workers=4):
+        """
+        Starts a server for the servicers that is stopped at the end of the test.
+
+        @param servicers: servicer instances, each registered for the service it implements
+        @param max_workers: number of threads handling calls
+        @return: port of the server
+        """
+        server, port = start_server(*servicers, max_workers=max_workers)
+        self.addCleanup(server.stop, None)
+        return port
@@ -0,0 +1,67 @@
+from unittest import TestCase, skipIf
+
+from cottontaildb_client import CottontailDBClient, column_def, Type, Literal, float_vector
+from cottontaildb_client.arrow import pa, record_batch
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage, Null, Uuid, Complex64
+
+
+def _response(columns, rows):
+    return QueryResponseMessage(columns=columns, tuples=[QueryResponseMessage.Tuple(data=row) for row in rows])
+
+
+@skipIf(pa is None, 'pyarrow is not installed')
+class TestArrow(TestCase):
+
+    def test_record_batch(self):
+        columns = [
+            column_def('id', Type.STRING),
+            column_def('value', Type.INTEGER, nullable=True),
+            column_def('feature', Type.FLOAT_VECTOR, length=2),
+            column_def('date', Type.DATE)
+        ]
+        rows = [
+            [Literal(stringData='a'), Literal(intData=1), float_vector(0.5, 1.0), Literal(dateData=0)],
+            [Literal(stringData='b'), Literal(nullData=Null(type=Type.INTEGER)), float_vector(1.5, 2.0),
+             Literal(dateData=1000)]
+        ]
+        batch = record_batch(_response(columns, rows), CottontailDBClient._parse_literal)
+        self.assertEqual(batch.num_rows, 2)
+        self.assertEqual(batch.schema.field('id').type, pa.string())
+        self.assertEqual(batch.schema.field('feature').type, pa.list_(pa.float32(), 2))
+        self.assertEqual(batch.column(1).to_pylist(), [1, None])
+        self.assertEqual(batch.column(2).to_pylist(), [[0.5, 1.0], [1.5, 2.0]])
+        self.assertEqual(batch.column(3).type, pa.timestamp('ms', tz='UTC'))
+
+    def test_record_batch_objects(self):
+        columns = [
+            column_def('uuid', Type.UUID),
+            column_def('complex', Type.COMPLEX64),
+            column_def('feature', Type.FLOAT_VECTOR, length=2, nullable=True)
+        ]
+        rows = [
+            [Literal(uuidData=Uuid(mostSignificant=0, leastSignificant=1)),
+             Literal(complex64Data=Complex64(real=1.0, imaginary=2.0)), Literal(nullData=Null())],
+            [Literal(uuidData=Uuid(mostSignificant=0, leastSignificant=2)),
+             Literal(complex64Data=Complex64(real=0.0, imaginary=-1.0)), float_vector(1.0, 2.0)]
+        ]
+        batch = record_batch(_response(columns, rows), CottontailDBClient._parse_literal)
+        self.assertEqual(batch.column(0).to_pylist()[0], '00000000-0000-0000-0000-000000000001')
+        self.assertEqual(batch.column(1).to_pylist()[1], {'real': 0.0, 'imaginary': -1.0})
+        self.assertEqual(batch.column(2).to_pylist(), [None, [1.0, 2.0]])
+
+    def test_record_batch_undeclared_length(self):
+        columns = [column_def('feature', Type.FLOAT_VECTOR), column_def('other', Type.DOUBLE_VECTOR, nullable=True)]
+        rows = [[float_vector(0.5, 1.0), Literal(nullData=Null())], [float_vector(1.5, 2.0), Literal(nullData=Null())]]
+        batch = record_batch(_response(columns, rows), CottontailDBClient._parse_literal)
+        self.assertEqual(batch.schema.field('feature').type, pa.list_(pa.float32()))
+        self.assertEqual(batch.column(0).to_pylist(), [[0.5, 1.0], [1.5, 2.0]])
+        self.assertEqual(batch.column(1).to_pylist(), [None, None])
+        empty = record_batch(_response(columns, []), CottontailDBClient._parse_literal)
+        self.assertEqual(empty.schema, batch.schema)
+        self.assertEqual(empty.num_rows, 0)
+
+    def test_empty_record_batch(self):
+        columns = [column_def('feature', Type.DOUBLE_VECTOR, length=3)]
+        batch = record_batch(_response(columns, []), CottontailDBClient._parse_literal)
+        self.assertEqual(batch.num_rows, 0)
+        self.assertEqual(batch.schema.field('feature').type, pa.list_(pa.float64(), 3))
@@ -0,0 +1,113 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+import numpy as np
+
+from cottontaildb_client import AsyncCottontailDBClient, column_def, Type, Literal
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage
+
+
+class _FakeCall:
+    """Async iterable standing in for a server streaming grpc.aio call."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.cancelled = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for response in self.responses:
+            await asyncio.sleep(0)
+            yield response
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _FakeDQL:
+    def __init__(self, responses):
+        self.call = _FakeCall(responses)
+        self.messages = []
+
+    def Query(self, message):
+        self.messages.append(message)
+        return self.call
+
+
+class _FakeDML:
+    def __init__(self):
+        self.messages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def InsertBatch(self, message):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.messages.append(message)
+
+
+def _response(start, count):
+    columns = [column_def('id', Type.INTEGER)]
+    tuples = [QueryResponseMessage.Tuple(data=[Literal(intData=i)]) for i in range(start, start + count)]
+    return QueryResponseMessage(columns=columns, tuples=tuples)
+
+
+class TestAsyncClient(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.client = AsyncCottontailDBClient('localhost', 1865)
+
+    async def test_query(self):
+        self.client._dql = _FakeDQL([_response(0, 2), _response(2, 3)])
+        rows = [row async for row in self.client.query('schema', 'entity', None, None, limit=5)]
+        self.assertEqual([row['id'] for row in rows], [0, 1, 2, 3, 4])
+        self.assertEqual(self.client._dql.messages[0].query.limit, 5)
+
+    async def test_query_batches_compact(self):
+        self.client._dql = _FakeDQL([_response(0, 2), _response(2, 1)])
+        batches = [b async for b in self.client.query('schema', 'entity', None, None, batches=True, compact=True)]
+        self.assertEqual([[row.id for row in batch] for batch in batches], [[0, 1], [2]])
+
+    async def test_query_cancelled_on_close(self):
+        self.client._dql = _FakeDQL([_response(0, 2), _response(2, 2)])
+        rows = self.client.query('schema', 'entity', None, None)
+        self.assertEqual((await rows.__anext__())['id'], 0)
+        await rows.aclose()
+        self.assertTrue(self.client._dql.call.cancelled)
+
+    async def test_query_closed_before_iteration(self):
+        self.client._dql = _FakeDQL([_response(0, 2)])
+        rows = self.client.query('schema', 'entity', None, None)
+        await rows.aclose()
+        self.assertTrue(self.client._dql.call.cancelled)
+        with self.assertRaises(StopAsyncIteration):
+            await rows.__anext__()
+
+    async def test_close_without_enter(self):
+        await self.client.close()
+
+    async def test_insert_arrays(self):
+        self.client._dml = _FakeDML()
+        columns = {'id': np.arange(100, dtype=np.int64), 'feature': np.ones((100, 4), dtype=np.float32)}
+        types = {'id': Type.LONG, 'feature': Type.FLOAT_VECTOR}
+        reports = await self.client.insert_arrays('schema', 'entity', columns, types, max_rows=10, max_in_flight=3)
+        self.assertEqual(len(reports), 10)
+        self.assertEqual(sum(r['rows'] for r in reports), 100)
+        self.assertEqual(self.client._dml.max_in_flight, 3)
+        self.assertEqual(self.client._dml.messages[0].inserts[0].values[0].longData, 0)
+
+    async def test_insert_arrays_entity_types(self):
+        self.client._dml = _FakeDML()
+
+        async def get_entity_details(schema, entity):
+            return {'columns': [{'name': 'warren.schema.entity.flag', 'type': 'BOOLEAN'}]}
+
+        self.client.get_entity_details = get_entity_details
+        await self.client.insert_arrays('schema', 'entity', {'flag': [0, 1], 'score': np.array([0.5, 1.5])})
+        values = self.client._dml.messages[0].inserts[1].values
+        self.assertEqual(values[0], Literal(booleanData=True))
+        self.assertEqual(values[1], Literal(doubleData=1.5))
@@ -0,0 +1,66 @@
+import threading
+import time
+from unittest import TestCase
+
+import numpy as np
+
+from cottontaildb_client import CottontailDBClient, BulkLoader, Type, Literal
+
+
+class _FakeDML:
+    """Records batch insert messages and tracks the maximum number of concurrent calls."""
+
+    def __init__(self, fail_rows=None):
+        self.messages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_rows = fail_rows
+        self._lock = threading.Lock()
+
+    def InsertBatch(self, message):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+            if self.fail_rows is not None and len(message.inserts) == self.fail_rows:
+                raise ValueError('insert failed')
+            self.messages.append(message)
+
+
+class TestBulkLoader(TestCase):
+
+    def setUp(self):
+        self.client = CottontailDBClient('localhost', 1865)
+        self.client._tid = None
+        self.client._dml = _FakeDML()
+
+    def test_submit_arrays(self):
+        types = {'id': Type.STRING, 'feature': Type.FLOAT_VECTOR}
+        with BulkLoader(self.client, 'schema', 'entity', ['id', 'feature'], types=types, max_rows=10, max_in_flight=3,
+                        queue_size=2) as loader:
+            for i in range(5):
+                ids = [f'{i}_{j}' for j in range(20)]
+                loader.submit_arrays({'id': ids, 'feature': np.full((20, 4), i, dtype=np.float32)})
+        self.assertEqual(loader.report['rows'], 100)
+        self.assertEqual(loader.report['batches'], 10)
+        self.assertEqual(loader.report['errors'], [])
+        self.assertEqual(sum(len(m.inserts) for m in self.client._dml.messages), 100)
+        self.assertGreater(self.client._dml.max_in_flight, 1)
+        self.assertLessEqual(self.client._dml.max_in_flight, 3)
+
+    def test_submit_rows_with_errors(self):
+        self.client._dml = _FakeDML(fail_rows=5)
+        loader = BulkLoader(self.client, 'schema', 'entity', ['value'], max_rows=10)
+        loader.submit([[Literal(intData=i)] for i in range(25)])
+        report = loader.close()
+        self.assertEqual(report['rows'], 20)
+        self.assertEqual([e['rows'] for e in report['errors']], [5])
+        with self.assertRaises(Exception):
+            loader.submit([[Literal(intData=0)]])
+
+    def test_submit_arrays_wrong_columns(self):
+        with BulkLoader(self.client, 'schema', 'entity', ['id']) as loader:
+            with self.assertRaises(ValueError):
+                loader.submit_arrays({'value': [1]})
@@ -0,0 +1,183 @@
+import threading
+import time
+from unittest import TestCase
+
+from cottontaildb_client import CottontailDBClient, QueryCache, column_def, Type, Literal
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer, DMLServicer, DDLServicer
+
+from .grpc_server import ServerTestCase
+
+
+class TestQueryCache(TestCase):
+
+    def test_lru_eviction(self):
+        cache = QueryCache(max_bytes=10)
+        cache.put('a', 's.e', 1, 4)
+        cache.put('b', 's.e', 2, 4)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 's.e', 3, 4)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        cache.put('d', 's.e', 4, 11)
+        self.assertIsNone(cache.get('d'))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (3, 2, 1))
+        self.assertEqual((stats['entries'], stats['bytes']), (2, 8))
+
+    def test_ttl(self):
+        cache = QueryCache(ttl=0.05)
+        cache.put('a', 's.e', 1, 1)
+        self.assertEqual(cache.get('a'), 1)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['expirations'], 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate(self):
+        cache = QueryCache()
+        cache.put('a', 's.e', 1, 1)
+        cache.put('b', 's.f', 2, 1)
+        cache.put('c', 't.e', 3, 1)
+        cache.put('d', None, 4, 1)
+        cache.invalidate('s.e')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        cache.invalidate(schema='s')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        cache.invalidate(None)
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual(cache.stats()['invalidations'], 3)
+
+    def test_generation(self):
+        cache = QueryCache()
+        generation = cache.generation('s.e')
+        other = cache.generation('s.f')
+        cache.invalidate('s.e')
+        cache.put('a', 's.e', 1, 1, generation)
+        cache.put('b', 's.f', 2, 1, other)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), 2)
+        cache.invalidate(schema='s')
+        cache.put('c', 's.f', 3, 1, other)
+        self.assertIsNone(cache.get('c'))
+        cache.put('d', 's.f', 4, 1, cache.generation('s.f'))
+        self.assertEqual(cache.get('d'), 4)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            QueryCache(max_bytes=0)
+        with self.assertRaises(ValueError):
+            QueryCache(ttl=0)
+
+
+class _CountingDQL(DQLServicer):
+
+    def __init__(self):
+        self.queries = 0
+        self.started = threading.Event()
+        self.blocked = threading.Event()
+        self.blocked.set()
+
+    def Query(self, request, context):
+        self.queries += 1
+        self.started.set()
+        self.blocked.wait()
+        columns = [column_def('distance', Type.DOUBLE), column_def('id', Type.LONG)]
+        yield QueryResponseMessage(columns=columns, tuples=[
+            QueryResponseMessage.Tuple(data=[Literal(doubleData=0.5), Literal(longData=self.queries)])
+        ])
+
+
+class _DML(DMLServicer):
+
+    def Insert(self, request, context):
+        return QueryResponseMessage()
+
+    def Delete(self, request, context):
+        return QueryResponseMessage()
+
+
+class _CountingDDL(DDLServicer):
+
+    def __init__(self):
+        self.listings = 0
+
+    def ListSchemas(self, request, context):
+        self.listings += 1
+        yield QueryResponseMessage(tuples=[QueryResponseMessage.Tuple(data=[Literal(stringData='warren.schema')])])
+
+    def CreateSchema(self, request, context):
+        return QueryResponseMessage()
+
+
+class TestClientCache(ServerTestCase):
+
+    def setUp(self):
+        self.dql = _CountingDQL()
+        self.ddl = _CountingDDL()
+        self.port = self.serve(self.dql, _DML(), self.ddl)
+
+    def test_repeated_nns(self):
+        with CottontailDBClient('localhost', self.port, cache=QueryCache()) as client:
+            first = client.nns('schema', 'entity', [0.1, 0.2], limit=1)
+            second = client.nns('schema', 'entity', [0.1, 0.2], limit=1)
+            other = client.nns('schema', 'entity', [0.3, 0.2], limit=1)
+            stats = client.cache_stats()
+        self.assertEqual(first, second)
+        self.assertEqual(other[0]['id'], 2)
+        self.assertEqual(self.dql.queries, 2)
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 2, 2))
+
+    def test_write_invalidates_entity(self):
+        with CottontailDBClient('localhost', self.port, cache=QueryCache()) as client:
+            client.sample_entity('schema', 'entity')
+            client.sample_entity('schema', 'other')
+            client.insert('schema', 'entity', {'id': Literal(longData=1)})
+            client.sample_entity('schema', 'entity')
+            client.sample_entity('schema', 'other')
+            self.assertEqual(self.dql.queries, 3)
+            client.delete('schema', 'other', None)
+            client.sample_entity('schema', 'other')
+        self.assertEqual(self.dql.queries, 4)
+
+    def test_concurrent_write_not_cached(self):
+        with CottontailDBClient('localhost', self.port, cache=QueryCache()) as client:
+            self.dql.blocked.clear()
+            reader = threading.Thread(target=client.query, args=('schema', 'entity', None, None))
+            reader.start()
+            self.dql.started.wait()
+            client.insert('schema', 'entity', {'id': Literal(longData=1)})
+            self.dql.blocked.set()
+            reader.join()
+            self.assertEqual(client.query('schema', 'entity', None, None)[0]['id'], 2)
+            self.assertEqual(client.cache_stats()['hits'], 0)
+        self.assertEqual(self.dql.queries, 2)
+
+    def test_incomplete_iteration_not_cached(self):
+        with CottontailDBClient('localhost', self.port, cache=QueryCache()) as client:
+            stream = client.iter_query('schema', 'entity', None, None)
+            next(stream)
+            stream.close()
+            self.assertEqual(client.cache_stats()['entries'], 0)
+            client.query('schema', 'entity', None, None)
+            client.query('schema', 'entity', None, None)
+        self.assertEqual(self.dql.queries, 2)
+
+    def test_list_schemas(self):
+        with CottontailDBClient('localhost', self.port, cache=QueryCache()) as client:
+            client.create_schema('schema', exist_ok=True)
+            client.create_schema('schema', exist_ok=True)
+            self.assertEqual(self.ddl.listings, 1)
+            client.create_schema('new')
+            client.list_schemas()
+        self.assertEqual(self.ddl.listings, 2)
+
+    def test_no_cache(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            client.query('schema', 'entity', None, None)
+            client.query('schema', 'entity', None, None)
+            self.assertIsNone(client.cache_stats())
+        self.assertEqual(self.dql.queries, 2)
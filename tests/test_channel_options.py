@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+import grpc
+
+from cottontaildb_client import CottontailDBClient, Literal
+from cottontaildb_client.channel_options import channel_options, parse_compression
+from cottontaildb_client.cottontaildb_client import DEFAULT_MAX_MESSAGE_SIZE
+
+
+class TestChannelOptions(TestCase):
+
+    def test_channel_options(self):
+        options = channel_options(max_send_message_size=64 * 1024 * 1024, max_receive_message_size=-1,
+                                  keepalive_time_ms=10000, keepalive_permit_without_calls=True,
+                                  http2_window_size=1024 * 1024)
+        self.assertEqual(dict(options), {
+            'grpc.max_send_message_length': 64 * 1024 * 1024,
+            'grpc.max_receive_message_length': -1,
+            'grpc.keepalive_time_ms': 10000,
+            'grpc.keepalive_permit_without_calls': 1,
+            'grpc.http2.lookahead_bytes': 1024 * 1024,
+        })
+        self.assertEqual(channel_options(), [])
+
+    def test_invalid_channel_options(self):
+        self.assertRaises(ValueError, channel_options, max_send_message_size=0)
+        self.assertRaises(ValueError, channel_options, max_receive_message_size=1.5)
+        self.assertRaises(ValueError, channel_options, keepalive_time_ms=-1)
+        self.assertRaises(ValueError, channel_options, keepalive_timeout_ms=True)
+        self.assertRaises(ValueError, channel_options, http2_bdp_probe=1)
+
+    def test_parse_compression(self):
+        self.assertEqual(parse_compression('GZIP'), grpc.Compression.Gzip)
+        self.assertEqual(parse_compression('deflate'), grpc.Compression.Deflate)
+        self.assertEqual(parse_compression(grpc.Compression.NoCompression), grpc.Compression.NoCompression)
+        self.assertIsNone(parse_compression(None))
+        self.assertRaises(ValueError, parse_compression, 'brotli')
+
+    def test_call_kwargs(self):
+        client = CottontailDBClient('localhost', 1865, compression='gzip', wait_for_ready=True)
+        self.assertEqual(client._call_kwargs(), {'wait_for_ready': True})
+        self.assertEqual(client._call_kwargs('none', False),
+                         {'compression': grpc.Compression.NoCompression, 'wait_for_ready': False})
+        self.assertEqual(CottontailDBClient('localhost', 1865)._call_kwargs(), {})
+        self.assertRaises(ValueError, CottontailDBClient, 'localhost', 1865, wait_for_ready='yes')
+        self.assertRaises(ValueError, CottontailDBClient, 'localhost', 1865, compression='lz4')
+
+    def test_insert_message_size_follows_send_limit(self):
+        rows = [[Literal(stringData='x' * 100)] for _ in range(100)]
+
+        def chunks(client, max_message_size=None):
+            return list(client._batch_insert_chunks('schema', 'entity', ['value'], rows, max_message_size, None))
+
+        limited = CottontailDBClient('localhost', 1865, max_send_message_size=2048)
+        self.assertEqual(limited._message_size_limit(), 2048)
+        self.assertTrue(all(chunk.ByteSize() <= 2048 for chunk in chunks(limited)))
+        self.assertGreater(len(chunks(limited)), len(chunks(limited, 4096)))
+        large = CottontailDBClient('localhost', 1865, max_send_message_size=64 * 1024 * 1024)
+        self.assertEqual(large._message_size_limit(), 64 * 1024 * 1024)
+        self.assertEqual(CottontailDBClient('localhost', 1865)._message_size_limit(), DEFAULT_MAX_MESSAGE_SIZE)
+        unlimited = CottontailDBClient('localhost', 1865, max_send_message_size=-1)
+        self.assertEqual(unlimited._message_size_limit(), DEFAULT_MAX_MESSAGE_SIZE)
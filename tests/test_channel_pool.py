@@ -0,0 +1,109 @@
+import threading
+from unittest import TestCase
+
+import grpc
+from google.protobuf.empty_pb2 import Empty
+
+from cottontaildb_client import CottontailDBClient
+from cottontaildb_client.channel_pool import ChannelPool
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer
+
+from .grpc_server import ServerTestCase
+
+
+class _FakeStub:
+    """Stub recording the channel it was called through."""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def Call(self, request, timeout=None):
+        return self.channel, request
+
+
+class TestChannelPool(TestCase):
+
+    def setUp(self):
+        self.pool = ChannelPool('localhost:1', size=3)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_round_robin(self):
+        stub = self.pool.stub(_FakeStub)
+        channels = [stub.Call(i)[0] for i in range(6)]
+        self.assertEqual(channels, self.pool.channels * 2)
+        self.assertEqual(self.pool.in_flight, [0, 0, 0])
+
+    def test_least_in_flight(self):
+        pool = ChannelPool('localhost:1', size=3, balancing='least_in_flight')
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(first)
+        self.assertNotEqual(pool.acquire(), second)
+        self.assertEqual(sum(pool.in_flight), 2)
+        pool.close()
+
+    def test_thread_safety(self):
+        def work():
+            for _ in range(1000):
+                self.pool.release(self.pool.acquire())
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.pool.in_flight, [0, 0, 0])
+
+    def test_health_check(self):
+        self.assertEqual(self.pool.health_check(timeout=0.5), [False, False, False])
+        # Falls back to all channels if none is healthy
+        self.assertIn(self.pool.acquire(), range(3))
+
+    def test_unhealthy_channels_skipped(self):
+        self.pool._healthy = [False, True, False]
+        self.assertEqual({self.pool.acquire() for _ in range(5)}, {1})
+
+    def test_failed_call_released(self):
+        def fail(request):
+            raise grpc.RpcError()
+
+        stub = self.pool.stub(_FakeStub)
+        stub.Call = type(stub.Call)(self.pool, [fail] * 3)
+        self.assertRaises(grpc.RpcError, stub.Call, None)
+        self.assertEqual(self.pool.in_flight, [0, 0, 0])
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, ChannelPool, 'localhost:1', size=0)
+        self.assertRaises(ValueError, ChannelPool, 'localhost:1', balancing='random')
+        self.assertRaises(ValueError, CottontailDBClient, 'localhost', 1, channels=0)
+
+
+class _PeerDQL(DQLServicer):
+
+    def __init__(self):
+        self.peers = set()
+
+    def Ping(self, request, context):
+        self.peers.add(context.peer())
+        return Empty()
+
+
+class TestChannelPoolConnections(ServerTestCase):
+
+    def setUp(self):
+        self.servicer = _PeerDQL()
+        self.port = self.serve(self.servicer)
+
+    def test_connection_per_channel(self):
+        with CottontailDBClient('localhost', self.port, channels=4) as client:
+            for _ in range(20):
+                client.ping()
+        self.assertEqual(len(self.servicer.peers), 4)
+
+    def test_single_channel(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            for _ in range(5):
+                client.ping()
+        self.assertEqual(len(self.servicer.peers), 1)
@@ -0,0 +1,116 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cottontaildb_client import CottontailDBClient, column_def, Type, Literal, float_vector
+from cottontaildb_client.columnar import decode_columns, concatenate_columns
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage, Null, Vector, DoubleVector, LongVector, \
+    BoolVector, Complex32Vector, Complex32, FloatVector
+
+
+def _response(columns, rows):
+    return QueryResponseMessage(columns=columns, tuples=[QueryResponseMessage.Tuple(data=row) for row in rows])
+
+
+class TestColumnar(TestCase):
+
+    def test_decode_scalar_columns(self):
+        columns = [
+            column_def('id', Type.STRING),
+            column_def('value', Type.INTEGER),
+            column_def('score', Type.DOUBLE),
+            column_def('flag', Type.BOOLEAN),
+            column_def('date', Type.DATE)
+        ]
+        rows = [
+            [Literal(stringData='a'), Literal(intData=1), Literal(doubleData=0.5), Literal(booleanData=True),
+             Literal(dateData=1000)],
+            [Literal(stringData='b'), Literal(intData=2), Literal(doubleData=1.5), Literal(booleanData=False),
+             Literal(dateData=2000)]
+        ]
+        result = decode_columns(_response(columns, rows), CottontailDBClient._parse_literal)
+        self.assertEqual(result['id'].tolist(), ['a', 'b'])
+        self.assertEqual(result['value'].dtype, np.int32)
+        self.assertEqual(result['value'].tolist(), [1, 2])
+        self.assertEqual(result['score'].dtype, np.float64)
+        self.assertEqual(result['flag'].tolist(), [True, False])
+        self.assertEqual(result['date'].dtype, np.dtype('datetime64[ms]'))
+        self.assertEqual(result['date'][1], np.datetime64(2000, 'ms'))
+
+    def test_decode_nullable_column(self):
+        columns = [column_def('value', Type.LONG, nullable=True)]
+        rows = [[Literal(longData=1)], [Literal(nullData=Null(type=Type.LONG))]]
+        result = decode_columns(_response(columns, rows), CottontailDBClient._parse_literal)
+        self.assertIsInstance(result['value'], np.ma.MaskedArray)
+        self.assertEqual(result['value'].mask.tolist(), [False, True])
+
+    def test_decode_fallback_column(self):
+        columns = [column_def('vector', Type.FLOAT_VECTOR, length=2)]
+        rows = [[float_vector(0.5, 1.0)], [float_vector(0.5)]]
+        result = decode_columns(_response(columns, rows), CottontailDBClient._parse_literal)
+        self.assertEqual(result['vector'].dtype, np.object_)
+        self.assertEqual(result['vector'][0], [0.5, 1.0])
+
+    def test_decode_vector_columns(self):
+        columns = [
+            column_def('float', Type.FLOAT_VECTOR, length=3),
+            column_def('double', Type.DOUBLE_VECTOR, length=3),
+            column_def('long', Type.LONG_VECTOR, length=3),
+            column_def('bool', Type.BOOLEAN_VECTOR, length=3),
+            column_def('half', Type.HALF_VECTOR, length=3)
+        ]
+        rows = [
+            [
+                float_vector(i, i + 0.5, -i),
+                Literal(vectorData=Vector(double=DoubleVector(vector=[i, 2 * i, 3 * i]))),
+                Literal(vectorData=Vector(long=LongVector(vector=[i, -i, 2 ** 40]))),
+                Literal(vectorData=Vector(bool=BoolVector(vector=[True, i % 2 == 0, False]))),
+                Literal(vectorData=Vector(half=FloatVector(vector=[i, 0.5, 1.0])))
+            ] for i in range(4)
+        ]
+        result = decode_columns(_response(columns, rows), CottontailDBClient._parse_literal)
+        self.assertEqual(result['float'].dtype, np.float32)
+        self.assertEqual(result['float'].shape, (4, 3))
+        self.assertTrue(result['float'].flags['C_CONTIGUOUS'])
+        self.assertEqual(result['float'][3].tolist(), [3.0, 3.5, -3.0])
+        self.assertEqual(result['double'].dtype, np.float64)
+        self.assertEqual(result['double'][2].tolist(), [2.0, 4.0, 6.0])
+        self.assertEqual(result['long'].dtype, np.int64)
+        self.assertEqual(result['long'][1].tolist(), [1, -1, 2 ** 40])
+        self.assertEqual(result['bool'].dtype, np.bool_)
+        self.assertEqual(result['bool'][:, 1].tolist(), [True, False, True, False])
+        self.assertEqual(result['half'].dtype, np.float16)
+        self.assertEqual(result['half'][2].tolist(), [2.0, 0.5, 1.0])
+
+    def test_decode_complex_vector_column(self):
+        columns = [column_def('complex', Type.COMPLEX32_VECTOR, length=2)]
+        vector = Complex32Vector(vector=[Complex32(real=1.0, imaginary=2.0), Complex32(real=0.0, imaginary=-1.0)])
+        rows = [[Literal(vectorData=Vector(complex32=vector))]]
+        result = decode_columns(_response(columns, rows), CottontailDBClient._parse_literal)
+        self.assertEqual(result['complex'].dtype, np.complex64)
+        self.assertEqual(result['complex'][0].tolist(), [1 + 2j, -1j])
+
+    def test_decode_empty_vector_column(self):
+        columns = [column_def('vector', Type.FLOAT_VECTOR, length=4)]
+        result = decode_columns(_response(columns, []), CottontailDBClient._parse_literal)
+        self.assertEqual(result['vector'].shape, (0, 4))
+
+    def test_concatenate_columns(self):
+        columns = [column_def('value', Type.INTEGER)]
+        batches = [
+            decode_columns(_response(columns, [[Literal(intData=i)] for i in range(j, j + 2)]),
+                           CottontailDBClient._parse_literal) for j in (0, 2)
+        ]
+        result = concatenate_columns(batches)
+        self.assertEqual(result['value'].tolist(), [0, 1, 2, 3])
+        self.assertEqual(concatenate_columns([]), {})
+
+    def test_concatenate_empty_vector_batch(self):
+        columns = [column_def('feature', Type.FLOAT_VECTOR)]
+        vectors = [[[float_vector(1.0, 2.0)]], [[float_vector(3.0, 4.0)]]]
+        batches = [decode_columns(_response(columns, rows), CottontailDBClient._parse_literal)
+                   for rows in [[]] + vectors]
+        self.assertEqual(batches[0]['feature'].shape, (0, 0))
+        result = concatenate_columns(batches)
+        np.testing.assert_array_equal(result['feature'], [[1.0, 2.0], [3.0, 4.0]])
+        self.assertEqual(concatenate_columns(batches[:1])['feature'].shape, (0, 0))
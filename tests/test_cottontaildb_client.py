@@ -1,8 +1,9 @@
 from unittest import TestCase
 
+import numpy as np
 from grpc import RpcError
 
-from cottontaildb_client import CottontailDBClient, column_def, Type, Literal, float_vector
+from cottontaildb_client import CottontailDBClient, BulkLoader, column_def, Type, Literal, float_vector
 from cottontaildb_client.cottontail_pb2 import Where, ColumnName, Expression, Projection, IndexType, EntityName, \
     SchemaName, Predicate
 
@@ -106,6 +107,37 @@ class TestCottontailDBClient(TestCase):
         details = self.client.get_entity_details(TEST_SCHEMA_STR, TEST_VECTOR_ENTITY_STR)
         self.assertEqual(3, details['rows'], 'unexpected number of rows in entity after batch insert')
 
+    def test_batch_insert_chunked(self):
+        self._create_schema()
+        self._create_entity()
+        columns = ['id', TEST_COLUMN_VALUE]
+        values = [[Literal(stringData=f'test_{i}'), Literal(intData=i)] for i in range(100)]
+        reports = self.client.insert_batch(TEST_SCHEMA_STR, TEST_ENTITY_STR, columns, values, max_rows=30)
+        self.assertEqual([r['rows'] for r in reports], [30, 30, 30, 10], 'unexpected chunk sizes')
+        details = self.client.get_entity_details(TEST_SCHEMA_STR, TEST_ENTITY_STR)
+        self.assertEqual(100, details['rows'], 'unexpected number of rows in entity after chunked batch insert')
+
+    def test_insert_arrays(self):
+        self._create_schema()
+        self._create_vector_entity()
+        ids = ['test_1', 'test_2', 'test_3']
+        vectors = np.array([[0.1, 0.2, 0.3], [0.01, 0.02, 0.3], [0.9, 0.9, 0.9]], dtype=np.float32)
+        self.client.insert_arrays(TEST_SCHEMA_STR, TEST_VECTOR_ENTITY_STR, {'id': ids, TEST_COLUMN_VALUE: vectors})
+        details = self.client.get_entity_details(TEST_SCHEMA_STR, TEST_VECTOR_ENTITY_STR)
+        self.assertEqual(3, details['rows'], 'unexpected number of rows in entity after array insert')
+
+    def test_bulk_loader(self):
+        self._create_schema()
+        self._create_vector_entity()
+        with BulkLoader(self.client, TEST_SCHEMA_STR, TEST_VECTOR_ENTITY_STR, ['id', TEST_COLUMN_VALUE],
+                        max_rows=10) as loader:
+            for i in range(3):
+                ids = [f'test_{i}_{j}' for j in range(25)]
+                loader.submit_arrays({'id': ids, TEST_COLUMN_VALUE: np.random.rand(25, 3).astype(np.float32)})
+        self.assertEqual(loader.report['errors'], [], 'unexpected errors during bulk load')
+        details = self.client.get_entity_details(TEST_SCHEMA_STR, TEST_VECTOR_ENTITY_STR)
+        self.assertEqual(75, details['rows'], 'unexpected number of rows in entity after bulk load')
+
     def test_query(self):
         self._create_schema()
         self._create_entity()
@@ -122,6 +154,52 @@ class TestCottontailDBClient(TestCase):
         query_result = self._query_value_with_key(query_key, TEST_VECTOR_ENTITY_NAME, TEST_VECTOR_ENTITY_STR)
         self.assertEqual(len(query_result), 1, 'unexpected number of rows returned from query')
 
+    def test_query_columnar(self):
+        self._create_schema()
+        self._create_entity()
+        self._batch_insert()
+        projection = Projection(op=Projection.ProjectionOperation.SELECT, elements=[
+            Projection.ProjectionElement(expression=Expression(column=ColumnName(name=TEST_COLUMN_ID))),
+            Projection.ProjectionElement(expression=Expression(column=ColumnName(name=TEST_COLUMN_VALUE)))
+        ])
+        result = self.client.query_columnar(TEST_SCHEMA_STR, TEST_ENTITY_STR, projection, None)
+        self.assertEqual(sorted(result[TEST_COLUMN_ID].tolist()), ['test_1', 'test_2', 'test_3'],
+                         'unexpected id column returned from columnar query')
+        self.assertEqual(sorted(result[TEST_COLUMN_VALUE].tolist()), [1, 2, 3],
+                         'unexpected value column returned from columnar query')
+
+    def test_query_df(self):
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            self.skipTest('pandas is not installed')
+        self._create_schema()
+        self._create_vector_entity()
+        self._batch_insert_vectors()
+        projection = Projection(op=Projection.ProjectionOperation.SELECT, elements=[
+            Projection.ProjectionElement(expression=Expression(column=ColumnName(name=TEST_COLUMN_ID))),
+            Projection.ProjectionElement(expression=Expression(column=ColumnName(name=TEST_COLUMN_VALUE)))
+        ])
+        df = self.client.query_df(TEST_SCHEMA_STR, TEST_VECTOR_ENTITY_STR, projection, None)
+        self.assertEqual(len(df), 3, 'unexpected number of rows in query data frame')
+        self.assertEqual(len(df[TEST_COLUMN_VALUE][0]), 3, 'unexpected vector length in query data frame')
+
+    def test_iter_query(self):
+        self._create_schema()
+        self._create_entity()
+        self._batch_insert()
+        projection = Projection(op=Projection.ProjectionOperation.SELECT, elements=[
+            Projection.ProjectionElement(expression=Expression(column=ColumnName(name=TEST_COLUMN_ID)))
+        ])
+        rows = list(self.client.iter_query(TEST_SCHEMA_STR, TEST_ENTITY_STR, projection, None))
+        self.assertEqual(len(rows), 3, 'unexpected number of rows yielded from query')
+        batches = list(self.client.iter_query(TEST_SCHEMA_STR, TEST_ENTITY_STR, projection, None, batches=True))
+        self.assertEqual(sum(len(b) for b in batches), 3, 'unexpected number of rows yielded in batches')
+        iterator = self.client.iter_query(TEST_SCHEMA_STR, TEST_ENTITY_STR, projection, None)
+        next(iterator)
+        iterator.close()
+        self.client.ping()
+
     def test_sample_entity(self):
         self._create_schema()
         self._create_entity()
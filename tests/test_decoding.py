@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from unittest import TestCase
+from uuid import UUID
+
+import numpy as np
+
+from cottontaildb_client import CottontailDBClient, column_def, Type, Literal, float_vector, half_vector
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage, Null, Uuid, Complex32, Vector, Complex64Vector, \
+    Complex64
+
+
+def _response(columns, rows):
+    return QueryResponseMessage(columns=columns, tuples=[QueryResponseMessage.Tuple(data=row) for row in rows])
+
+
+class TestDecoding(TestCase):
+
+    def test_parse_query_response(self):
+        columns = [column_def('id', Type.STRING), column_def('value', Type.INTEGER, nullable=True)]
+        rows = [
+            [Literal(stringData='a'), Literal(intData=1)],
+            [Literal(stringData='b'), Literal(nullData=Null(type=Type.INTEGER))]
+        ]
+        result = CottontailDBClient._parse_query_response(_response(columns, rows))
+        self.assertEqual(result, [{'id': 'a', 'value': 1}, {'id': 'b', 'value': None}])
+
+    def test_parse_query_response_compact(self):
+        columns = [column_def('id', Type.STRING), column_def('value', Type.INTEGER)]
+        rows = [[Literal(stringData='a'), Literal(intData=1)], [Literal(stringData='b'), Literal(intData=2)]]
+        result = CottontailDBClient._parse_query_response(_response(columns, rows), compact=True)
+        self.assertEqual(result[0].id, 'a')
+        self.assertEqual(result[1][1], 2)
+        self.assertFalse(hasattr(result[0], '__dict__'))
+        again = CottontailDBClient._parse_query_response(_response(columns, rows), compact=True)
+        self.assertIs(type(result[0]), type(again[0]))
+
+    def test_parse_literals(self):
+        parse = CottontailDBClient._parse_literal
+        self.assertIsNone(parse(Literal()))
+        self.assertIsNone(parse(Literal(nullData=Null(type=Type.STRING))))
+        self.assertEqual(parse(Literal(booleanData=False)), False)
+        self.assertEqual(parse(Literal(byteStringData=b'\x00\x01')), b'\x00\x01')
+        self.assertEqual(parse(Literal(dateData=1000)), datetime(1970, 1, 1, 0, 0, 1, tzinfo=timezone.utc))
+        self.assertEqual(parse(Literal(complex32Data=Complex32(real=1.0, imaginary=-2.0))), 1 - 2j)
+        self.assertEqual(parse(float_vector(0.5, 1.5)), [0.5, 1.5])
+        half = parse(half_vector(0.5, 1.5))
+        self.assertEqual(half.dtype, np.float16)
+        self.assertEqual(half.tolist(), [0.5, 1.5])
+        vector = Complex64Vector(vector=[Complex64(real=1.0, imaginary=1.0)])
+        self.assertEqual(parse(Literal(vectorData=Vector(complex64=vector))), [1 + 1j])
+
+    def test_parse_uuid(self):
+        uuid = UUID('f81d4fae-7dec-11d0-a765-00a0c91e6bf6')
+        most = (uuid.int >> 64) - (1 << 64)
+        least = (uuid.int & 0xFFFFFFFFFFFFFFFF) - (1 << 64)
+        literal = Literal(uuidData=Uuid(mostSignificant=most, leastSignificant=least))
+        self.assertEqual(CottontailDBClient._parse_literal(literal), uuid)
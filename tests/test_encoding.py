@@ -0,0 +1,126 @@
+from array import array
+from unittest import TestCase
+from uuid import UUID
+
+import numpy as np
+
+from cottontaildb_client import CottontailDBClient, Type, Literal, float_vector, half_vector, double_vector, \
+    int_vector, long_vector, bool_vector
+from cottontaildb_client.cottontail_pb2 import BatchInsertMessage, Null, Vector, FloatVector, DoubleVector, IntVector, \
+    LongVector, BoolVector
+from cottontaildb_client.encoding import encode_inserts, infer_type, parse_type_name, to_literal, chunk_rows
+
+
+def _decode(columns, types):
+    message = BatchInsertMessage()
+    message.MergeFromString(b''.join(encode_inserts(columns, types)))
+    return [[CottontailDBClient._parse_literal(v) for v in insert.values] for insert in message.inserts]
+
+
+class TestEncoding(TestCase):
+
+    def test_encode_scalar_columns(self):
+        columns = {
+            'id': ['a', 'b', 'c'],
+            'value': np.array([1, -2, 2 ** 20], dtype=np.int32),
+            'score': np.array([0.5, 1.5, -2.0]),
+            'flag': [True, False, True]
+        }
+        types = {'id': Type.STRING, 'value': Type.INTEGER, 'score': Type.DOUBLE, 'flag': Type.BOOLEAN}
+        self.assertEqual(_decode(columns, types), [
+            ['a', 1, 0.5, True],
+            ['b', -2, 1.5, False],
+            ['c', 2 ** 20, -2.0, True]
+        ])
+
+    def test_encode_vector_columns(self):
+        vectors = np.arange(12, dtype=np.float64).reshape(3, 4)
+        columns = {'float': vectors, 'double': vectors, 'long': vectors.astype(np.int64)}
+        types = {'float': Type.FLOAT_VECTOR, 'double': Type.DOUBLE_VECTOR, 'long': Type.LONG_VECTOR}
+        rows = _decode(columns, types)
+        self.assertEqual([r[0] for r in rows], vectors.tolist())
+        self.assertEqual([r[2] for r in rows], vectors.tolist())
+        message = BatchInsertMessage()
+        message.MergeFromString(b''.join(encode_inserts({'float': vectors}, {'float': Type.FLOAT_VECTOR})))
+        self.assertEqual(message.inserts[1].values[0], float_vector(*vectors[1]))
+
+    def test_encode_half_vectors(self):
+        vectors = np.array([[0.1, 1.0], [2.0, 65504.0]])
+        message = BatchInsertMessage()
+        message.MergeFromString(b''.join(encode_inserts({'half': vectors}, {'half': Type.HALF_VECTOR})))
+        self.assertEqual(message.inserts[0].values[0].vectorData.WhichOneof('vectorData'), 'half')
+        self.assertEqual(message.inserts[0].values[0], half_vector(0.1, 1.0))
+        self.assertEqual(list(message.inserts[0].values[0].vectorData.half.vector), [np.float16(0.1), 1.0])
+
+    def test_half_vector(self):
+        literal = half_vector(0.1, -2.5)
+        self.assertEqual(list(literal.vectorData.half.vector), [float(np.float16(0.1)), -2.5])
+        projection, _ = CottontailDBClient._nns_projection('schema', 'entity', [0.1, 0.2], 'euclidean', 'feature',
+                                                           'id', half=True)
+        query_literal = projection.elements[0].expression.function.arguments[1].literal
+        self.assertEqual(query_literal, half_vector(0.1, 0.2))
+
+    def test_vector_constructors(self):
+        values = np.array([0.5, -1.25, 3.0])
+        cases = [
+            (float_vector, 'float', FloatVector, values),
+            (double_vector, 'double', DoubleVector, values),
+            (int_vector, 'int', IntVector, values.astype(np.int32)),
+            (long_vector, 'long', LongVector, values.astype(np.int64) - 2 ** 40),
+            (bool_vector, 'bool', BoolVector, values > 0),
+        ]
+        for constructor, field, vector_type, elements in cases:
+            expected = Literal(vectorData=Vector(**{field: vector_type(vector=elements.tolist())}))
+            self.assertEqual(constructor(elements), expected)
+            self.assertEqual(constructor(*elements.tolist()), expected)
+            self.assertEqual(constructor(elements.tolist()), expected)
+        self.assertEqual(float_vector(array('f', [0.5, 1.5])), float_vector(0.5, 1.5))
+        self.assertEqual(float_vector(memoryview(np.array([0.5, 1.5]))), float_vector(0.5, 1.5))
+        self.assertEqual(float_vector(), Literal(vectorData=Vector(float=FloatVector())))
+        self.assertEqual(float_vector(0.5), Literal(vectorData=Vector(float=FloatVector(vector=[0.5]))))
+        with self.assertRaises(ValueError):
+            float_vector(np.ones((2, 2)))
+
+    def test_encode_nulls(self):
+        columns = {
+            'value': np.ma.masked_array([1.0, 2.0], mask=[False, True]),
+            'id': ['a', None],
+            'feature': [[0.5, 1.0], None]
+        }
+        types = {'value': Type.FLOAT, 'id': Type.STRING, 'feature': Type.FLOAT_VECTOR}
+        self.assertEqual(_decode(columns, types), [[1.0, 'a', [0.5, 1.0]], [None, None, None]])
+
+    def test_encode_differing_lengths(self):
+        with self.assertRaises(ValueError):
+            encode_inserts({'a': [1, 2], 'b': [1]}, {'a': Type.INTEGER, 'b': Type.INTEGER})
+
+    def test_to_literal(self):
+        uuid = UUID('f81d4fae-7dec-11d0-a765-00a0c91e6bf6')
+        self.assertEqual(CottontailDBClient._parse_literal(to_literal(uuid, Type.UUID)), uuid)
+        self.assertEqual(to_literal(np.datetime64(1000, 'ms'), Type.DATE), Literal(dateData=1000))
+        self.assertEqual(to_literal(None, Type.LONG), Literal(nullData=Null(type=Type.LONG)))
+
+    def test_infer_type(self):
+        self.assertEqual(infer_type(np.zeros(3, dtype=np.int64)), Type.LONG)
+        self.assertEqual(infer_type(np.zeros((3, 2), dtype=np.float32)), Type.FLOAT_VECTOR)
+        self.assertEqual(infer_type(np.array(['a'])), Type.STRING)
+
+    def test_insert_types_keep_declared_boolean(self):
+        client = CottontailDBClient('localhost', 1865)
+        client._column_types = lambda schema, entity, timeout=None: {'flag': Type.BOOLEAN, 'id': Type.LONG}
+        types = client._insert_types('schema', 'entity', {'flag': [0, 1], 'id': [1, 2], 'score': [0.5, 1.5]}, None)
+        self.assertEqual(types, {'flag': Type.BOOLEAN, 'id': Type.LONG, 'score': Type.DOUBLE})
+
+    def test_parse_type_name(self):
+        self.assertEqual(parse_type_name('INTEGER'), Type.INTEGER)
+        self.assertEqual(parse_type_name('FLOAT_VEC'), Type.FLOAT_VECTOR)
+        self.assertEqual(parse_type_name('BOOL_VEC'), Type.BOOLEAN_VECTOR)
+        self.assertEqual(parse_type_name('INT_VEC'), Type.INTEGER_VECTOR)
+        self.assertIsNone(parse_type_name('UNKNOWN'))
+
+    def test_chunk_rows(self):
+        self.assertEqual(list(chunk_rows([4, 4, 4, 4, 4], 10)), [(0, 2), (2, 4), (4, 5)])
+        self.assertEqual(list(chunk_rows([1, 1, 1, 1, 1], 10, max_rows=2)), [(0, 2), (2, 4), (4, 5)])
+        self.assertEqual(list(chunk_rows([], 10)), [])
+        with self.assertRaises(ValueError):
+            list(chunk_rows([4, 11], 10))
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import grpc
+from google.protobuf.empty_pb2 import Empty
+
+from cottontaildb_client import CottontailDBClient, column_def, Type, Literal
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer
+from cottontaildb_client.errors import CancelledError, DeadlineExceededError, UnavailableError, CottontailDBError
+
+from .grpc_server import ServerTestCase
+
+
+class _SlowDQL(DQLServicer):
+    """Query endpoint streaming one single row response message every 50 ms."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.terminated = threading.Event()
+
+    def Ping(self, request, context):
+        time.sleep(0.5)
+        return Empty()
+
+    def Query(self, request, context):
+        context.add_callback(self.terminated.set)
+        self.started.set()
+        for i in range(100):
+            if not context.is_active():
+                return
+            yield QueryResponseMessage(columns=[column_def('id', Type.INTEGER)],
+                                       tuples=[QueryResponseMessage.Tuple(data=[Literal(intData=i)])])
+            time.sleep(0.05)
+
+
+class TestErrors(ServerTestCase):
+
+    def setUp(self):
+        self.dql = _SlowDQL()
+        self.port = self.serve(self.dql)
+
+    def test_default_deadline(self):
+        with CottontailDBClient('localhost', self.port, timeout=0.2) as client:
+            with self.assertRaises(DeadlineExceededError) as context:
+                client.ping()
+            self.assertIsInstance(context.exception, grpc.RpcError)
+            self.assertEqual(context.exception.code(), grpc.StatusCode.DEADLINE_EXCEEDED)
+            client.ping(timeout=2)
+
+    def test_stream_deadline(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            rows = client.iter_query('schema', 'entity', None, None, timeout=0.2)
+            self.assertEqual(next(rows)['id'], 0)
+            self.assertRaises(DeadlineExceededError, list, rows)
+
+    def test_cancel_from_other_thread(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            rows = client.iter_query('schema', 'entity', None, None)
+            self.assertEqual(next(rows)['id'], 0)
+            threading.Timer(0.1, rows.cancel).start()
+            with self.assertRaises(CancelledError):
+                for _ in rows:
+                    pass
+
+    def test_close_before_iteration(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            rows = client.iter_query('schema', 'entity', None, None)
+            self.assertTrue(self.dql.started.wait(1))
+            rows.close()
+            self.assertTrue(self.dql.terminated.wait(1))
+            self.assertRaises(StopIteration, next, rows)
+
+    def test_unavailable(self):
+        with CottontailDBClient('localhost', 1) as client:
+            self.assertRaises(UnavailableError, client.ping)
+            self.assertRaises(UnavailableError, client.query, 'schema', 'entity', None, None)
+
+    def test_other_status(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            with self.assertRaises(CottontailDBError) as context:
+                client.list_schemas()
+            self.assertEqual(context.exception.code(), grpc.StatusCode.UNIMPLEMENTED)
+
+    def test_invalid_timeout(self):
+        self.assertRaises(ValueError, CottontailDBClient, 'localhost', 1865, timeout=0)
+        self.assertRaises(ValueError, CottontailDBClient, 'localhost', 1865, timeout='1')
@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+from cottontaildb_client import CottontailDBClient, Type, Literal, column_def, query_hints
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage, ResponseMetadata, TransactionMode, Projection, \
+    Expression, ColumnName
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer
+from cottontaildb_client.explain import plan_tree, response_metadata
+
+from .grpc_server import ServerTestCase
+
+_METADATA = ResponseMetadata(transactionId=7, transactionMode=TransactionMode.READONLY, queryId='q1',
+                             planDuration=12, planScore=3.5, queryDuration=40)
+
+_PLAN = [
+    ('0', 'LimitPhysicalOperatorNode', 1.0),
+    ('0.0', 'SortPhysicalOperatorNode', 4.0),
+    ('0.0.0', 'EntityScanPhysicalOperatorNode', 100.0),
+]
+
+
+class TestPlanTree(TestCase):
+
+    def test_plan_tree(self):
+        rows = [{'path': '0.1', 'name': 'right'}, {'path': '0', 'name': 'root'}, {'path': '0.0', 'name': 'left'},
+                {'path': '0.0.0', 'name': 'scan'}]
+        root, = plan_tree(rows)
+        self.assertEqual(root['name'], 'root')
+        self.assertEqual([child['name'] for child in root['children']], ['right', 'left'])
+        self.assertEqual(root['children'][1]['children'][0]['name'], 'scan')
+
+    def test_plan_tree_without_path(self):
+        roots = plan_tree([{'name': 'a'}, {'name': 'b', 'path': None}])
+        self.assertEqual([(root['name'], root['children']) for root in roots], [('a', []), ('b', [])])
+
+    def test_response_metadata(self):
+        self.assertIsNone(response_metadata(None))
+        self.assertEqual(response_metadata(_METADATA), {
+            'transaction_id': 7, 'transaction_mode': 'READONLY', 'query_id': 'q1', 'plan_duration': 12,
+            'plan_score': 3.5, 'query_duration': 40
+        })
+
+
+class _ExplainingDQL(DQLServicer):
+
+    def __init__(self):
+        self.requests = []
+
+    def Query(self, request, context):
+        self.requests.append(request)
+        yield QueryResponseMessage(metadata=_METADATA, columns=[column_def('id', Type.LONG)], tuples=[
+            QueryResponseMessage.Tuple(data=[Literal(longData=1)])
+        ])
+
+    def Explain(self, request, context):
+        self.requests.append(request)
+        columns = [column_def('path', Type.STRING), column_def('designation', Type.STRING),
+                   column_def('cost', Type.DOUBLE)]
+        tuples = [QueryResponseMessage.Tuple(data=[Literal(stringData=path), Literal(stringData=designation),
+                                                   Literal(doubleData=cost)]) for path, designation, cost in _PLAN]
+        yield QueryResponseMessage(metadata=_METADATA, columns=columns, tuples=tuples)
+
+
+class TestExplain(ServerTestCase):
+
+    def setUp(self):
+        self.servicer = _ExplainingDQL()
+        self.port = self.serve(self.servicer)
+        self.projection = Projection(op=Projection.ProjectionOperation.SELECT, elements=[
+            Projection.ProjectionElement(expression=Expression(column=ColumnName(name='id')))])
+
+    def test_explain(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            plan = client.explain('schema', 'entity', self.projection, None, limit=5)
+            plan_with_metadata, metadata = client.explain('schema', 'entity', self.projection, None,
+                                                          hints=query_hints(parallelism=2), with_metadata=True)
+        self.assertEqual(plan, plan_with_metadata)
+        limit, = plan
+        self.assertEqual(limit['designation'], 'LimitPhysicalOperatorNode')
+        scan = limit['children'][0]['children'][0]
+        self.assertEqual((scan['designation'], scan['cost'], scan['children']),
+                         ('EntityScanPhysicalOperatorNode', 100.0, []))
+        self.assertEqual(metadata['plan_score'], 3.5)
+        self.assertEqual(self.servicer.requests[0].query.limit, 5)
+        self.assertEqual(self.servicer.requests[1].metadata.parallelHint.limit, 2)
+
+    def test_query_with_metadata(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            rows = client.query('schema', 'entity', self.projection, None)
+            rows_with_metadata, metadata = client.query('schema', 'entity', self.projection, None,
+                                                        with_metadata=True)
+            columns, columnar_metadata = client.query_columnar('schema', 'entity', self.projection, None,
+                                                               with_metadata=True)
+            stream = client.iter_query('schema', 'entity', self.projection, None)
+            list(stream)
+        self.assertEqual(rows, [{'id': 1}])
+        self.assertEqual(rows_with_metadata, rows)
+        self.assertEqual(list(columns['id']), [1])
+        self.assertEqual((metadata['plan_duration'], metadata['query_duration']), (12, 40))
+        self.assertEqual(columnar_metadata, metadata)
+        self.assertEqual(stream.metadata, _METADATA)
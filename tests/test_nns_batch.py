@@ -0,0 +1,63 @@
+import grpc
+import numpy as np
+
+from cottontaildb_client import CottontailDBClient, ShardedCottontailClient, column_def, Type, Literal
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer
+from cottontaildb_client.cottontaildb_client import NNSBatchResult
+
+from .grpc_server import ServerTestCase
+
+
+class _VectorDQL(DQLServicer):
+    """Nearest neighbour endpoint returning limit rows with ids derived from the first query vector element."""
+
+    def __init__(self, offset=0.0):
+        self.offset = offset
+
+    def Query(self, request, context):
+        query_vector = request.query.projection.elements[0].expression.function.arguments[1].literal.vectorData
+        first = query_vector.float.vector[0]
+        if first < 0:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, 'negative vector')
+        columns = [column_def('distance', Type.DOUBLE), column_def('id', Type.LONG)]
+        tuples = [QueryResponseMessage.Tuple(data=[Literal(doubleData=i + self.offset),
+                                                   Literal(longData=int(first) * 10 + i)])
+                  for i in range(min(request.query.limit, int(first)))]
+        yield QueryResponseMessage(columns=columns, tuples=tuples)
+
+
+class TestNNSBatch(ServerTestCase):
+
+    def setUp(self):
+        self.port = self.serve(_VectorDQL())
+        self.other_port = self.serve(_VectorDQL(offset=0.5))
+
+    def test_nns_batch(self):
+        query_vectors = np.array([[3, 0], [4, 0], [5, 0]], dtype=np.float32)
+        with CottontailDBClient('localhost', self.port) as client:
+            result = client.nns_batch('schema', 'entity', query_vectors, k=3, max_in_flight=2)
+        self.assertIsInstance(result, NNSBatchResult)
+        np.testing.assert_array_equal(result.ids, [[30, 31, 32], [40, 41, 42], [50, 51, 52]])
+        self.assertEqual(result.ids.dtype, np.object_)
+        np.testing.assert_array_equal(result.distances, [[0, 1, 2]] * 3)
+        self.assertEqual(result.errors, {})
+
+    def test_failures_isolated(self):
+        query_vectors = np.array([[2, 0], [-1, 0], [1, 0]], dtype=np.float32)
+        with CottontailDBClient('localhost', self.port) as client:
+            ids, distances, errors = client.nns_batch('schema', 'entity', query_vectors, k=2)
+        self.assertEqual(list(errors), [1])
+        self.assertEqual(errors[1].code(), grpc.StatusCode.INVALID_ARGUMENT)
+        self.assertEqual(ids.tolist(), [[20, 21], [None, None], [10, None]])
+        self.assertEqual(ids.dtype, np.object_)
+        np.testing.assert_array_equal(distances, [[0, 1], [np.nan, np.nan], [0, np.nan]])
+
+    def test_sharded_nns_batch(self):
+        query_vectors = np.array([[2, 0], [3, 0]], dtype=np.float32)
+        with ShardedCottontailClient([('localhost', self.port), ('localhost', self.other_port)]) as client:
+            ids, distances, errors = client.nns_batch('schema', 'entity', query_vectors, k=3)
+        self.assertEqual(ids.tolist(), [[20, 20, 21], [30, 30, 31]])
+        self.assertEqual(ids.dtype, np.object_)
+        np.testing.assert_array_equal(distances, [[0, 0.5, 1], [0, 0.5, 1]])
+        self.assertEqual(errors, {})
@@ -0,0 +1,93 @@
+from cottontaildb_client import CottontailDBClient, Type, Literal, column_def
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage, Predicate, Order, Where, Expression, ColumnName
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer
+from cottontaildb_client.pagination import encode_token, decode_token
+
+from .grpc_server import ServerTestCase
+
+# Rows of (group, id), id being unique within a group
+_ROWS = [(group, id_) for group in range(4) for id_ in range(7)]
+
+_OPERATORS = {
+    Predicate.Comparison.Operator.EQUAL: lambda a, b: a == b,
+    Predicate.Comparison.Operator.GREATER: lambda a, b: a > b,
+    Predicate.Comparison.Operator.LESS: lambda a, b: a < b,
+}
+
+
+def _matches(predicate, row):
+    kind = predicate.WhichOneof('predicate')
+    if kind == 'comparison':
+        value = row[predicate.comparison.lexp.column.name]
+        return _OPERATORS[predicate.comparison.operator](value, predicate.comparison.rexp.literal.intData)
+    nested = getattr(predicate, kind)
+    results = (_matches(nested.p1, row), _matches(nested.p2, row))
+    return all(results) if kind == 'and' else any(results)
+
+
+class _KeysetDQL(DQLServicer):
+    """Evaluates comparisons, order and limit of queries on _ROWS."""
+
+    def __init__(self):
+        self.requests = []
+
+    def Query(self, request, context):
+        self.requests.append(request)
+        query = request.query
+        rows = [{'group': group, 'id': id_} for group, id_ in _ROWS]
+        if query.HasField('where'):
+            rows = [row for row in rows if _matches(query.where.predicate, row)]
+        for component in reversed(query.order.components):
+            rows.sort(key=lambda row: row[component.column.name],
+                      reverse=component.direction == Order.Direction.DESCENDING)
+        rows = rows[:query.limit]
+        # Responses of at most 3 rows
+        for offset in range(0, len(rows), 3):
+            yield QueryResponseMessage(columns=[column_def('group', Type.INTEGER), column_def('id', Type.INTEGER)],
+                                       tuples=[QueryResponseMessage.Tuple(data=[
+                                           Literal(intData=row['group']), Literal(intData=row['id'])])
+                                           for row in rows[offset:offset + 3]])
+
+
+class TestKeysetPagination(ServerTestCase):
+
+    def setUp(self):
+        self.servicer = _KeysetDQL()
+        self.port = self.serve(self.servicer)
+
+    def test_iter_pages(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            pages = list(client.iter_pages('schema', 'entity', ['group', 'id'], 5, compact=True))
+        self.assertEqual([(row.group, row.id) for page in pages for row in page.rows], _ROWS)
+        self.assertEqual([len(page.rows) for page in pages], [5, 5, 5, 5, 5, 3])
+        self.assertIsNone(pages[-1].token)
+        self.assertTrue(all(not request.query.skip for request in self.servicer.requests))
+
+    def test_resume_descending(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            first = client.query_page('schema', 'entity', ['group', 'id'], 10, descending=True)
+            second = client.query_page('schema', 'entity', ['group', 'id'], 10, token=first.token, descending=True)
+            with self.assertRaises(ValueError):
+                client.query_page('schema', 'entity', 'id', 10, token=first.token)
+        expected = [{'group': group, 'id': id_} for group, id_ in reversed(_ROWS)]
+        self.assertEqual(first.rows + second.rows, expected[:20])
+
+    def test_where(self):
+        where = Where(predicate=Predicate(comparison=Predicate.Comparison(
+            lexp=Expression(column=ColumnName(name='group')), operator=Predicate.Comparison.Operator.EQUAL,
+            rexp=Expression(literal=Literal(intData=2)))))
+        with CottontailDBClient('localhost', self.port) as client:
+            pages = list(client.iter_pages('schema', 'entity', 'id', 4, where=where))
+        self.assertEqual([[(row['group'], row['id']) for row in page.rows] for page in pages],
+                         [[(2, 0), (2, 1), (2, 2), (2, 3)], [(2, 4), (2, 5), (2, 6)]])
+
+    def test_token(self):
+        response = QueryResponseMessage(columns=[column_def('group', Type.INTEGER), column_def('id', Type.INTEGER)],
+                                        tuples=[QueryResponseMessage.Tuple(data=[Literal(intData=1),
+                                                                                 Literal(intData=2)])])
+        token = encode_token(response, ['id'])
+        self.assertEqual(decode_token(token, ['id']), [Literal(intData=2)])
+        self.assertIsNone(decode_token(None, ['id']))
+        self.assertRaises(ValueError, decode_token, token, ['group'])
+        self.assertRaises(ValueError, decode_token, 'not a token', ['id'])
+        self.assertRaises(ValueError, encode_token, response, ['name'])
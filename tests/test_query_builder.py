@@ -0,0 +1,89 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cottontaildb_client import CottontailDBClient, QueryBuilder, Param, Type, Literal, float_vector, query_hints, \
+    column_def
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage, RequestMetadata, Predicate
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer
+
+from .grpc_server import ServerTestCase
+
+
+def _builder(vector, category):
+    return QueryBuilder('schema', 'entity') \
+        .select('id') \
+        .distance('feature', vector, 'euclidean') \
+        .where('category', '=', category) \
+        .where('price', '<', 10.5) \
+        .order('distance') \
+        .limit(5)
+
+
+class TestQueryBuilder(TestCase):
+
+    def test_build(self):
+        query = _builder([0.5, 1.0], 'shoes').build()
+        self.assertEqual(getattr(query, 'from').scan.entity.name, 'entity')
+        self.assertEqual([e.expression.column.name or e.alias.name for e in query.projection.elements],
+                         ['id', 'distance'])
+        self.assertEqual(query.projection.elements[1].expression.function.arguments[1].literal,
+                         float_vector(0.5, 1.0))
+        predicate = getattr(query.where.predicate, 'and')
+        self.assertEqual(predicate.p1.comparison.rexp.literal, Literal(stringData='shoes'))
+        self.assertEqual(predicate.p2.comparison.operator, Predicate.Comparison.Operator.LESS)
+        self.assertEqual(predicate.p2.comparison.rexp.literal, Literal(doubleData=10.5))
+        self.assertEqual(query.order.components[0].column.name, 'distance')
+        self.assertEqual(query.limit, 5)
+
+    def test_bind(self):
+        template = _builder(Param('vector', Type.FLOAT_VECTOR), Param('category')).compile()
+        self.assertEqual(set(template.params), {'vector', 'category'})
+        metadata = RequestMetadata(transactionId=3)
+        for vector, category in [(np.array([0.5, 1.0], dtype=np.float32), 'shoes'), ([0.25, -2.0, 4.0], 'hats')]:
+            message = template.bind({'vector': vector, 'category': Literal(stringData=category)}, metadata)
+            self.assertEqual(message.query, _builder(np.asarray(vector), category).build())
+            self.assertEqual(message.metadata, metadata)
+
+    def test_bind_errors(self):
+        template = _builder(Param('vector', Type.FLOAT_VECTOR), Param('category')).compile()
+        with self.assertRaises(ValueError):
+            template.bind({'vector': [0.5]})
+        with self.assertRaises(ValueError):
+            template.bind({'vector': [0.5], 'category': 'untyped'})
+        with self.assertRaises(ValueError):
+            QueryBuilder('schema', 'entity').where('a', '=', Param('x')).where('b', '=', Param('x'))
+        with self.assertRaises(ValueError):
+            QueryBuilder('schema', 'entity').where('a', '~', 1)
+
+
+class _RecordingDQL(DQLServicer):
+
+    def __init__(self):
+        self.requests = []
+
+    def Query(self, request, context):
+        self.requests.append(request)
+        yield QueryResponseMessage(columns=[column_def('id', Type.LONG)], tuples=[
+            QueryResponseMessage.Tuple(data=[Literal(longData=len(self.requests))])
+        ])
+
+
+class TestExecute(ServerTestCase):
+
+    def setUp(self):
+        self.servicer = _RecordingDQL()
+        self.port = self.serve(self.servicer)
+
+    def test_execute(self):
+        template = _builder(Param('vector', Type.FLOAT_VECTOR), Param('category', Type.STRING)).compile()
+        with CottontailDBClient('localhost', self.port) as client:
+            first = client.execute(template, {'vector': [0.5, 1.0], 'category': 'shoes'})
+            second = client.execute(template, {'vector': [1.5, 1.0], 'category': 'hats'}, compact=True,
+                                    hints=query_hints(parallelism=2))
+        self.assertEqual(first, [{'id': 1}])
+        self.assertEqual(second[0].id, 2)
+        first_request, second_request = self.servicer.requests
+        self.assertEqual(first_request.query, _builder(np.array([0.5, 1.0]), 'shoes').build())
+        self.assertEqual(second_request.query, _builder(np.array([1.5, 1.0]), 'hats').build())
+        self.assertEqual(second_request.metadata.parallelHint.limit, 2)
@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+from cottontaildb_client import CottontailDBClient, IndexType, query_hints
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage, RequestMetadata
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer
+from cottontaildb_client.query_hints import merge_hints
+
+from .grpc_server import ServerTestCase
+
+
+class TestQueryHints(TestCase):
+
+    def test_query_hints(self):
+        hints = query_hints(parallelism=4, index_type='pq', weight_io=0.5, weight_accuracy=2, no_optimise=True)
+        self.assertEqual(hints.parallelHint.limit, 4)
+        self.assertEqual(hints.indexHint.type, IndexType.PQ)
+        self.assertFalse(hints.indexHint.disallow)
+        self.assertEqual(hints.policyHint.weightIo, 0.5)
+        self.assertEqual(hints.policyHint.weightAccuracy, 2)
+        self.assertTrue(hints.noOptimiseHint)
+
+    def test_unset_hints(self):
+        hints = query_hints()
+        for name in ('parallelHint', 'indexHint', 'policyHint'):
+            self.assertFalse(hints.HasField(name))
+        hints = query_hints(index_type=IndexType.BTREE, weight_cpu=0)
+        self.assertTrue(hints.HasField('indexHint'))
+        self.assertTrue(hints.HasField('policyHint'))
+
+    def test_invalid_hints(self):
+        with self.assertRaises(ValueError):
+            query_hints(parallelism=0)
+        with self.assertRaises(ValueError):
+            query_hints(index_type='unknown')
+        with self.assertRaises(ValueError):
+            query_hints(disallow_index=True)
+        with self.assertRaises(ValueError):
+            query_hints(weight_io=-1)
+        with self.assertRaises(ValueError):
+            merge_hints(RequestMetadata(), {'parallelism': 2})
+
+    def test_merge_hints(self):
+        defaults = query_hints(parallelism=2, index='idx', disallow_index=True)
+        hints = query_hints(index_type=IndexType.VAF)
+        metadata = merge_hints(RequestMetadata(transactionId=7), defaults, hints)
+        self.assertEqual(metadata.transactionId, 7)
+        self.assertEqual(metadata.parallelHint.limit, 2)
+        self.assertEqual(metadata.indexHint, RequestMetadata.IndexHint(type=IndexType.VAF))
+
+    def test_merge_no_optimise(self):
+        defaults = query_hints(no_optimise=True)
+        self.assertTrue(merge_hints(RequestMetadata(), defaults).noOptimiseHint)
+        self.assertTrue(merge_hints(RequestMetadata(), defaults, None).noOptimiseHint)
+        self.assertFalse(merge_hints(RequestMetadata(), defaults, query_hints(no_optimise=False)).noOptimiseHint)
+
+
+class _RecordingDQL(DQLServicer):
+    """Query endpoint recording the request metadata of queries."""
+
+    def __init__(self):
+        self.metadata = []
+
+    def Query(self, request, context):
+        self.metadata.append(request.metadata)
+        yield QueryResponseMessage()
+
+
+class TestClientHints(ServerTestCase):
+
+    def setUp(self):
+        self.servicer = _RecordingDQL()
+        self.port = self.serve(self.servicer)
+
+    def test_call_hints(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            client.nns('schema', 'entity', [0.1, 0.2], limit=10, hints=query_hints(index_type=IndexType.PQ))
+            client.sample_entity('schema', 'entity', hints=query_hints(parallelism=1))
+        nns, sample = self.servicer.metadata
+        self.assertEqual(nns.indexHint.type, IndexType.PQ)
+        self.assertFalse(nns.HasField('parallelHint'))
+        self.assertEqual(sample.parallelHint.limit, 1)
+        self.assertFalse(sample.HasField('indexHint'))
+
+    def test_client_default_hints(self):
+        defaults = query_hints(parallelism=2, weight_io=1.0)
+        with CottontailDBClient('localhost', self.port, hints=defaults) as client:
+            client.query('schema', 'entity', None, None)
+            client.query('schema', 'entity', None, None, hints=query_hints(parallelism=8))
+        default, overridden = self.servicer.metadata
+        self.assertEqual(default.parallelHint.limit, 2)
+        self.assertEqual(overridden.parallelHint.limit, 8)
+        self.assertEqual(overridden.policyHint.weightIo, 1.0)
+
+    def test_override_default_no_optimise(self):
+        with CottontailDBClient('localhost', self.port, hints=query_hints(no_optimise=True)) as client:
+            client.query('schema', 'entity', None, None)
+            client.query('schema', 'entity', None, None, hints=query_hints(no_optimise=False))
+        default, overridden = self.servicer.metadata
+        self.assertTrue(default.noOptimiseHint)
+        self.assertFalse(overridden.noOptimiseHint)
@@ -0,0 +1,168 @@
+import gc
+import threading
+import time
+
+import grpc
+from google.protobuf.empty_pb2 import Empty
+
+from cottontaildb_client import CottontailDBClient, RetryPolicy, CircuitBreaker, CircuitOpenError, UnavailableError, \
+    column_def, Type, Literal
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer, DMLServicer, DQLStub
+from cottontaildb_client.retry import EndpointGuard, GuardedStub
+
+from .grpc_server import ServerTestCase
+
+
+class _FlakyDQL(DQLServicer):
+    """Endpoint failing a configurable number of calls with UNAVAILABLE before answering."""
+
+    def __init__(self):
+        self.failures = 0
+        self.calls = 0
+        self.blocked = threading.Event()
+        self.blocked.set()
+
+    def _fail(self, context):
+        self.calls += 1
+        if self.failures > 0:
+            self.failures -= 1
+            context.abort(grpc.StatusCode.UNAVAILABLE, 'restarting')
+
+    def Ping(self, request, context):
+        self._fail(context)
+        self.blocked.wait()
+        return Empty()
+
+    def Query(self, request, context):
+        self._fail(context)
+        yield QueryResponseMessage(columns=[column_def('id', Type.INTEGER)],
+                                   tuples=[QueryResponseMessage.Tuple(data=[Literal(intData=1)])])
+
+
+class _FlakyDML(DMLServicer):
+
+    def __init__(self):
+        self.calls = 0
+
+    def Insert(self, request, context):
+        self.calls += 1
+        context.abort(grpc.StatusCode.UNAVAILABLE, 'restarting')
+
+
+class TestRetry(ServerTestCase):
+
+    def setUp(self):
+        self.dql = _FlakyDQL()
+        self.dml = _FlakyDML()
+        self.port = self.serve(self.dql, self.dml)
+        self.policy = RetryPolicy(initial_backoff=0.01, max_backoff=0.02)
+        self.channel = grpc.insecure_channel(f'localhost:{self.port}')
+        self.addCleanup(self.channel.close)
+
+    def test_retry_unary(self):
+        self.dql.failures = 2
+        with CottontailDBClient('localhost', self.port, retry_policy=self.policy) as client:
+            client.ping()
+            metrics = client.metrics()
+        self.assertEqual(self.dql.calls, 3)
+        self.assertEqual((metrics['calls'], metrics['failures'], metrics['retries']), (1, 2, 2))
+
+    def test_retry_stream(self):
+        self.dql.failures = 1
+        with CottontailDBClient('localhost', self.port, retry_policy=self.policy) as client:
+            self.assertEqual(client.query('schema', 'entity', None, None), [{'id': 1}])
+        self.assertEqual(self.dql.calls, 2)
+
+    def test_attempts_exhausted(self):
+        self.dql.failures = 10
+        with CottontailDBClient('localhost', self.port, retry_policy=self.policy) as client:
+            self.assertRaises(UnavailableError, client.ping)
+        self.assertEqual(self.dql.calls, self.policy.max_attempts)
+
+    def test_retry_budget(self):
+        self.dql.failures = 10
+        policy = RetryPolicy(initial_backoff=0.01, max_backoff=0.02, budget_burst=1, budget_ratio=0)
+        with CottontailDBClient('localhost', self.port, retry_policy=policy) as client:
+            self.assertRaises(UnavailableError, client.ping)
+            self.assertRaises(UnavailableError, client.ping)
+            self.assertEqual(client.metrics()['budget_exhausted'], 2)
+        self.assertEqual(self.dql.calls, 3)
+
+    def test_no_retry_of_writes(self):
+        with CottontailDBClient('localhost', self.port, retry_policy=self.policy) as client:
+            self.assertRaises(UnavailableError, client.insert, 'schema', 'entity', {'id': Literal(intData=1)})
+        self.assertEqual(self.dml.calls, 1)
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+        self.dql.failures = 2
+        with CottontailDBClient('localhost', self.port, circuit_breaker=breaker) as client:
+            self.assertRaises(UnavailableError, client.ping)
+            self.assertRaises(UnavailableError, client.ping)
+            self.assertEqual(breaker.state, 'open')
+            with self.assertRaises(CircuitOpenError) as context:
+                client.ping()
+            self.assertEqual(context.exception.code(), grpc.StatusCode.UNAVAILABLE)
+            self.assertEqual(self.dql.calls, 2)
+            time.sleep(0.25)
+            self.assertEqual(breaker.state, 'half_open')
+            client.ping()
+            self.assertEqual(breaker.state, 'closed')
+            self.assertEqual(client.metrics()['rejected'], 1)
+
+    def test_cancelled_trial_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+        self.dql.failures = 1
+        with CottontailDBClient('localhost', self.port, circuit_breaker=breaker) as client:
+            self.assertRaises(UnavailableError, client.ping)
+            time.sleep(0.15)
+            client.iter_query('schema', 'entity', None, None).cancel()
+            self.assertEqual(breaker.state, 'half_open')
+            client.ping()
+            self.assertEqual(breaker.state, 'closed')
+
+    def test_closed_trial_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+        self.dql.failures = 1
+        with CottontailDBClient('localhost', self.port, circuit_breaker=breaker) as client:
+            self.assertRaises(UnavailableError, client.ping)
+            time.sleep(0.15)
+            client.iter_query('schema', 'entity', None, None).close()
+            client.ping()
+            self.assertEqual(breaker.state, 'closed')
+
+    def test_dropped_trial_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+        self.dql.failures = 1
+        with CottontailDBClient('localhost', self.port, circuit_breaker=breaker) as client:
+            self.assertRaises(UnavailableError, client.ping)
+            time.sleep(0.15)
+            stream = client.iter_query('schema', 'entity', None, None)
+            del stream
+            gc.collect()
+            client.ping()
+            self.assertEqual(breaker.state, 'closed')
+
+    def test_cancelled_trial_future_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+        stub = GuardedStub(DQLStub(self.channel), EndpointGuard('localhost', breaker=breaker))
+        self.dql.failures = 1
+        self.assertRaises(grpc.RpcError, stub.Ping, Empty())
+        time.sleep(0.15)
+        self.dql.blocked.clear()
+        future = stub.Ping.future(Empty())
+        future.cancel()
+        self.dql.blocked.set()
+        # Done callbacks of cancelled futures run on a thread of the channel
+        deadline = time.monotonic() + 1
+        allowed = breaker.allow()
+        while not allowed and time.monotonic() < deadline:
+            time.sleep(0.01)
+            allowed = breaker.allow()
+        self.assertTrue(allowed)
+
+    def test_invalid_policy(self):
+        self.assertRaises(ValueError, RetryPolicy, max_attempts=0)
+        self.assertRaises(ValueError, RetryPolicy, initial_backoff=1, max_backoff=0.5)
+        self.assertRaises(ValueError, CircuitBreaker, failure_threshold=0)
@@ -0,0 +1,88 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cottontaildb_client import CottontailDBClient, Type, Literal, column_def, sample_from
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage, Projection
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer
+from cottontaildb_client.sampling import estimate_count, estimate_sum, estimate_mean
+
+from .grpc_server import ServerTestCase
+
+
+class TestEstimates(TestCase):
+
+    def test_sample_from(self):
+        sample = sample_from('schema', 'entity', 0.25, seed=42).sample
+        self.assertEqual((sample.entity.schema.name, sample.entity.name), ('schema', 'entity'))
+        self.assertEqual((sample.seed, sample.probability), (42, 0.25))
+        self.assertNotEqual(sample_from('schema', 'entity', 0.25).sample.seed,
+                            sample_from('schema', 'entity', 0.25).sample.seed)
+        self.assertRaises(ValueError, sample_from, 'schema', 'entity', 0)
+        self.assertRaises(ValueError, sample_from, 'schema', 'entity', 1.5)
+
+    def test_full_sample_is_exact(self):
+        values = np.arange(10, dtype=np.float64)
+        self.assertEqual(estimate_count(10, 1.0), (10, 10, 10))
+        self.assertEqual(estimate_sum(values, 1.0), (45, 45, 45))
+        self.assertEqual(estimate_mean(values, 1.0), (4.5, 4.5, 4.5))
+
+    def test_interval_coverage(self):
+        rng = np.random.default_rng(0)
+        population = rng.exponential(10, 100000)
+        covered = {'count': 0, 'sum': 0, 'mean': 0}
+        for _ in range(200):
+            values = population[rng.random(len(population)) < 0.01]
+            estimates = {'count': estimate_count(len(values), 0.01), 'sum': estimate_sum(values, 0.01),
+                         'mean': estimate_mean(values, 0.01)}
+            exact = {'count': len(population), 'sum': population.sum(), 'mean': population.mean()}
+            for name, estimate in estimates.items():
+                covered[name] += estimate.lower <= exact[name] <= estimate.upper
+        for name, count in covered.items():
+            self.assertGreater(count, 180, name)
+
+    def test_masked_and_empty(self):
+        values = np.ma.masked_array([1.0, 2.0, 100.0], mask=[False, False, True])
+        self.assertEqual(estimate_sum(values, 0.5).value, 6.0)
+        self.assertEqual(estimate_mean(values, 0.5).value, 1.5)
+        self.assertTrue(np.isnan(estimate_mean([], 0.5).value))
+        self.assertRaises(ValueError, estimate_count, 1, 0.5, 1.0)
+
+
+class _SamplingDQL(DQLServicer):
+
+    def __init__(self):
+        self.requests = []
+
+    def Query(self, request, context):
+        self.requests.append(request)
+        if request.query.projection.op == Projection.ProjectionOperation.COUNT:
+            yield QueryResponseMessage(columns=[column_def('count()', Type.LONG)], tuples=[
+                QueryResponseMessage.Tuple(data=[Literal(longData=25)])])
+            return
+        yield QueryResponseMessage(columns=[column_def('price', Type.DOUBLE)], tuples=[
+            QueryResponseMessage.Tuple(data=[Literal(doubleData=value)]) for value in (1.0, 2.0, 3.0, 6.0)])
+
+
+class TestSampleQuery(ServerTestCase):
+
+    def setUp(self):
+        self.servicer = _SamplingDQL()
+        self.port = self.serve(self.servicer)
+
+    def test_sample_query(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            rows = client.sample_query('schema', 'entity', client._sample_projection('schema', 'entity'), None,
+                                       0.25, seed=7, limit=3)
+            count = client.approximate_count('schema', 'entity', 0.5, seed=7)
+            aggregates = client.approximate_aggregates('schema', 'entity', 'price', 0.5, seed=7)
+        self.assertEqual(len(rows), 4)
+        sample = getattr(self.servicer.requests[0].query, 'from').sample
+        self.assertEqual((sample.entity.name, sample.seed, sample.probability), ('entity', 7, 0.25))
+        self.assertEqual(self.servicer.requests[0].query.limit, 3)
+        self.assertEqual(count.value, 50)
+        self.assertEqual(self.servicer.requests[2].query.projection.elements[0].expression.column.name, 'price')
+        self.assertEqual(aggregates['sample_size'], 4)
+        self.assertEqual((aggregates['count'].value, aggregates['sum'].value, aggregates['mean'].value),
+                         (8, 24, 3))
+        self.assertLess(aggregates['mean'].lower, 3)
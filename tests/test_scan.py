@@ -0,0 +1,76 @@
+import time
+from unittest import TestCase
+
+import grpc
+
+from cottontaildb_client import CottontailDBClient, Type, Literal, column_def
+from cottontaildb_client.cottontail_pb2 import QueryResponseMessage
+from cottontaildb_client.cottontail_pb2_grpc import DQLServicer
+from cottontaildb_client.errors import CottontailDBError
+from cottontaildb_client.scan import scan_ranges, MAX_TUPLE_ID
+
+from .grpc_server import ServerTestCase
+
+_ROWS = 100
+
+
+class TestScanRanges(TestCase):
+    """Tests the partitioning of tuple id ranges."""
+
+    def test_scan_ranges(self):
+        self.assertEqual(scan_ranges(100, 4), [(0, 25), (25, 50), (50, 75), (75, MAX_TUPLE_ID)])
+        self.assertEqual(scan_ranges(10, 3), [(0, 4), (4, 8), (8, MAX_TUPLE_ID)])
+        self.assertEqual(scan_ranges(2, 8), [(0, 1), (1, MAX_TUPLE_ID)])
+        self.assertEqual(scan_ranges(0, 8), [(0, MAX_TUPLE_ID)])
+        self.assertRaises(ValueError, scan_ranges, 10, 0)
+
+
+class _PartitionedDQL(DQLServicer):
+    """Returns the ids of a scanned range in responses of 10 rows, the first partition slower than the others."""
+
+    def __init__(self):
+        self.scans = []
+        self.failing = None
+
+    def Query(self, request, context):
+        scan = getattr(request.query, 'from').scan
+        self.scans.append((scan.start, scan.end))
+        if scan.start == self.failing:
+            context.abort(grpc.StatusCode.INTERNAL, 'partition failed')
+        ids = list(range(scan.start, min(scan.end, _ROWS)))
+        for offset in range(0, len(ids), 10):
+            if scan.start == 0:
+                time.sleep(0.05)
+            yield QueryResponseMessage(columns=[column_def('id', Type.LONG)], tuples=[
+                QueryResponseMessage.Tuple(data=[Literal(longData=id_)]) for id_ in ids[offset:offset + 10]])
+
+
+class TestParallelScan(ServerTestCase):
+
+    def setUp(self):
+        self.servicer = _PartitionedDQL()
+        self.port = self.serve(self.servicer, max_workers=8)
+
+    def test_ordered(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            batches = list(client.parallel_scan('schema', 'entity', partitions=4, rows=_ROWS, max_buffered=1))
+        self.assertEqual([row['id'] for batch in batches for row in batch], list(range(_ROWS)))
+        self.assertEqual(sorted(self.servicer.scans), scan_ranges(_ROWS, 4))
+
+    def test_unordered(self):
+        with CottontailDBClient('localhost', self.port) as client:
+            batches = list(client.parallel_scan('schema', 'entity', partitions=4, ordered=False, rows=_ROWS,
+                                                compact=True))
+        ids = [row.id for batch in batches for row in batch]
+        self.assertEqual(sorted(ids), list(range(_ROWS)))
+        # The slow first partition completes last
+        self.assertEqual(ids[-1], 24)
+
+    def test_error_and_close(self):
+        self.servicer.failing = 50
+        with CottontailDBClient('localhost', self.port) as client:
+            with self.assertRaises(CottontailDBError):
+                list(client.parallel_scan('schema', 'entity', partitions=4, ordered=False, rows=_ROWS))
+            scan = client.parallel_scan('schema', 'entity', partitions=2, rows=_ROWS, max_buffered=1)
+            self.assertEqual(len(next(scan)), 10)
+            scan.close()
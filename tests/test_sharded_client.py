@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cottontaildb_client import ShardedCottontailClient, Literal
+from cottontaildb_client.cottontail_pb2 import Order, ColumnName
+from cottontaildb_client.sharded_client import merge_ordered
+
+
+class _FakeShard:
+    """Shard client returning fixed rows and recording inserts."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.inserts = []
+        self.queries = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def close(self):
+        self.closed = True
+
+    def nns(self, schema, entity, query_vector, distance, limit, vector_col, id_col):
+        return sorted(self.rows, key=lambda row: row['distance'])[:limit]
+
+    def query(self, schema, entity, projection, where, order=None, limit=None, skip=None, from_=None):
+        self.queries.append((limit, skip))
+        return sorted(self.rows, key=lambda row: row['distance'])[:limit]
+
+    def insert_batch(self, schema, entity, columns, values):
+        self.inserts.append(values)
+        return [{'rows': len(values)}]
+
+    def insert_arrays(self, schema, entity, columns, types=None):
+        self.inserts.append(columns)
+        return [{'rows': len(next(iter(columns.values())))}]
+
+
+def _order(*components):
+    return Order(components=[Order.Component(column=ColumnName(name=name), direction=direction)
+                             for name, direction in components])
+
+
+class TestShardedClient(TestCase):
+
+    def setUp(self):
+        self.client = ShardedCottontailClient([('a', 1865), ('b', 1865)],
+                                              partitioner=lambda key, shards: int(key) % shards)
+        self.client.clients = [
+            _FakeShard([{'id': 0, 'distance': 0.5}, {'id': 2, 'distance': 0.1}, {'id': 4, 'distance': 0.9}]),
+            _FakeShard([{'id': 1, 'distance': 0.3}, {'id': 3, 'distance': 0.7}])
+        ]
+        self.client.__enter__()
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_nns(self):
+        rows = self.client.nns('schema', 'entity', [0.0], limit=3)
+        self.assertEqual([row['id'] for row in rows], [2, 1, 0])
+
+    def test_query_merge(self):
+        order = _order(('distance', Order.Direction.ASCENDING))
+        rows = self.client.query('schema', 'entity', None, None, order=order, limit=2, skip=1)
+        self.assertEqual([row['id'] for row in rows], [1, 0])
+        self.assertEqual(self.client.clients[0].queries, [(3, None)])
+
+    def test_close_without_enter(self):
+        client = ShardedCottontailClient([('a', 1865), ('b', 1865)])
+        client.close()
+        client.clients = [_FakeShard([]), _FakeShard([])]
+        client.close()
+        self.assertTrue(all(shard.closed for shard in client.clients))
+
+    def test_merge_ordered(self):
+        results = [[{'a': 2, 'b': 1}, {'a': 1, 'b': None}], [{'a': 2, 'b': 0}, {'a': None, 'b': 0}]]
+        descending = merge_ordered(results, _order(('a', Order.Direction.DESCENDING)))
+        self.assertEqual([row['a'] for row in descending], [2, 2, 1, None])
+        mixed = merge_ordered(results, _order(('a', Order.Direction.DESCENDING), ('b', Order.Direction.ASCENDING)))
+        self.assertEqual([(row['a'], row['b']) for row in mixed], [(2, 0), (2, 1), (1, None), (None, 0)])
+
+    def test_insert_batch_routing(self):
+        values = [[Literal(intData=i), Literal(floatData=0.5)] for i in range(5)]
+        reports = self.client.insert_batch('schema', 'entity', ['id', 'value'], values)
+        self.assertEqual([r[0]['rows'] for r in reports], [3, 2])
+        self.assertEqual([row[0].intData for row in self.client.clients[1].inserts[0]], [1, 3])
+
+    def test_insert_arrays_routing(self):
+        columns = {'id': np.arange(5), 'feature': np.arange(10, dtype=np.float32).reshape(5, 2)}
+        self.client.insert_arrays('schema', 'entity', columns)
+        inserted = self.client.clients[0].inserts[0]
+        np.testing.assert_array_equal(inserted['id'], [0, 2, 4])
+        np.testing.assert_array_equal(inserted['feature'][1], [4, 5])
+
+    def test_empty_shard_skipped(self):
+        reports = self.client.insert_arrays('schema', 'entity', {'id': [2, 4]})
+        self.assertEqual(reports[1], [])
+        self.assertEqual(self.client.clients[1].inserts, [])